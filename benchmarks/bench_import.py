@@ -0,0 +1,109 @@
+"""Cold import time of the integration and each of its platforms.
+
+Every run imports the integration in a fresh interpreter. The Home
+Assistant modules that are already loaded when HA imports an
+integration (core, helpers, entity components, aiohttp) are imported
+first, so only the integration's own cost is timed.
+
+    python -m benchmarks.bench_import
+    python -m benchmarks.bench_import --runs 9 --update-budgets
+
+The median of --runs is compared with ``import_ms`` in budgets.json; the
+run fails (exit code 1) when a module is over budget or when a module in
+``import_forbidden`` (dependencies that must load lazily) was imported.
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+from custom_components.lykyn.const import PLATFORMS
+
+BUDGETS = Path(__file__).with_name("budgets.json")
+PACKAGE = "custom_components.lykyn"
+
+PRELOAD = [
+    "aiohttp",
+    "voluptuous",
+    "homeassistant.core",
+    "homeassistant.config_entries",
+    "homeassistant.helpers.config_validation",
+    "homeassistant.helpers.entity_platform",
+    "homeassistant.helpers.update_coordinator",
+    *(f"homeassistant.components.{platform}" for platform in PLATFORMS),
+]
+
+_CHILD = """
+import importlib, json, sys, time
+for name in {preload!r}:
+    importlib.import_module(name)
+timings = {{}}
+for name in {modules!r}:
+    start = time.perf_counter()
+    importlib.import_module(name)
+    timings[name] = (time.perf_counter() - start) * 1000
+print(json.dumps({{"timings": timings, "loaded": sorted(sys.modules)}}))
+"""
+
+
+def _run_once(modules: list[str]) -> dict:
+    code = _CHILD.format(preload=PRELOAD, modules=modules)
+    output = subprocess.run(
+        [sys.executable, "-c", code], check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument(
+        "--update-budgets",
+        action="store_true",
+        help="write the measured medians plus --headroom to budgets.json",
+    )
+    parser.add_argument("--headroom", type=float, default=0.5)
+    args = parser.parse_args()
+
+    modules = [PACKAGE, *(f"{PACKAGE}.{platform}" for platform in PLATFORMS)]
+    runs = [_run_once(modules) for _ in range(args.runs)]
+    medians = {
+        name: round(statistics.median(run["timings"][name] for run in runs), 2)
+        for name in modules
+    }
+    budgets = json.loads(BUDGETS.read_text())
+    forbidden = budgets.get("import_forbidden", [])
+    loaded = sorted(
+        {
+            module
+            for run in runs
+            for module in run["loaded"]
+            if module.split(".")[0] in forbidden
+        }
+    )
+    print(json.dumps({"import_ms": medians, "forbidden_loaded": loaded}, indent=2))
+
+    if args.update_budgets:
+        budgets["import_ms"] = {
+            name: round(value * (1 + args.headroom), 1) for name, value in medians.items()
+        }
+        BUDGETS.write_text(json.dumps(budgets, indent=2) + "\n")
+        return
+
+    problems = [
+        f"{name}: {medians[name]:.1f} ms > {budget} ms budget"
+        for name, budget in budgets.get("import_ms", {}).items()
+        if name in medians and medians[name] > budget
+    ]
+    problems.extend(f"{module} imported eagerly" for module in loaded)
+    for problem in problems:
+        print(f"REGRESSION: {problem}", file=sys.stderr)
+    if problems:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
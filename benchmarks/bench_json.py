@@ -0,0 +1,54 @@
+"""Compare the stdlib and fast JSON codecs on Lykyn payload shapes.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_json
+"""
+
+import argparse
+import random
+import timeit
+
+from custom_components.lykyn.api import OrjsonCodec, StdlibJsonCodec, orjson
+
+from .payloads import make_fleet, make_history, make_realtime_update
+
+
+def _payloads() -> dict[str, object]:
+    rng = random.Random(0)
+    fleet = make_fleet(200)
+    return {
+        "device_list_200": fleet,
+        "update_device_emit": [{"info": fleet[0]["info"]}, {"id": fleet[0]["id"]}],
+        "realtime_update": ["realtimeDeviceUpdates", make_realtime_update("d", rng)],
+        "history_1000": make_history(1000),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=200)
+    args = parser.parse_args()
+
+    codecs = [StdlibJsonCodec]
+    if orjson is not None:
+        codecs.append(OrjsonCodec)
+    else:
+        print("orjson is not installed; only measuring the stdlib codec")
+
+    print(f"{'payload':<22}{'codec':<8}{'dumps us':>12}{'loads us':>12}{'bytes':>10}")
+    for name, payload in _payloads().items():
+        encoded = StdlibJsonCodec.dumps(payload)
+        for codec in codecs:
+            dumps = timeit.timeit(lambda: codec.dumps(payload), number=args.number)
+            loads = timeit.timeit(lambda: codec.loads(encoded), number=args.number)
+            print(
+                f"{name:<22}{codec.name:<8}"
+                f"{dumps / args.number * 1e6:>12.1f}"
+                f"{loads / args.number * 1e6:>12.1f}"
+                f"{len(encoded):>10}"
+            )
+
+
+if __name__ == "__main__":
+    main()
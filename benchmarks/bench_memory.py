@@ -0,0 +1,217 @@
+"""Memory footprint of the client, coordinator and per-device entities.
+
+For each fleet size, synthetic devices are fed to ``LykynApiClient`` the
+way the socket delivers them, a ``LykynCoordinator`` is created and every
+platform's per-device entities that the kit's capability profile allows
+are built. tracemalloc snapshots between the steps give the retained
+bytes of each layer; entity allocations are attributed to their class
+through the constructor call in the platform's ``_device_entities``.
+
+    python -m benchmarks.bench_memory --sizes 25 50 100 200
+    python -m benchmarks.bench_memory --update-budgets
+
+Bytes per device is the least-squares slope of total retained bytes over
+the fleet sizes, so fixed per-account overhead does not count. The run
+fails (exit code 1) when it exceeds ``memory.bytes_per_device`` in
+budgets.json. Entities are not added to Home Assistant, so state machine
+and entity registry entries are not included.
+"""
+
+import argparse
+import ast
+import asyncio
+import gc
+import importlib
+import inspect
+import json
+import sys
+import tempfile
+import tracemalloc
+from collections import Counter
+from pathlib import Path
+from types import SimpleNamespace
+
+from custom_components.lykyn.api import LykynApiClient
+from custom_components.lykyn.const import PLATFORMS
+
+from .payloads import make_fleet
+
+BUDGETS = Path(__file__).with_name("budgets.json")
+FRAMES = 64
+
+
+def _constructor_lines(module) -> dict[int, str]:
+    """Map source lines of _device_entities to the entity class built there."""
+    source = inspect.getsource(module)
+    tree = ast.parse(source)
+    lines: dict[int, str] = {}
+    for node in ast.walk(tree):
+        if not (isinstance(node, ast.FunctionDef) and node.name == "_device_entities"):
+            continue
+        for call in ast.walk(node):
+            if (
+                isinstance(call, ast.Call)
+                and isinstance(call.func, ast.Name)
+                and isinstance(getattr(module, call.func.id, None), type)
+            ):
+                for line in range(call.lineno, call.end_lineno + 1):
+                    lines[line] = call.func.id
+    return lines
+
+
+def _attribute(diff, sites: dict[str, dict[int, str]]) -> Counter:
+    """Sum allocation size differences per entity class."""
+    by_class: Counter = Counter()
+    for stat in diff:
+        if stat.size_diff <= 0:
+            continue
+        name = "other"
+        for frame in stat.traceback:
+            lines = sites.get(frame.filename)
+            if lines is not None and frame.lineno in lines:
+                name = lines[frame.lineno]
+                break
+        by_class[name] += stat.size_diff
+    return by_class
+
+
+def _retained(after, before) -> int:
+    return sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+
+
+async def _measure(hass, size: int, seed: int, modules: list, sites: dict) -> dict:
+    from custom_components.lykyn.coordinator import LykynCoordinator
+
+    gc.collect()
+    start = tracemalloc.take_snapshot()
+
+    client = LykynApiClient("bench@example.com", "bench")
+    fleet = make_fleet(size, seed)
+    for device in fleet:
+        await client.handle_event("updateDevice", device)
+    await client.handle_event("onlineDevices", [device["id"] for device in fleet])
+    del fleet
+    gc.collect()
+    after_client = tracemalloc.take_snapshot()
+
+    entry = SimpleNamespace(entry_id="bench", title="Benchmark", options={})
+    coordinator = LykynCoordinator(hass, entry, client)
+    coordinator.data = client.devices
+    gc.collect()
+    after_coordinator = tracemalloc.take_snapshot()
+
+    entities = [
+        entity
+        for module in modules
+        for device_id in client.devices
+        for entity in module._device_entities(coordinator, device_id)
+        if coordinator.capabilities.profile(device_id).supports(entity.requires)
+    ]
+    gc.collect()
+    after_entities = tracemalloc.take_snapshot()
+
+    by_class = _attribute(after_entities.compare_to(after_coordinator, "traceback"), sites)
+    counts = Counter(type(entity).__name__ for entity in entities)
+    result = {
+        "devices": size,
+        "entities": len(entities),
+        "client_bytes": _retained(after_client, start),
+        "coordinator_bytes": _retained(after_coordinator, after_client),
+        "entity_bytes": _retained(after_entities, after_coordinator),
+        "entity_classes": {
+            name: {
+                "instances": counts[name],
+                "bytes_per_instance": round(by_class[name] / counts[name]),
+            }
+            for name in sorted(counts)
+        },
+        "unattributed_bytes": by_class["other"],
+    }
+    result["total_bytes"] = (
+        result["client_bytes"] + result["coordinator_bytes"] + result["entity_bytes"]
+    )
+
+    await coordinator.async_shutdown()
+    del entities, coordinator
+    return result
+
+
+def _slope(points: list[tuple[int, int]]) -> float:
+    count = len(points)
+    mean_x = sum(x for x, _ in points) / count
+    mean_y = sum(y for _, y in points) / count
+    denominator = sum((x - mean_x) ** 2 for x, _ in points)
+    if not denominator:
+        return mean_y / mean_x
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / denominator
+
+
+async def _run(args: argparse.Namespace) -> dict:
+    from homeassistant.core import HomeAssistant
+
+    hass = HomeAssistant(tempfile.mkdtemp(prefix="lykyn-bench-"))
+    modules = [
+        importlib.import_module(f"custom_components.lykyn.{platform}")
+        for platform in PLATFORMS
+    ]
+    sites = {inspect.getsourcefile(module): _constructor_lines(module) for module in modules}
+    tracemalloc.start(FRAMES)
+    # Warm-up: first use allocates caches and lazily imported modules
+    await _measure(hass, 1, args.seed, modules, sites)
+    runs = [await _measure(hass, size, args.seed, modules, sites) for size in args.sizes]
+    tracemalloc.stop()
+
+    largest = runs[-1]
+    return {
+        "params": {"sizes": args.sizes, "seed": args.seed},
+        "runs": runs,
+        "bytes_per_device": round(
+            _slope([(run["devices"], run["total_bytes"]) for run in runs])
+        ),
+        "client_bytes_per_device": round(
+            _slope([(run["devices"], run["client_bytes"]) for run in runs])
+        ),
+        "entities_per_device": largest["entities"] // largest["devices"],
+        "entity_classes": largest["entity_classes"],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[25, 50, 100, 200])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument(
+        "--update-budgets",
+        action="store_true",
+        help="write the measured bytes per device plus --headroom to budgets.json",
+    )
+    parser.add_argument("--headroom", type=float, default=0.5)
+    args = parser.parse_args()
+
+    result = asyncio.run(_run(args))
+    print(json.dumps(result, indent=2))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(result, file, indent=2)
+
+    budgets = json.loads(BUDGETS.read_text())
+    if args.update_budgets:
+        budgets.setdefault("memory", {})["bytes_per_device"] = round(
+            result["bytes_per_device"] * (1 + args.headroom)
+        )
+        BUDGETS.write_text(json.dumps(budgets, indent=2) + "\n")
+        return
+
+    budget = budgets.get("memory", {}).get("bytes_per_device")
+    if budget is not None and result["bytes_per_device"] > budget:
+        print(
+            f"REGRESSION: {result['bytes_per_device']} bytes/device > "
+            f"{budget} budget",
+            file=sys.stderr,
+        )
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
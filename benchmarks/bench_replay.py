@@ -0,0 +1,63 @@
+"""Replay a recorded Lykyn event journal through LykynApiClient.
+
+Feeds the inbound events of a journal directory (enable "Record socket
+event journal" in the integration options; segments are written under
+``config/lykyn_journal/<entry_id>``) back through a fresh client, without
+network access, and reports how fast the client processed them.
+
+    python -m benchmarks.bench_replay /config/lykyn_journal/<entry_id>
+    python -m benchmarks.bench_replay <dir> --speed 1   # original pacing
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+from custom_components.lykyn.api import LykynApiClient
+from custom_components.lykyn.journal import async_replay
+
+
+async def _run(args: argparse.Namespace) -> dict:
+    client = LykynApiClient("replay@example.com", "replay")
+    notified = 0
+
+    async def on_update(device_id: str | None) -> None:
+        nonlocal notified
+        notified += 1
+
+    client.register_update_callback(on_update)
+    cpu_start = time.process_time()
+    wall_start = time.monotonic()
+    replayed = await async_replay(client, args.directory, speed=args.speed)
+    # Let the dispatcher deliver what is still queued
+    while client.dispatch_stats["queue_depth"]:
+        await asyncio.sleep(0)
+    await asyncio.sleep(0)
+    wall = time.monotonic() - wall_start
+    cpu = time.process_time() - cpu_start
+    await client.close()
+    return {
+        "events": replayed,
+        "devices": len(client.devices),
+        "notified": notified,
+        "wall_seconds": wall,
+        "events_per_sec": replayed / wall if wall else 0.0,
+        "cpu_per_event_us": cpu / replayed * 1e6 if replayed else 0.0,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("directory")
+    parser.add_argument(
+        "--speed",
+        type=float,
+        default=None,
+        help="pace events at this multiple of recorded speed (default: unpaced)",
+    )
+    print(json.dumps(asyncio.run(_run(parser.parse_args())), indent=2))
+
+
+if __name__ == "__main__":
+    main()
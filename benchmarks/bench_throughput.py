@@ -0,0 +1,204 @@
+"""Throughput and latency benchmark against a local fake Lykyn cloud.
+
+Streams ``realtimeDeviceUpdates`` from N synthetic devices through
+``LykynApiClient`` and ``LykynCoordinator`` and reports events/s,
+event-to-state latency percentiles, client CPU time and peak memory.
+
+    python -m benchmarks.bench_throughput --devices 100 --rate 2 --duration 20
+    python -m benchmarks.bench_throughput --output new.json --baseline old.json
+
+The fake cloud runs on its own thread and event loop so the reported CPU
+time is that of the integration's loop only. With ``--baseline`` the run
+fails (exit code 1) if it is worse than the baseline by more than
+``--tolerance``.
+"""
+
+import argparse
+import asyncio
+import json
+import resource
+import sys
+import tempfile
+import threading
+import time
+from types import SimpleNamespace
+
+from custom_components.lykyn.api import LykynApiClient
+
+from .fake_cloud import FakeLykynCloud
+
+
+class CloudThread:
+    """Run a FakeLykynCloud on a dedicated thread and event loop."""
+
+    def __init__(self, cloud: FakeLykynCloud) -> None:
+        self.cloud = cloud
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+
+    def start(self) -> str:
+        self._thread.start()
+        return self.run(self.cloud.start()).result()
+
+    def run(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def stop(self) -> None:
+        self.run(self.cloud.stop()).result()
+        self.run(self._cancel_tasks()).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+        self.loop.close()
+
+    @staticmethod
+    async def _cancel_tasks() -> None:
+        current = asyncio.current_task()
+        tasks = [task for task in asyncio.all_tasks() if task is not current]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def _percentile(values: list[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+async def _wait_connected(client: LykynApiClient, timeout: float = 10) -> None:
+    deadline = time.monotonic() + timeout
+    while not client.connected:
+        if time.monotonic() > deadline:
+            raise TimeoutError("Socket.io did not connect to the fake cloud")
+        await asyncio.sleep(0.05)
+
+
+async def _run(args: argparse.Namespace) -> dict:
+    cloud_thread = CloudThread(FakeLykynCloud(args.devices, args.seed))
+    base_url = cloud_thread.start()
+    cloud = cloud_thread.cloud
+
+    client = LykynApiClient("bench@example.com", "bench", base_url=base_url)
+    await client.authenticate()
+
+    coordinator = None
+    if args.client_only:
+        await client.get_devices()
+        await client.get_online_devices()
+        await client.connect_socket()
+    else:
+        from homeassistant.core import HomeAssistant
+
+        from custom_components.lykyn.coordinator import LykynCoordinator
+
+        hass = HomeAssistant(tempfile.mkdtemp(prefix="lykyn-bench-"))
+        entry = SimpleNamespace(entry_id="bench", title="Benchmark", options={})
+        coordinator = LykynCoordinator(hass, entry, client)
+        await coordinator.async_setup()
+    await _wait_connected(client)
+
+    latencies: list[float] = []
+
+    async def on_update(device_id: str | None) -> None:
+        sent = cloud.sent_at.get(device_id)
+        if sent is not None:
+            latencies.append(time.monotonic() - sent)
+
+    client.register_update_callback(on_update)
+
+    cpu_start = time.thread_time()
+    wall_start = time.monotonic()
+    await asyncio.wrap_future(cloud_thread.run(cloud.stream(args.rate, args.duration)))
+    # Let the last events drain through the dispatcher
+    await asyncio.sleep(args.drain)
+    wall = time.monotonic() - wall_start
+    cpu = time.thread_time() - cpu_start
+
+    dispatch = client.dispatch_stats
+    received = len(latencies) + dispatch["coalesced"] + dispatch["dropped"]
+
+    if coordinator is not None:
+        await coordinator.async_shutdown()
+    else:
+        await client.close()
+    cloud_thread.stop()
+
+    return {
+        "params": {
+            "devices": args.devices,
+            "rate": args.rate,
+            "duration": args.duration,
+            "seed": args.seed,
+            "client_only": args.client_only,
+        },
+        "events_sent": cloud.events_sent,
+        "events_received": received,
+        "events_per_sec": received / wall if wall else 0.0,
+        "latency_ms": {
+            "p50": _percentile(latencies, 0.50) * 1000,
+            "p95": _percentile(latencies, 0.95) * 1000,
+            "p99": _percentile(latencies, 0.99) * 1000,
+            "max": max(latencies, default=0.0) * 1000,
+        },
+        "cpu_seconds": cpu,
+        "cpu_per_event_us": cpu / received * 1e6 if received else 0.0,
+        "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "coalesced": dispatch["coalesced"],
+        "dropped": dispatch["dropped"],
+    }
+
+
+def _regressions(result: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Return human-readable regressions of result against baseline."""
+    if result["params"] != baseline["params"]:
+        return [f"parameters differ from baseline: {baseline['params']}"]
+    problems = []
+    if result["events_per_sec"] < baseline["events_per_sec"] * (1 - tolerance):
+        problems.append(
+            f"events/s {result['events_per_sec']:.1f} < "
+            f"baseline {baseline['events_per_sec']:.1f}"
+        )
+    for key, value in (
+        ("p95 latency ms", (result["latency_ms"]["p95"], baseline["latency_ms"]["p95"])),
+        ("cpu/event us", (result["cpu_per_event_us"], baseline["cpu_per_event_us"])),
+    ):
+        current, previous = value
+        if current > previous * (1 + tolerance):
+            problems.append(f"{key} {current:.2f} > baseline {previous:.2f}")
+    return problems
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--devices", type=int, default=50)
+    parser.add_argument("--rate", type=float, default=1.0, help="events/s per device")
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--drain", type=float, default=0.5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--client-only",
+        action="store_true",
+        help="drive LykynApiClient without a coordinator",
+    )
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--baseline", help="compare against a previous --output")
+    parser.add_argument("--tolerance", type=float, default=0.15)
+    args = parser.parse_args()
+
+    result = asyncio.run(_run(args))
+    print(json.dumps(result, indent=2))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(result, file, indent=2)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            problems = _regressions(result, json.load(file), args.tolerance)
+        for problem in problems:
+            print(f"REGRESSION: {problem}", file=sys.stderr)
+        if problems:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
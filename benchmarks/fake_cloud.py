@@ -0,0 +1,162 @@
+"""Local stand-in for the lykyn.app REST API and Socket.io server.
+
+Implements the endpoints in ``const.py`` and the events in ``PROTOCOL.md``
+closely enough for ``LykynApiClient`` to log in, list devices and stream
+``realtimeDeviceUpdates`` from a synthetic fleet.
+
+Run standalone with:
+
+    python -m benchmarks.fake_cloud --devices 50 --rate 1
+"""
+
+import argparse
+import asyncio
+import random
+import time
+
+import socketio
+from aiohttp import web
+
+from custom_components.lykyn.const import (
+    LYKYN_API_CALLBACK,
+    LYKYN_API_CSRF,
+    LYKYN_API_DEVICE,
+    LYKYN_API_DEVICE_DATA,
+    LYKYN_API_DEVICE_ONLINE,
+    LYKYN_API_DEVICES,
+    LYKYN_API_SESSION,
+)
+
+from .payloads import make_fleet, make_history, make_realtime_update
+
+FAKE_USER_ID = "user-0001"
+
+
+class FakeLykynCloud:
+    """In-process fake of the Lykyn cloud for benchmarks."""
+
+    def __init__(self, devices: int, seed: int = 0) -> None:
+        self._rng = random.Random(seed)
+        self.devices = {device["id"]: device for device in make_fleet(devices, seed)}
+        self.online = list(self.devices)
+        # Last monotonic send time per device, read by the benchmark driver
+        self.sent_at: dict[str, float] = {}
+        self.events_sent = 0
+        self.emits_received = 0
+        # Total rows served per device by the paged history endpoint
+        self.history_rows = 10_000
+        self.sio = socketio.AsyncServer(async_mode="aiohttp", logger=False)
+        self.app = web.Application()
+        self.sio.attach(self.app)
+        self._runner: web.AppRunner | None = None
+        self.base_url = ""
+        self._setup_routes()
+        self._setup_events()
+
+    def _setup_routes(self) -> None:
+        router = self.app.router
+        router.add_get(LYKYN_API_CSRF, self._csrf)
+        router.add_post(LYKYN_API_CALLBACK, self._callback)
+        router.add_get(LYKYN_API_SESSION, self._session)
+        router.add_get(LYKYN_API_DEVICES, self._devices)
+        router.add_get(LYKYN_API_DEVICE_ONLINE, self._online)
+        router.add_get(LYKYN_API_DEVICE_DATA.replace("device_id", "id"), self._data)
+        router.add_get(LYKYN_API_DEVICE.replace("device_id", "id"), self._device)
+
+    def _setup_events(self) -> None:
+        @self.sio.on("getOnlineDevices")
+        async def get_online_devices(sid, *args):
+            await self.sio.emit("onlineDevices", self.online, to=sid)
+
+        @self.sio.on("updateDevice")
+        async def update_device(sid, update, target):
+            self.emits_received += 1
+            device = self.devices.get(target.get("id"))
+            if device is None:
+                return
+            device.update(update)
+            await self.sio.emit("updateDevice", device)
+
+    async def _csrf(self, request: web.Request) -> web.Response:
+        return web.json_response({"csrfToken": "fake-csrf"})
+
+    async def _callback(self, request: web.Request) -> web.Response:
+        return web.json_response({"url": self.base_url})
+
+    async def _session(self, request: web.Request) -> web.Response:
+        return web.json_response({"user": {"id": FAKE_USER_ID}})
+
+    async def _devices(self, request: web.Request) -> web.Response:
+        return web.json_response(list(self.devices.values()))
+
+    async def _device(self, request: web.Request) -> web.Response:
+        device = self.devices.get(request.match_info["id"])
+        if device is None:
+            raise web.HTTPNotFound
+        return web.json_response(device)
+
+    async def _data(self, request: web.Request) -> web.Response:
+        limit = int(request.query.get("limit", 144))
+        offset = int(request.query.get("offset", 0))
+        count = max(0, min(limit, self.history_rows - offset))
+        return web.json_response(make_history(count, start=offset))
+
+    async def _online(self, request: web.Request) -> web.Response:
+        return web.json_response({"devices": self.online})
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Start serving and return the base URL."""
+        self._runner = web.AppRunner(self.app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        sockets = site._server.sockets  # noqa: SLF001 - resolve port 0
+        self.base_url = f"http://{host}:{sockets[0].getsockname()[1]}"
+        return self.base_url
+
+    async def stop(self) -> None:
+        await self.sio.shutdown()
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def stream(self, rate: float, duration: float, tick: float = 0.01) -> None:
+        """Emit realtimeDeviceUpdates at rate events/s per device for duration."""
+        device_ids = list(self.devices)
+        total_rate = rate * len(device_ids)
+        start = time.monotonic()
+        sent = 0
+        while (elapsed := time.monotonic() - start) < duration:
+            due = int(elapsed * total_rate) - sent
+            for _ in range(due):
+                device_id = device_ids[sent % len(device_ids)]
+                payload = make_realtime_update(device_id, self._rng)
+                self.sent_at[device_id] = time.monotonic()
+                await self.sio.emit("realtimeDeviceUpdates", payload)
+                sent += 1
+            await asyncio.sleep(tick)
+        self.events_sent += sent
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    cloud = FakeLykynCloud(args.devices, args.seed)
+    base_url = await cloud.start(port=args.port)
+    print(f"Fake Lykyn cloud at {base_url} with {args.devices} devices")
+    try:
+        while True:
+            await cloud.stream(args.rate, 60)
+    finally:
+        await cloud.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run a fake Lykyn cloud")
+    parser.add_argument("--devices", type=int, default=10)
+    parser.add_argument("--rate", type=float, default=1.0, help="events/s per device")
+    parser.add_argument("--port", type=int, default=8123)
+    parser.add_argument("--seed", type=int, default=0)
+    asyncio.run(_serve(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Synthetic Lykyn payloads shaped like the ones in PROTOCOL.md."""
+
+import random
+
+
+def make_device_info(rng: random.Random) -> dict:
+    """Return a full ``info`` object as the cloud sends it."""
+    temp = round(rng.uniform(14, 26), 1)
+    hum = round(rng.uniform(80, 95), 1)
+    return {
+        "temp": temp,
+        "hum": hum,
+        "calibrate": {
+            "temp": temp,
+            "tempPercent": 0,
+            "calibratedTemp": temp,
+            "hum": hum,
+            "humPercent": 0,
+            "calibratedHum": hum,
+        },
+        "controlType": rng.choice(["SMART", "MANUAL"]),
+        "selectedMushroom": "LionsMane",
+        "selectedMicrogreens": "Arugula",
+        "minTemp": 16,
+        "maxTemp": 21,
+        "minHum": 85,
+        "maxHum": 90,
+        "airin": rng.randint(0, 3),
+        "airout": rng.randint(0, 3),
+        "airinOn": 3,
+        "airoutOn": 0,
+        "airinOff": 1,
+        "airoutOff": 1,
+        "humidifier": rng.random() < 0.5,
+        "humidifierOnDuration": 5,
+        "humidifierBelowMinDuration": 10,
+        "light": True,
+        "lightMode": "ANIMATION",
+        "lightColor": "#FFFFFF",
+        "lightBrightness": 50,
+        "lightAnimation": "RAINBOW",
+        "specs": {"version": "1.4.2"},
+        "smart": {
+            "humidifier": True,
+            "light": True,
+            "airinOn": 3,
+            "airoutOn": 0,
+            "airinOff": 1,
+            "airoutOff": 1,
+            "humidifierOnDuration": 5,
+            "humidifierBelowMinDuration": 10,
+        },
+    }
+
+
+def make_device(index: int, rng: random.Random) -> dict:
+    """Return a device object as listed by /api/user/devices."""
+    return {
+        "id": f"device-{index:05d}",
+        "name": f"Kit {index}",
+        "user_id": "user-0001",
+        "type": "MUSHROOM",
+        "info": make_device_info(rng),
+        "created_at": "2025-01-01T00:00:00Z",
+    }
+
+
+def make_fleet(count: int, seed: int = 0) -> list[dict]:
+    """Return a deterministic device list of the given size."""
+    rng = random.Random(seed)
+    return [make_device(index, rng) for index in range(count)]
+
+
+def make_realtime_update(device_id: str, rng: random.Random) -> dict:
+    """Return a ``realtimeDeviceUpdates`` payload."""
+    temp = round(rng.uniform(14, 26), 1)
+    hum = round(rng.uniform(80, 95), 1)
+    return {
+        "id": device_id,
+        "temp": temp,
+        "hum": hum,
+        "calibratedTemp": temp,
+        "calibratedHum": hum,
+    }
+
+
+def make_history(count: int, seed: int = 0, start: int = 0) -> dict:
+    """Return a /api/device/{id}/data response with count rows from start."""
+    rng = random.Random(seed + start)
+    return {
+        "data": [
+            {
+                "temp": round(rng.uniform(14, 26), 1),
+                "hum": round(rng.uniform(80, 95), 1),
+                "airin": rng.randint(0, 3),
+                "airout": rng.randint(0, 3),
+                "humidifier": rng.randint(0, 1),
+                "light": 1,
+                "minTemp": 16,
+                "maxTemp": 21,
+                "minHum": 85,
+                "maxHum": 90,
+                "created_at": f"2025-01-15T{row // 60 % 24:02d}:{row % 60:02d}:00Z",
+            }
+            for row in range(start, start + count)
+        ]
+    }
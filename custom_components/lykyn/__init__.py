@@ -6,33 +6,85 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import EVENT_HOMEASSISTANT_STOP
 from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import ConfigEntryAuthFailed, ConfigEntryNotReady
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.typing import ConfigType
 
 from .api import LykynApiClient, LykynAuthError, LykynApiError
-from .const import CONF_EMAIL, CONF_PASSWORD, DOMAIN, PLATFORMS
+from .const import (
+    CONF_CONTROL_FAN_SPEED,
+    CONF_CONTROL_MIN_CYCLE,
+    CONF_EMAIL,
+    CONF_FRESHNESS_THRESHOLD,
+    CONF_JOURNAL,
+    CONF_LOCAL_CONTROL,
+    CONF_METRICS,
+    CONF_PASSWORD,
+    CONF_TRANSPORT,
+    CONF_WS_COMPRESSION,
+    CONF_WS_HEARTBEAT,
+    DEFAULT_CONTROL_FAN_SPEED,
+    DEFAULT_CONTROL_MIN_CYCLE,
+    DEFAULT_FRESHNESS_THRESHOLD,
+    DEFAULT_WS_HEARTBEAT,
+    DOMAIN,
+    PLATFORMS,
+    TRANSPORT_AUTO,
+)
+from .controller import LykynClimateController
 from .coordinator import LykynCoordinator
+from .handoff import async_take_client
+from .journal import LykynEventJournal
+from .metrics import MetricsRegistry
+from .schedule import get_scheduler, schedule_store
+from .services import async_setup_services
 
 _LOGGER = logging.getLogger(__name__)
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the Lykyn services."""
+    async_setup_services(hass)
+    return True
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Lykyn from a config entry."""
     hass.data.setdefault(DOMAIN, {})
 
-    client = LykynApiClient(
-        email=entry.data[CONF_EMAIL],
-        password=entry.data[CONF_PASSWORD],
+    client = async_take_client(hass, entry.data[CONF_EMAIL])
+    if client is None:
+        client = LykynApiClient(
+            email=entry.data[CONF_EMAIL],
+            password=entry.data[CONF_PASSWORD],
+        )
+
+        try:
+            await client.authenticate()
+        except LykynAuthError as err:
+            await client.close()
+            raise ConfigEntryAuthFailed(str(err)) from err
+        except Exception as err:
+            await client.close()
+            raise ConfigEntryNotReady(str(err)) from err
+
+    client.set_transport_options(
+        entry.options.get(CONF_TRANSPORT, TRANSPORT_AUTO),
+        entry.options.get(CONF_WS_COMPRESSION, False),
+        entry.options.get(CONF_WS_HEARTBEAT, DEFAULT_WS_HEARTBEAT),
     )
+    client.set_freshness_threshold(
+        entry.options.get(CONF_FRESHNESS_THRESHOLD, DEFAULT_FRESHNESS_THRESHOLD) * 60
+    )
+    if entry.options.get(CONF_JOURNAL):
+        client.attach_journal(
+            LykynEventJournal(hass.config.path(f"{DOMAIN}_journal", entry.entry_id))
+        )
 
-    try:
-        await client.authenticate()
-    except LykynAuthError as err:
-        await client.close()
-        raise ConfigEntryAuthFailed(str(err)) from err
-    except Exception as err:
-        await client.close()
-        raise ConfigEntryNotReady(str(err)) from err
-
-    coordinator = LykynCoordinator(hass, client)
+    coordinator = LykynCoordinator(
+        hass, entry, client, MetricsRegistry(entry.options.get(CONF_METRICS, False))
+    )
 
     try:
         await coordinator.async_setup()
@@ -42,15 +94,36 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     hass.data[DOMAIN][entry.entry_id] = coordinator
 
+    controller = coordinator.controller = LykynClimateController(
+        hass,
+        client,
+        coordinator.metrics,
+        entry.options.get(CONF_LOCAL_CONTROL, False),
+        entry.options.get(CONF_CONTROL_FAN_SPEED, DEFAULT_CONTROL_FAN_SPEED),
+        entry.options.get(CONF_CONTROL_MIN_CYCLE, DEFAULT_CONTROL_MIN_CYCLE),
+    )
+    controller.start()
+    entry.async_on_unload(controller.stop)
+
     entry.async_on_unload(
         hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, client.close)
     )
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    scheduler = get_scheduler(hass)
+    await scheduler.async_add_entry(entry.entry_id, client)
+    entry.async_on_unload(lambda: scheduler.async_remove_entry(entry.entry_id))
+
     return True
 
 
+async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload the entry when its options change."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
@@ -58,3 +131,8 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         coordinator: LykynCoordinator = hass.data[DOMAIN].pop(entry.entry_id)
         await coordinator.async_shutdown()
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Delete the stored schedules of a removed entry."""
+    await schedule_store(hass, entry.entry_id).async_remove()
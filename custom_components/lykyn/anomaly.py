@@ -0,0 +1,259 @@
+"""Streaming anomaly detectors for Lykyn kits.
+
+Each detector looks at one realtime sample at a time, together with the
+actuator state in the kit's info, and keeps a few numbers per kit: no
+history is stored, so memory is constant per kit however long a problem
+lasts. A detector reports whether its anomaly is active after a sample;
+the monitor turns changes into (device, detector, active) transitions
+and measures the CPU time each detector spends per sample.
+"""
+
+from __future__ import annotations
+
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+
+from .const import (
+    ANOMALY_FAN_DROP_HUM,
+    ANOMALY_FAN_DROP_TEMP,
+    ANOMALY_FAN_MIN_SPEED,
+    ANOMALY_FAN_SECONDS,
+    ANOMALY_HUMIDIFIER_RISE,
+    ANOMALY_HUMIDIFIER_SECONDS,
+    ANOMALY_STUCK_SAMPLES,
+    ANOMALY_STUCK_SECONDS,
+    DETECTOR_BUCKETS,
+)
+from .metrics import MetricsRegistry
+
+SENSOR_STUCK = "sensor_stuck"
+HUMIDIFIER_INEFFECTIVE = "humidifier_ineffective"
+FANS_INEFFECTIVE = "fans_ineffective"
+
+
+@dataclass(slots=True)
+class _Sample:
+    t: float
+    info: dict
+    temp: float | None
+    hum: float | None
+
+
+@dataclass(slots=True)
+class _Flat:
+    """A reading and how long it has not changed."""
+
+    value: float
+    since: float
+    samples: int = 1
+
+
+@dataclass(slots=True)
+class _Episode:
+    """An actuator run that should move a reading."""
+
+    since: float
+    temp: float | None
+    hum: float | None
+
+
+class _Detector(ABC):
+    """Base class; subclasses keep at most a few values per kit."""
+
+    key: str
+
+    def __init__(self) -> None:
+        self._state: dict[str, object] = {}
+        self._active: set[str] = set()
+
+    @abstractmethod
+    def observe(self, device_id: str, sample: _Sample) -> bool:
+        """Consume a sample and return whether the anomaly is active."""
+
+    def forget(self, device_id: str) -> None:
+        self._state.pop(device_id, None)
+        self._active.discard(device_id)
+
+
+class StuckSensorDetector(_Detector):
+    """Temperature or humidity reporting the exact same value for hours."""
+
+    key = SENSOR_STUCK
+
+    def observe(self, device_id: str, sample: _Sample) -> bool:
+        flats = self._state.setdefault(device_id, {})
+        stuck = False
+        for name, value in (("temp", sample.temp), ("hum", sample.hum)):
+            if value is None:
+                continue
+            flat = flats.get(name)
+            if flat is None or flat.value != value:
+                flats[name] = _Flat(value, sample.t)
+                continue
+            flat.samples += 1
+            stuck |= (
+                flat.samples >= ANOMALY_STUCK_SAMPLES
+                and sample.t - flat.since >= ANOMALY_STUCK_SECONDS
+            )
+        return stuck
+
+
+class HumidifierDetector(_Detector):
+    """Humidifier running without humidity rising."""
+
+    key = HUMIDIFIER_INEFFECTIVE
+
+    def observe(self, device_id: str, sample: _Sample) -> bool:
+        active = device_id in self._active
+        episode = self._state.get(device_id)
+        if not sample.info.get("humidifier") or sample.hum is None:
+            # The episode ends with the run; a new run is judged afresh
+            self.forget(device_id)
+            return False
+        if episode is None:
+            # Nothing to show near saturation
+            if sample.hum < 100 - ANOMALY_HUMIDIFIER_RISE:
+                self._state[device_id] = _Episode(sample.t, None, sample.hum)
+            return active
+        if sample.hum - episode.hum >= ANOMALY_HUMIDIFIER_RISE:
+            self._state.pop(device_id)
+            self._active.discard(device_id)
+            return False
+        if sample.t - episode.since >= ANOMALY_HUMIDIFIER_SECONDS:
+            self._active.add(device_id)
+            return True
+        return active
+
+
+class FanDetector(_Detector):
+    """Fans venting an over-range kit without temperature or humidity falling."""
+
+    key = FANS_INEFFECTIVE
+
+    def observe(self, device_id: str, sample: _Sample) -> bool:
+        active = device_id in self._active
+        info = sample.info
+        episode = self._state.get(device_id)
+        venting = (
+            max(info.get("airin") or 0, info.get("airout") or 0) >= ANOMALY_FAN_MIN_SPEED
+        )
+        if not venting:
+            self.forget(device_id)
+            return False
+        if episode is None:
+            too_warm = sample.temp is not None and sample.temp > info.get(
+                "maxTemp", float("inf")
+            )
+            too_humid = sample.hum is not None and sample.hum > info.get(
+                "maxHum", float("inf")
+            )
+            if too_warm or too_humid:
+                self._state[device_id] = _Episode(sample.t, sample.temp, sample.hum)
+            return active
+        dropped = (
+            sample.temp is not None
+            and episode.temp is not None
+            and episode.temp - sample.temp >= ANOMALY_FAN_DROP_TEMP
+        ) or (
+            sample.hum is not None
+            and episode.hum is not None
+            and episode.hum - sample.hum >= ANOMALY_FAN_DROP_HUM
+        )
+        if dropped:
+            self._state.pop(device_id)
+            self._active.discard(device_id)
+            return False
+        if sample.t - episode.since >= ANOMALY_FAN_SECONDS:
+            self._active.add(device_id)
+            return True
+        return active
+
+
+class LykynAnomalyMonitor:
+    """Run every detector on each sample and track active anomalies."""
+
+    def __init__(self, metrics: MetricsRegistry) -> None:
+        self._metrics = metrics
+        self._detectors: list[_Detector] = [
+            StuckSensorDetector(),
+            HumidifierDetector(),
+            FanDetector(),
+        ]
+        self._active: dict[str, set[str]] = {}
+        self._last: dict[str, float] = {}
+        self._stats = {
+            detector.key: {"samples": 0, "cpu_seconds": 0.0, "cpu_max": 0.0, "raised": 0}
+            for detector in self._detectors
+        }
+
+    @property
+    def detectors(self) -> list[str]:
+        return [detector.key for detector in self._detectors]
+
+    @property
+    def stats(self) -> dict:
+        stats = {}
+        for key, counters in self._stats.items():
+            samples = counters["samples"]
+            stats[key] = {
+                "samples": samples,
+                "raised": counters["raised"],
+                "cpu_mean_us": round(counters["cpu_seconds"] / samples * 1e6, 2)
+                if samples
+                else None,
+                "cpu_max_us": round(counters["cpu_max"] * 1e6, 2),
+            }
+        stats["active"] = {
+            device_id: sorted(keys) for device_id, keys in self._active.items() if keys
+        }
+        return stats
+
+    def is_active(self, device_id: str, key: str) -> bool:
+        return key in self._active.get(device_id, ())
+
+    def sample(
+        self,
+        device_id: str,
+        t: float,
+        info: dict,
+        temp: float | None,
+        hum: float | None,
+    ) -> list[tuple[str, bool]]:
+        """Feed one sample; return the (detector, active) changes it caused."""
+        if t <= self._last.get(device_id, float("-inf")):
+            return []
+        self._last[device_id] = t
+        sample = _Sample(t, info, temp, hum)
+        active = self._active.setdefault(device_id, set())
+        changes = []
+        for detector in self._detectors:
+            start = time.perf_counter()
+            raised = detector.observe(device_id, sample)
+            elapsed = time.perf_counter() - start
+            counters = self._stats[detector.key]
+            counters["samples"] += 1
+            counters["cpu_seconds"] += elapsed
+            counters["cpu_max"] = max(counters["cpu_max"], elapsed)
+            self._metrics.histogram(
+                "detector_seconds", DETECTOR_BUCKETS, detector.key
+            ).observe(elapsed)
+            if raised == (detector.key in active):
+                continue
+            if raised:
+                active.add(detector.key)
+                counters["raised"] += 1
+            else:
+                active.discard(detector.key)
+            changes.append((detector.key, raised))
+        return changes
+
+    def remove(self, device_id: str) -> list[str]:
+        """Forget a kit; return the anomalies that were active for it."""
+        for detector in self._detectors:
+            detector.forget(device_id)
+        self._last.pop(device_id, None)
+        return sorted(self._active.pop(device_id, ()))
+
+    def active(self) -> dict[str, set[str]]:
+        return {device_id: set(keys) for device_id, keys in self._active.items() if keys}
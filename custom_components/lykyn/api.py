@@ -1,14 +1,30 @@
 """API client for the Lykyn cloud service."""
 
 import asyncio
+import functools
+import importlib
 import json
 import logging
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Awaitable, Callable
 from http.cookies import SimpleCookie
+from typing import TYPE_CHECKING, Any
 
 import aiohttp
-import socketio
 
 from .const import (
+    CALIBRATION_PREVIEW_TIMEOUT,
+    CALIBRATION_TOLERANCE,
+    CALLBACK_TIMEOUT,
+    EVENT_QUEUE_SIZE,
+    HISTORY_PAGE_SIZE,
+    HEARTBEAT_INTERVAL,
+    HEARTBEAT_TIMEOUT,
+    JOURNAL_IN,
+    JOURNAL_META,
+    JOURNAL_OUT,
+    LATENCY_BUCKETS,
     LYKYN_API_CALLBACK,
     LYKYN_API_CSRF,
     LYKYN_API_DEVICE,
@@ -17,10 +33,107 @@ from .const import (
     LYKYN_API_DEVICES,
     LYKYN_API_SESSION,
     LYKYN_BASE_URL,
+    OVERFLOW_DROP_NEWEST,
+    OVERFLOW_DROP_OLDEST,
+    STREAM_STALL_TIMEOUT,
+    TRANSPORT_AUTO,
+    TRANSPORTS,
+    WS_COMPRESSION_WBITS,
 )
+from .metrics import Histogram, MetricsRegistry
+from .pool import LykynConnectionPool, get_connection_pool
+
+if TYPE_CHECKING:
+    from .transport import MeteredAsyncClient
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson ships with Home Assistant
+    orjson = None
 
 _LOGGER = logging.getLogger(__name__)
 
+# realtimeDeviceUpdates fields that land in info.calibrate
+REALTIME_KEYS = ("temp", "hum", "calibratedTemp", "calibratedHum")
+
+# Calibration offset key -> (raw reading, calibrated reading) in info.calibrate
+CALIBRATION_KEYS = {
+    "tempPercent": ("temp", "calibratedTemp"),
+    "humPercent": ("hum", "calibratedHum"),
+}
+
+
+def merge_info(info: dict, update: dict) -> dict:
+    """Return a new info dict with update applied.
+
+    Nested sub-objects (smart, calibrate) are merged one level deep and
+    copied only when touched; untouched ones are shared with info.
+    """
+    merged = dict(info)
+    for key, value in update.items():
+        if isinstance(value, dict) and isinstance(info.get(key), dict):
+            merged[key] = {**info[key], **value}
+        else:
+            merged[key] = value
+    return merged
+
+
+# Inbound Socket.io event -> handler method suffix (_on_<suffix>)
+SOCKET_EVENTS = {
+    "connect": "connect",
+    "disconnect": "disconnect",
+    "onlineDevices": "online_devices",
+    "updateDevice": "update_device",
+    "realtimeDeviceUpdates": "realtime_device_updates",
+    "deleteDevice": "delete_device",
+}
+
+
+class StdlibJsonCodec:
+    """JSON codec backed by the standard library."""
+
+    name = "json"
+
+    @staticmethod
+    def dumps(obj: Any, **kwargs) -> str:
+        return json.dumps(obj, separators=(",", ":"))
+
+    @staticmethod
+    def loads(data: str | bytes, **kwargs) -> Any:
+        return json.loads(data)
+
+
+class OrjsonCodec(StdlibJsonCodec):
+    """JSON codec backed by orjson, falling back to stdlib for odd inputs."""
+
+    name = "orjson"
+
+    @staticmethod
+    def dumps(obj: Any, **kwargs) -> str:
+        try:
+            return orjson.dumps(obj).decode()
+        except TypeError:
+            # e.g. non-str dict keys, which orjson rejects
+            return json.dumps(obj, separators=(",", ":"))
+
+    @staticmethod
+    def loads(data: str | bytes, **kwargs) -> Any:
+        return orjson.loads(data)
+
+
+def get_json_codec(prefer_fast: bool = True) -> type[StdlibJsonCodec]:
+    """Return the fastest available codec.
+
+    The codec has module-style dumps/loads so it can be handed to aiohttp
+    (``resp.json(loads=...)``) and used as a python-socketio Packet codec.
+    """
+    if prefer_fast and orjson is not None:
+        return OrjsonCodec
+    return StdlibJsonCodec
+
+
+JSON_CODEC = get_json_codec()
+
 
 class LykynApiError(Exception):
     """Raised when the API returns an error."""
@@ -30,20 +143,117 @@ class LykynAuthError(LykynApiError):
     """Raised when authentication fails."""
 
 
+# Errors a REST call can raise besides the API's own status errors
+REQUEST_ERRORS = (LykynApiError, aiohttp.ClientError, asyncio.TimeoutError)
+
+
+class _Flight:
+    """A shared request task and the number of callers awaiting it."""
+
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Task) -> None:
+        self.task = task
+        self.waiters = 0
+
+
+class _Lane:
+    """Coalescing notification queue of one update callback."""
+
+    __slots__ = ("name", "queue", "queued", "wakeup", "worker")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.queue: deque[str | None] = deque()
+        self.queued: set[str | None] = set()
+        self.wakeup = asyncio.Event()
+        self.worker: asyncio.Task | None = None
+
+
 class LykynApiClient:
     """Client for the Lykyn cloud API."""
 
-    def __init__(self, email: str, password: str) -> None:
+    def __init__(
+        self,
+        email: str,
+        password: str,
+        memo_ttl: float = 0.0,
+        pool: LykynConnectionPool | None = None,
+        overflow_policy: str = OVERFLOW_DROP_OLDEST,
+        base_url: str = LYKYN_BASE_URL,
+    ) -> None:
         self._email = email
         self._password = password
+        self._base_url = base_url
+        self._pool = pool
+        self._pool_acquired = False
         self._session: aiohttp.ClientSession | None = None
+        # Socket.io gets its own session, off the REST connection limits
+        self._socket_session: aiohttp.ClientSession | None = None
         self._cookies: dict[str, str] = {}
         self._user_id: str | None = None
-        self._sio: socketio.AsyncClient | None = None
+        self._sio: "MeteredAsyncClient | None" = None
+        self._transports = TRANSPORTS[TRANSPORT_AUTO]
+        self._ws_compression = False
+        self._ws_heartbeat = 0.0
         self._connected = False
+        # Whether the current socket client ever connected; python-socketio
+        # only reconnects clients whose first connect succeeded
+        self._established = False
+        self._connecting = False
+        self._connected_event = asyncio.Event()
+        # Device snapshots are never mutated: each change stores a new dict
+        # that shares its unchanged sub-objects with the previous one
         self._devices: dict[str, dict] = {}
+        self._versions: dict[str, int] = {}
+        self._version = 0
+        self._availability_version = 0
+        # Provisional calibrated readings: device -> calibrated key ->
+        # (raw key, offset, monotonic start)
+        self._previews: dict[str, dict[str, tuple[str, float, float]]] = {}
+        self._calibration_stats = {
+            "confirmed": 0,
+            "expired": 0,
+            "superseded": 0,
+            "abs_error_sum": 0.0,
+            "max_abs_error": 0.0,
+            "confirm_seconds_sum": 0.0,
+        }
         self._online_devices: list[str] = []
-        self._update_callbacks: list = []
+        # Bounded queue per update callback between socket handlers and it
+        self._lanes: dict[Callable, _Lane] = {}
+        # Callback runs, including ones that overran CALLBACK_TIMEOUT
+        self._running: set[asyncio.Task] = set()
+        self._sample_callbacks: list[Callable[[str], None]] = []
+        self._overflow_policy = overflow_policy
+        self._dispatch_stats = {
+            "max_queue_depth": 0,
+            "dropped": 0,
+            "coalesced": 0,
+            "timeouts": 0,
+            "errors": 0,
+        }
+        self._callback_latency: dict[str, Histogram] = {}
+        self._journal = None
+        self._metrics = MetricsRegistry()
+        # Heartbeat probe and per-device freshness (monotonic seconds)
+        self._heartbeat: asyncio.Task | None = None
+        self._probe_sent: float | None = None
+        self._rtt: float | None = None
+        self._last_stream_event = time.monotonic()
+        self._last_event: dict[str, float] = {}
+        self._last_event_wall: dict[str, float] = {}
+        self._freshness_threshold = 0.0
+        self._stale: set[str] = set()
+        self._event_handlers = {
+            event: getattr(self, f"_on_{suffix}")
+            for event, suffix in SOCKET_EVENTS.items()
+        }
+        # Single-flight table: concurrent identical GETs share one request
+        self._inflight: dict[str, _Flight] = {}
+        self._memo: dict[str, tuple[float, Any]] = {}
+        self._memo_ttl = memo_ttl
+        self._request_stats = {"requests": 0, "collapsed": 0, "memo_hits": 0}
 
     @property
     def user_id(self) -> str | None:
@@ -53,68 +263,399 @@ class LykynApiClient:
     def connected(self) -> bool:
         return self._connected
 
+    async def async_wait_connected(self, timeout: float) -> bool:
+        """Wait up to timeout seconds for the socket; return whether connected."""
+        try:
+            await asyncio.wait_for(self._connected_event.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
     @property
     def devices(self) -> dict[str, dict]:
+        """Return the current device snapshots; treat them as read-only."""
         return self._devices
 
+    def device_version(self, device_id: str) -> int:
+        """Return the version of a device snapshot (0 when unknown)."""
+        return self._versions.get(device_id, 0)
+
+    @property
+    def availability_version(self) -> int:
+        """Return a counter bumped when online or stale device sets change."""
+        return self._availability_version
+
+    def _store_device(self, device_id: str, device: dict) -> None:
+        self._version += 1
+        self._devices[device_id] = device
+        self._versions[device_id] = self._version
+
+    def _drop_device(self, device_id: str) -> None:
+        self._devices.pop(device_id, None)
+        self._versions.pop(device_id, None)
+        self._previews.pop(device_id, None)
+
+    def calibrated_reading(self, device_id: str, key: str) -> float | None:
+        """Return calibratedTemp/calibratedHum, preferring a local preview.
+
+        After a calibration offset change the preview is the current raw
+        reading plus the new offset, until the device confirms it.
+        """
+        calibrate = self._devices.get(device_id, {}).get("info", {}).get("calibrate", {})
+        preview = self._previews.get(device_id, {}).get(key)
+        if preview is not None and calibrate.get(preview[0]) is not None:
+            return round(calibrate[preview[0]] + preview[1], 2)
+        return calibrate.get(key)
+
+    @property
+    def calibration_stats(self) -> dict:
+        """Return agreement between local previews and device values."""
+        stats = self._calibration_stats
+        settled = stats["confirmed"] + stats["expired"]
+        return {
+            "pending": sum(len(previews) for previews in self._previews.values()),
+            "confirmed": stats["confirmed"],
+            "expired": stats["expired"],
+            "superseded": stats["superseded"],
+            "mean_abs_error": stats["abs_error_sum"] / settled if settled else None,
+            "max_abs_error": stats["max_abs_error"],
+            "mean_confirm_seconds": (
+                stats["confirm_seconds_sum"] / stats["confirmed"]
+                if stats["confirmed"]
+                else None
+            ),
+        }
+
+    def _start_previews(self, device_id: str, offsets: dict) -> None:
+        previews = self._previews.setdefault(device_id, {})
+        for offset_key, (raw_key, calibrated_key) in CALIBRATION_KEYS.items():
+            offset = offsets.get(offset_key)
+            if not isinstance(offset, (int, float)):
+                continue
+            if calibrated_key in previews:
+                self._calibration_stats["superseded"] += 1
+            previews[calibrated_key] = (raw_key, offset, time.monotonic())
+
+    def _reconcile_previews(self, device_id: str) -> bool:
+        """Settle previews the device has confirmed or that timed out.
+
+        Returns True when a preview was removed.
+        """
+        previews = self._previews.get(device_id)
+        if not previews:
+            return False
+        calibrate = self._devices.get(device_id, {}).get("info", {}).get("calibrate", {})
+        stats = self._calibration_stats
+        now = time.monotonic()
+        settled = False
+        for key, (raw_key, offset, started) in list(previews.items()):
+            raw, reported = calibrate.get(raw_key), calibrate.get(key)
+            error = None
+            if raw is not None and reported is not None:
+                error = abs(reported - (raw + offset))
+            if error is not None and error <= CALIBRATION_TOLERANCE:
+                stats["confirmed"] += 1
+                stats["confirm_seconds_sum"] += now - started
+            elif now - started >= CALIBRATION_PREVIEW_TIMEOUT:
+                stats["expired"] += 1
+                _LOGGER.debug(
+                    "Calibration preview %s for %s not confirmed (error %s)",
+                    key, device_id, error,
+                )
+            else:
+                continue
+            if error is not None:
+                stats["abs_error_sum"] += error
+                stats["max_abs_error"] = max(stats["max_abs_error"], error)
+            del previews[key]
+            settled = True
+        if not previews:
+            del self._previews[device_id]
+        return settled
+
     @property
     def online_devices(self) -> list[str]:
         return self._online_devices
 
+    @property
+    def request_stats(self) -> dict[str, int]:
+        """Return counters for issued, collapsed and memoized REST calls."""
+        return dict(self._request_stats)
+
+    @property
+    def pool_stats(self) -> dict[str, int]:
+        """Return statistics of the shared HTTP connection pool."""
+        if self._pool is None:
+            return {}
+        return self._pool.stats
+
+    @property
+    def metrics(self) -> MetricsRegistry:
+        return self._metrics
+
+    def attach_metrics(self, metrics: MetricsRegistry) -> None:
+        """Instrument socket events and emits into metrics."""
+        self._metrics = metrics
+
+    @property
+    def rtt(self) -> float | None:
+        """Return the last getOnlineDevices round-trip time in seconds."""
+        return self._rtt
+
+    def last_event_time(self, device_id: str) -> float | None:
+        """Return the wall-clock time of the last data seen for a device."""
+        return self._last_event_wall.get(device_id)
+
+    def device_age(self, device_id: str) -> float | None:
+        """Return seconds since the last data seen for a device."""
+        seen = self._last_event.get(device_id)
+        return None if seen is None else time.monotonic() - seen
+
+    def is_fresh(self, device_id: str) -> bool:
+        """Return False once a device is silent past the freshness threshold."""
+        return device_id not in self._stale
+
+    def set_freshness_threshold(self, seconds: float) -> None:
+        """Mark devices stale after seconds without data (0 disables)."""
+        self._freshness_threshold = seconds
+
+    def _mark_seen(self, device_id: str) -> None:
+        self._last_event[device_id] = self._last_stream_event = time.monotonic()
+        self._last_event_wall[device_id] = time.time()
+        if device_id in self._stale:
+            self._stale.discard(device_id)
+            self._availability_version += 1
+
+    def set_transport_options(
+        self, transport: str, compression: bool, heartbeat: float
+    ) -> None:
+        """Tune the Socket.io transport used by the next connect_socket.
+
+        transport is one of TRANSPORTS; compression enables websocket
+        permessage-deflate; heartbeat sends websocket pings every that many
+        seconds (0 leaves keep-alive to Engine.IO's own ping/pong).
+        """
+        self._transports = TRANSPORTS[transport]
+        self._ws_compression = compression
+        self._ws_heartbeat = heartbeat
+
+    def attach_journal(self, journal) -> None:
+        """Record every inbound and outbound socket event to journal."""
+        self._journal = journal
+
     def register_update_callback(self, callback) -> None:
-        self._update_callbacks.append(callback)
+        """Call an async callback(device_id) after device or online changes.
+
+        Each callback gets its own coalescing queue, so a slow callback only
+        delays its own notifications.
+        """
+        self._lanes[callback] = _Lane(getattr(callback, "__qualname__", repr(callback)))
 
     def unregister_update_callback(self, callback) -> None:
-        self._update_callbacks.remove(callback)
+        lane = self._lanes.pop(callback, None)
+        if lane is not None and lane.worker is not None:
+            lane.worker.cancel()
+
+    def register_sample_callback(self, callback) -> None:
+        """Call a plain callback(device_id) for every reading a device sends.
+
+        Unlike update callbacks these run inline and are never coalesced, so
+        consumers of the sample stream see every event.
+        """
+        self._sample_callbacks.append(callback)
+
+    def unregister_sample_callback(self, callback) -> None:
+        if callback in self._sample_callbacks:
+            self._sample_callbacks.remove(callback)
+
+    @property
+    def dispatch_stats(self) -> dict:
+        """Return event queue counters and per-callback latency histograms."""
+        stats = dict(self._dispatch_stats)
+        stats["queue_depth"] = sum(len(lane.queue) for lane in self._lanes.values())
+        stats["running"] = len(self._running)
+        stats["overflow_policy"] = self._overflow_policy
+        stats["callback_latency"] = {
+            name: histogram.as_dict()
+            for name, histogram in self._callback_latency.items()
+        }
+        return stats
 
-    async def _notify_update(self, device_id: str | None = None) -> None:
-        for callback in self._update_callbacks:
+    def _deliver_sample(self, device_id: str) -> None:
+        for callback in list(self._sample_callbacks):
             try:
-                await callback(device_id)
+                callback(device_id)
             except Exception:
-                _LOGGER.exception("Error in update callback")
+                self._dispatch_stats["errors"] += 1
+                _LOGGER.exception("Error in sample callback")
+
+    def _notify_update(self, device_id: str | None = None) -> None:
+        """Queue an update notification for each registered callback.
+
+        Never blocks the caller: a device already waiting in a callback's
+        queue is coalesced, since callbacks read the latest cached state
+        anyway, and a full queue applies the configured overflow policy.
+        """
+        for callback, lane in self._lanes.items():
+            if device_id in lane.queued:
+                self._dispatch_stats["coalesced"] += 1
+                continue
+            if len(lane.queue) >= EVENT_QUEUE_SIZE:
+                self._dispatch_stats["dropped"] += 1
+                if self._overflow_policy == OVERFLOW_DROP_NEWEST:
+                    continue
+                lane.queued.discard(lane.queue.popleft())
+            lane.queue.append(device_id)
+            lane.queued.add(device_id)
+            self._dispatch_stats["max_queue_depth"] = max(
+                self._dispatch_stats["max_queue_depth"], len(lane.queue)
+            )
+            lane.wakeup.set()
+            if lane.worker is None or lane.worker.done():
+                lane.worker = asyncio.get_running_loop().create_task(
+                    self._dispatch_updates(callback, lane)
+                )
+
+    async def _dispatch_updates(self, callback, lane: "_Lane") -> None:
+        """Deliver one callback's queued notifications in order."""
+        while True:
+            await lane.wakeup.wait()
+            while lane.queue:
+                device_id = lane.queue.popleft()
+                lane.queued.discard(device_id)
+                await self._run_callback(callback, lane.name, device_id)
+            lane.wakeup.clear()
+
+    async def _run_callback(self, callback, name: str, device_id: str | None) -> None:
+        """Run a callback, waiting at most CALLBACK_TIMEOUT for it.
+
+        A callback that overruns is left to finish in the background rather
+        than cancelled, since it may be half way through a command; its
+        queue moves on to the next notification.
+        """
+        task = asyncio.get_running_loop().create_task(callback(device_id))
+        self._running.add(task)
+        task.add_done_callback(
+            functools.partial(self._callback_done, name, time.perf_counter())
+        )
+        done, _ = await asyncio.wait({task}, timeout=CALLBACK_TIMEOUT)
+        if not done:
+            self._dispatch_stats["timeouts"] += 1
+            _LOGGER.warning(
+                "Update callback %s still running after %ss, continuing without it",
+                name,
+                CALLBACK_TIMEOUT,
+            )
+
+    def _callback_done(self, name: str, start: float, task: asyncio.Task) -> None:
+        self._running.discard(task)
+        histogram = self._callback_latency.get(name)
+        if histogram is None:
+            histogram = self._callback_latency[name] = Histogram(LATENCY_BUCKETS)
+        histogram.observe(time.perf_counter() - start)
+        if not task.cancelled() and task.exception() is not None:
+            self._dispatch_stats["errors"] += 1
+            _LOGGER.error(
+                "Error in update callback %s", name, exc_info=task.exception()
+            )
 
     async def _ensure_session(self) -> aiohttp.ClientSession:
         if self._session is None or self._session.closed:
-            jar = aiohttp.CookieJar()
-            self._session = aiohttp.ClientSession(
-                cookie_jar=jar,
-                headers={
-                    "User-Agent": "HomeAssistant/Lykyn",
-                    "Accept-Encoding": "gzip, deflate",
-                },
-            )
+            if self._pool is None:
+                self._pool = get_connection_pool()
+            if not self._pool_acquired:
+                self._pool.acquire()
+                self._pool_acquired = True
+            self._session = self._pool.create_session()
         return self._session
 
+    async def _ensure_socket_session(self) -> aiohttp.ClientSession:
+        if self._socket_session is None or self._socket_session.closed:
+            session = await self._ensure_session()
+            self._socket_session = self._pool.create_socket_session(
+                session.cookie_jar
+            )
+        return self._socket_session
+
+    async def _single_flight(
+        self, key: str, fetch: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Run fetch once for all concurrent callers sharing the same key.
+
+        Callers arriving while a request for key is in flight await the same
+        result instead of issuing their own. The request runs in its own task,
+        so a cancelled caller only stops waiting; the task is cancelled when
+        the last caller leaves. With a memo TTL configured, a result is also
+        reused for that many seconds after it completes.
+        """
+        if self._memo_ttl > 0 and key in self._memo:
+            stored_at, result = self._memo[key]
+            if time.monotonic() - stored_at < self._memo_ttl:
+                self._request_stats["memo_hits"] += 1
+                return result
+            del self._memo[key]
+
+        flight = self._inflight.get(key)
+        if flight is None:
+            flight = self._inflight[key] = _Flight(
+                asyncio.get_running_loop().create_task(self._fetch_once(key, fetch))
+            )
+            flight.task.add_done_callback(
+                lambda _: self._inflight.pop(key, None)
+                if self._inflight.get(key) is flight
+                else None
+            )
+            self._request_stats["requests"] += 1
+        else:
+            self._request_stats["collapsed"] += 1
+        flight.waiters += 1
+        try:
+            # Shield so a cancelled caller doesn't cancel the shared request
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if not flight.waiters and not flight.task.done():
+                flight.task.cancel()
+
+    async def _fetch_once(self, key: str, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        result = await fetch()
+        if self._memo_ttl > 0:
+            self._memo[key] = (time.monotonic(), result)
+        return result
+
+    def _invalidate_memo(self) -> None:
+        """Drop memoized REST results after local state changes."""
+        self._memo.clear()
+
     async def authenticate(self) -> bool:
         """Authenticate with the Lykyn cloud using email/password."""
         session = await self._ensure_session()
 
         # Step 1: Get CSRF token
-        async with session.get(f"{LYKYN_BASE_URL}{LYKYN_API_CSRF}") as resp:
+        async with session.get(f"{self._base_url}{LYKYN_API_CSRF}") as resp:
             if resp.status != 200:
                 raise LykynAuthError(f"Failed to get CSRF token: {resp.status}")
-            data = await resp.json()
+            data = await resp.json(loads=JSON_CODEC.loads)
             csrf_token = data.get("csrfToken")
             if not csrf_token:
                 raise LykynAuthError("No CSRF token in response")
 
         # Step 2: POST credentials to NextAuth callback
         async with session.post(
-            f"{LYKYN_BASE_URL}{LYKYN_API_CALLBACK}",
+            f"{self._base_url}{LYKYN_API_CALLBACK}",
             data={
                 "csrfToken": csrf_token,
                 "email": self._email,
                 "password": self._password,
                 "redirect": "false",
                 "json": "true",
-                "callbackUrl": LYKYN_BASE_URL,
+                "callbackUrl": self._base_url,
             },
             allow_redirects=False,
         ) as resp:
             # NextAuth returns 200 with {url} on success, or error
             if resp.status == 200:
-                result = await resp.json()
+                result = await resp.json(loads=JSON_CODEC.loads)
                 if "url" in result and "error" not in result.get("url", ""):
                     _LOGGER.debug("Authentication successful")
                 else:
@@ -127,10 +668,10 @@ class LykynApiClient:
                 raise LykynAuthError(f"Auth failed with status {resp.status}")
 
         # Step 3: Get session to retrieve user ID
-        async with session.get(f"{LYKYN_BASE_URL}{LYKYN_API_SESSION}") as resp:
+        async with session.get(f"{self._base_url}{LYKYN_API_SESSION}") as resp:
             if resp.status != 200:
                 raise LykynAuthError("Failed to get session")
-            session_data = await resp.json()
+            session_data = await resp.json(loads=JSON_CODEC.loads)
             user = session_data.get("user", {})
             self._user_id = user.get("id")
             if not self._user_id:
@@ -141,49 +682,110 @@ class LykynApiClient:
 
     async def get_devices(self) -> list[dict]:
         """Fetch the list of user's devices."""
+        return await self._single_flight(LYKYN_API_DEVICES, self._fetch_devices)
+
+    async def _fetch_devices(self) -> list[dict]:
         session = await self._ensure_session()
-        async with session.get(f"{LYKYN_BASE_URL}{LYKYN_API_DEVICES}") as resp:
+        async with session.get(f"{self._base_url}{LYKYN_API_DEVICES}") as resp:
             if resp.status != 200:
                 raise LykynApiError(f"Failed to get devices: {resp.status}")
-            devices = await resp.json()
+            devices = await resp.json(loads=JSON_CODEC.loads)
+            if self._journal is not None:
+                self._journal.record(JOURNAL_META, "devices", (devices,))
+            now = time.monotonic()
             for device in devices:
-                self._devices[device["id"]] = device
+                self._store_device(device["id"], device)
+                # Only socket events mark a device as seen; a listed device
+                # that never reports still goes stale after the threshold
+                self._last_event.setdefault(device["id"], now)
+            # Devices deleted while the socket was down disappear on resync
+            listed = {device["id"] for device in devices}
+            for device_id in [known for known in self._devices if known not in listed]:
+                self._drop_device(device_id)
             return devices
 
     async def get_device(self, device_id: str) -> dict:
         """Fetch a single device."""
         session = await self._ensure_session()
-        url = f"{LYKYN_BASE_URL}{LYKYN_API_DEVICE.format(device_id=device_id)}"
+        url = f"{self._base_url}{LYKYN_API_DEVICE.format(device_id=device_id)}"
         async with session.get(url) as resp:
             if resp.status != 200:
                 raise LykynApiError(f"Failed to get device: {resp.status}")
-            device = await resp.json()
-            self._devices[device_id] = device
+            device = await resp.json(loads=JSON_CODEC.loads)
+            self._store_device(device_id, device)
             return device
 
     async def get_device_data(
-        self, device_id: str, limit: int = 144
+        self, device_id: str, limit: int = 144, offset: int = 0
     ) -> list[dict]:
-        """Fetch sensor history for a device."""
-        session = await self._ensure_session()
-        url = f"{LYKYN_BASE_URL}{LYKYN_API_DEVICE_DATA.format(device_id=device_id)}"
-        async with session.get(url, params={"limit": limit, "order": "DESC"}) as resp:
-            if resp.status != 200:
-                raise LykynApiError(f"Failed to get device data: {resp.status}")
-            data = await resp.json()
-            return data.get("data", [])
+        """Fetch sensor history for a device, newest first."""
+        url = f"{self._base_url}{LYKYN_API_DEVICE_DATA.format(device_id=device_id)}"
+        params = {"limit": limit, "order": "DESC"}
+        if offset:
+            params["offset"] = offset
+
+        async def fetch() -> list[dict]:
+            session = await self._ensure_session()
+            async with session.get(url, params=params) as resp:
+                if resp.status != 200:
+                    raise LykynApiError(f"Failed to get device data: {resp.status}")
+                data = await resp.json(loads=JSON_CODEC.loads)
+                return data.get("data", [])
+
+        return await self._single_flight(f"{url}?{limit}:{offset}", fetch)
+
+    async def iter_device_data(
+        self,
+        device_id: str,
+        page_size: int = HISTORY_PAGE_SIZE,
+        max_rows: int | None = None,
+    ) -> AsyncIterator[list[dict]]:
+        """Yield sensor history in pages of at most page_size rows, newest first.
+
+        Pages are requested with an offset; the iteration ends on a short
+        page, after max_rows, or if the server returns the same page again
+        (an offset it does not honour).
+        """
+        offset = 0
+        previous_head = None
+        while max_rows is None or offset < max_rows:
+            limit = page_size if max_rows is None else min(page_size, max_rows - offset)
+            page = await self.get_device_data(device_id, limit, offset)
+            if not page:
+                return
+            if offset and page[0] == previous_head:
+                _LOGGER.warning(
+                    "History paging for %s stopped: server ignored offset %s",
+                    device_id, offset,
+                )
+                return
+            previous_head = page[0]
+            yield page
+            offset += len(page)
+            if len(page) < limit:
+                return
 
     async def get_online_devices(self) -> list[str]:
         """Fetch online device IDs via REST."""
+        return await self._single_flight(
+            LYKYN_API_DEVICE_ONLINE, self._fetch_online_devices
+        )
+
+    async def _fetch_online_devices(self) -> list[str]:
         session = await self._ensure_session()
-        url = f"{LYKYN_BASE_URL}{LYKYN_API_DEVICE_ONLINE}"
+        url = f"{self._base_url}{LYKYN_API_DEVICE_ONLINE}"
         async with session.get(url) as resp:
             if resp.status != 200:
                 return self._online_devices
-            data = await resp.json()
-            self._online_devices = data.get("devices", [])
+            data = await resp.json(loads=JSON_CODEC.loads)
+            self._set_online_devices(data.get("devices", []))
             return self._online_devices
 
+    def _set_online_devices(self, devices: list[str]) -> None:
+        if devices != self._online_devices:
+            self._availability_version += 1
+        self._online_devices = devices
+
     async def connect_socket(self) -> None:
         """Connect to the Socket.io server for real-time updates."""
         if self._sio is not None and self._connected:
@@ -196,109 +798,243 @@ class LykynApiClient:
         cookie_str = ""
         if self._session:
             jar = self._session.cookie_jar
-            cookies = jar.filter_cookies(LYKYN_BASE_URL)
+            cookies = jar.filter_cookies(self._base_url)
             cookie_str = "; ".join(f"{k}={v.value}" for k, v in cookies.items())
 
-        self._sio = socketio.AsyncClient(
+        # The Socket.io stack is only imported once a socket is needed, and
+        # off the event loop
+        transport = await asyncio.get_running_loop().run_in_executor(
+            None, importlib.import_module, f"{__package__}.transport"
+        )
+
+        websocket_options = {}
+        if self._ws_compression:
+            websocket_options["compress"] = WS_COMPRESSION_WBITS
+        if self._ws_heartbeat:
+            websocket_options["heartbeat"] = self._ws_heartbeat
+
+        self._sio = transport.MeteredAsyncClient(
+            metrics=self._metrics,
+            websocket_extra_options=websocket_options,
             reconnection=True,
             reconnection_attempts=0,  # infinite
             reconnection_delay=5,
             reconnection_delay_max=60,
             logger=False,
             engineio_logger=False,
+            http_session=await self._ensure_socket_session(),
         )
 
-        auth_header = json.dumps({"type": "user", "token": self._user_id})
+        auth_header = JSON_CODEC.dumps({"type": "user", "token": self._user_id})
 
-        @self._sio.event
-        async def connect():
-            _LOGGER.info("Socket.io connected to Lykyn")
-            self._connected = True
-            await self._sio.emit("getOnlineDevices")
-
-        @self._sio.event
-        async def disconnect():
-            _LOGGER.warning("Socket.io disconnected from Lykyn")
-            self._connected = False
-
-        @self._sio.on("onlineDevices")
-        async def on_online_devices(data):
-            self._online_devices = data if data else []
-            _LOGGER.debug("Online devices: %s", self._online_devices)
-            await self._notify_update(None)
-
-        @self._sio.on("updateDevice")
-        async def on_update_device(device, *args):
-            device_id = device.get("id")
-            if device_id:
-                self._devices[device_id] = device
-                _LOGGER.debug("Device updated: %s (%s)", device.get("name"), device_id)
-                await self._notify_update(device_id)
-
-        @self._sio.on("realtimeDeviceUpdates")
-        async def on_realtime_device_updates(data, *args):
-            device_id = data.get("id") if isinstance(data, dict) else None
-            if device_id and device_id in self._devices:
-                device = self._devices[device_id]
-                info = device.get("info", {})
-                calibrate = info.get("calibrate", {})
-                if "temp" in data:
-                    calibrate["temp"] = data["temp"]
-                if "hum" in data:
-                    calibrate["hum"] = data["hum"]
-                if "calibratedTemp" in data:
-                    calibrate["calibratedTemp"] = data["calibratedTemp"]
-                if "calibratedHum" in data:
-                    calibrate["calibratedHum"] = data["calibratedHum"]
-                info["calibrate"] = calibrate
-                device["info"] = info
-                _LOGGER.debug("Realtime update for %s: temp=%s hum=%s", device_id, data.get("temp"), data.get("hum"))
-                await self._notify_update(device_id)
-
-        @self._sio.on("deleteDevice")
-        async def on_delete_device(device_id):
-            self._devices.pop(device_id, None)
-            _LOGGER.info("Device deleted: %s", device_id)
-            await self._notify_update(device_id)
+        for event in SOCKET_EVENTS:
+            self._sio.on(event, functools.partial(self.handle_event, event))
 
         headers = {"auth": auth_header}
         if cookie_str:
             headers["Cookie"] = cookie_str
 
+        self._established = False
+        # Started first so a failed connect is retried by the heartbeat
+        if self._heartbeat is None or self._heartbeat.done():
+            self._heartbeat = asyncio.get_running_loop().create_task(
+                self._heartbeat_loop()
+            )
+        self._connecting = True
         try:
             await self._sio.connect(
-                LYKYN_BASE_URL,
+                self._base_url,
                 headers=headers,
-                transports=["websocket", "polling"],
+                transports=self._transports,
             )
         except Exception as err:
             _LOGGER.error("Failed to connect Socket.io: %s", err)
             raise LykynApiError(f"Socket.io connection failed: {err}") from err
+        finally:
+            self._connecting = False
+
+        self._last_stream_event = time.monotonic()
+
+    async def _heartbeat_loop(self) -> None:
+        """Probe the socket periodically and reconnect a stalled stream.
+
+        Each tick times a getOnlineDevices -> onlineDevices round-trip. The
+        socket is reconnected when a probe goes unanswered or when devices
+        are online but no device event arrived for STREAM_STALL_TIMEOUT.
+        """
+        while True:
+            await asyncio.sleep(HEARTBEAT_INTERVAL)
+            self._check_freshness()
+            for device_id in list(self._previews):
+                if self._reconcile_previews(device_id):
+                    self._store_device(device_id, self._devices[device_id])
+                    self._notify_update(device_id)
+            if self._sio is None:
+                continue
+            if not self._connected:
+                if self._established or self._connecting:
+                    # python-socketio is reconnecting an established socket,
+                    # or the first connect is still in progress
+                    continue
+                # A failed first connect is not retried by python-socketio
+                _LOGGER.info("Retrying Socket.io connection to Lykyn")
+                try:
+                    await self.disconnect_socket()
+                    await self.connect_socket()
+                except LykynApiError:
+                    pass
+                continue
+            now = time.monotonic()
+            stalled = None
+            if self._probe_sent is not None:
+                if now - self._probe_sent > HEARTBEAT_TIMEOUT:
+                    stalled = "heartbeat probe unanswered"
+            elif (
+                self._online_devices
+                and now - self._last_stream_event > STREAM_STALL_TIMEOUT
+            ):
+                stalled = "no device events"
+            if stalled is not None:
+                _LOGGER.warning(
+                    "Lykyn event stream stalled (%s), reconnecting", stalled
+                )
+                self._metrics.counter("stall_reconnects").inc()
+                self._probe_sent = None
+                try:
+                    await self.disconnect_socket()
+                    await self.connect_socket()
+                except LykynApiError:
+                    pass
+                continue
+            if self._probe_sent is None:
+                self._probe_sent = now
+                try:
+                    await self._emit("getOnlineDevices")
+                except Exception as err:  # socketio raises its own errors
+                    _LOGGER.debug("Heartbeat probe failed: %s", err)
+
+    def _check_freshness(self) -> None:
+        """Notify listeners of devices that just went stale."""
+        if not self._freshness_threshold:
+            return
+        now = time.monotonic()
+        for device_id, seen in self._last_event.items():
+            if device_id in self._stale or now - seen < self._freshness_threshold:
+                continue
+            self._stale.add(device_id)
+            self._availability_version += 1
+            _LOGGER.debug("No data from %s for %.0fs", device_id, now - seen)
+            self._notify_update(device_id)
+
+    async def handle_event(self, event: str, *args) -> None:
+        """Process an inbound Socket.io event.
+
+        Socket.io handlers route through here, as does journal replay.
+        """
+        if self._journal is not None:
+            self._journal.record(JOURNAL_IN, event, args)
+        self._metrics.counter("socket_events", event).inc()
+        handler = self._event_handlers.get(event)
+        if handler is not None:
+            await handler(*args)
+
+    async def _emit(self, event: str, *args) -> None:
+        if self._journal is not None:
+            self._journal.record(JOURNAL_OUT, event, args)
+        start = time.perf_counter()
+        await self._sio.emit(event, args[0] if len(args) == 1 else args or None)
+        self._metrics.histogram("emit_seconds", LATENCY_BUCKETS, event).observe(
+            time.perf_counter() - start
+        )
+
+    async def _on_connect(self, *args) -> None:
+        _LOGGER.info("Socket.io connected to Lykyn")
+        self._connected = True
+        self._established = True
+        self._connected_event.set()
+        self._metrics.counter("connects").inc()
+        if self._sio is not None:
+            await self._emit("getOnlineDevices")
+
+    async def _on_disconnect(self, *args) -> None:
+        _LOGGER.warning("Socket.io disconnected from Lykyn")
+        self._connected = False
+        self._connected_event.clear()
+        self._probe_sent = None
+        self._metrics.counter("disconnects").inc()
+
+    async def _on_online_devices(self, data, *args) -> None:
+        if self._probe_sent is not None:
+            self._rtt = time.monotonic() - self._probe_sent
+            self._probe_sent = None
+            self._metrics.histogram("rtt_seconds", LATENCY_BUCKETS).observe(self._rtt)
+        self._set_online_devices(data if data else [])
+        self._invalidate_memo()
+        _LOGGER.debug("Online devices: %s", self._online_devices)
+        self._notify_update(None)
+
+    async def _on_update_device(self, device, *args) -> None:
+        device_id = device.get("id")
+        if device_id:
+            self._store_device(device_id, device)
+            self._reconcile_previews(device_id)
+            self._mark_seen(device_id)
+            self._invalidate_memo()
+            self._metrics.counter("device_events", device_id).inc()
+            _LOGGER.debug("Device updated: %s (%s)", device.get("name"), device_id)
+            self._deliver_sample(device_id)
+            self._notify_update(device_id)
+
+    async def _on_realtime_device_updates(self, data, *args) -> None:
+        device_id = data.get("id") if isinstance(data, dict) else None
+        if device_id and device_id in self._devices:
+            self._mark_seen(device_id)
+            self._metrics.counter("device_events", device_id).inc()
+            device = self._devices[device_id]
+            info = device.get("info", {})
+            calibrate = info.get("calibrate", {})
+            readings = {key: data[key] for key in REALTIME_KEYS if key in data}
+            if any(calibrate.get(key) != value for key, value in readings.items()):
+                calibrate = {**calibrate, **readings}
+                self._store_device(
+                    device_id, {**device, "info": {**info, "calibrate": calibrate}}
+                )
+                self._reconcile_previews(device_id)
+            _LOGGER.debug("Realtime update for %s: temp=%s hum=%s", device_id, data.get("temp"), data.get("hum"))
+            self._deliver_sample(device_id)
+            self._notify_update(device_id)
+
+    async def _on_delete_device(self, device_id, *args) -> None:
+        self._drop_device(device_id)
+        self._last_event.pop(device_id, None)
+        self._last_event_wall.pop(device_id, None)
+        self._stale.discard(device_id)
+        self._invalidate_memo()
+        _LOGGER.info("Device deleted: %s", device_id)
+        self._notify_update(device_id)
 
     async def update_device(self, device_id: str, update: dict) -> None:
         """Send device update via Socket.io."""
         if not self._sio or not self._connected:
             raise LykynApiError("Not connected to Socket.io")
 
-        await self._sio.emit("updateDevice", (update, {"id": device_id}))
+        await self._emit("updateDevice", update, {"id": device_id})
         _LOGGER.debug("Sent updateDevice for %s: %s", device_id, update)
 
     async def update_device_info(self, device_id: str, info_update: dict) -> None:
         """Update the info field of a device.
 
-        Merges info_update into the current info, optimistically updates
-        the local cache, then sends the full info object to the server
-        (server does a full replace, not merge).
+        Merges info_update into a new snapshot of the current info,
+        optimistically stores it, then sends the full info object to the
+        server (server does a full replace, not merge).
         """
         device = self._devices.get(device_id, {})
-        current_info = device.get("info", {})
-        for key, value in info_update.items():
-            if isinstance(value, dict) and isinstance(current_info.get(key), dict):
-                current_info[key].update(value)
-            else:
-                current_info[key] = value
-        await self._notify_update(device_id)
-        await self.update_device(device_id, {"info": current_info})
+        info = merge_info(device.get("info", {}), info_update)
+        self._store_device(device_id, {**device, "info": info})
+        if isinstance(info_update.get("calibrate"), dict):
+            self._start_previews(device_id, info_update["calibrate"])
+        self._notify_update(device_id)
+        await self.update_device(device_id, {"info": info})
 
     async def disconnect_socket(self) -> None:
         """Disconnect Socket.io."""
@@ -309,10 +1045,26 @@ class LykynApiClient:
                 pass
             self._sio = None
             self._connected = False
+            self._connected_event.clear()
 
     async def close(self, *args) -> None:
         """Close all connections."""
+        if self._heartbeat is not None:
+            self._heartbeat.cancel()
+            self._heartbeat = None
         await self.disconnect_socket()
-        if self._session and not self._session.closed:
-            await self._session.close()
-            self._session = None
+        for lane in self._lanes.values():
+            if lane.worker is not None:
+                lane.worker.cancel()
+                lane.worker = None
+        if self._journal is not None:
+            await self._journal.async_close()
+            self._journal = None
+        for attr in ("_socket_session", "_session"):
+            session = getattr(self, attr)
+            if session is not None and not session.closed:
+                await session.close()
+            setattr(self, attr, None)
+        if self._pool_acquired:
+            self._pool_acquired = False
+            await self._pool.release()
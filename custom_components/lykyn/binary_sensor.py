@@ -0,0 +1,70 @@
+"""Binary sensor platform for Lykyn."""
+
+import logging
+
+from homeassistant.components.binary_sensor import (
+    BinarySensorDeviceClass,
+    BinarySensorEntity,
+)
+from homeassistant.const import EntityCategory
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from homeassistant.config_entries import ConfigEntry
+
+from .anomaly import FANS_INEFFECTIVE, HUMIDIFIER_INEFFECTIVE, SENSOR_STUCK
+from .capabilities import HUMIDITY, TEMPERATURE
+from .const import DOMAIN
+from .coordinator import LykynCoordinator
+from .entity import LykynEntity, async_add_device_entities
+
+_LOGGER = logging.getLogger(__name__)
+
+# detector -> info keys it watches
+DETECTOR_REQUIRES = {
+    SENSOR_STUCK: TEMPERATURE + HUMIDITY,
+    HUMIDIFIER_INEFFECTIVE: ("humidifier",),
+    FANS_INEFFECTIVE: ("airin", "airout"),
+}
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up Lykyn binary sensors."""
+    coordinator: LykynCoordinator = hass.data[DOMAIN][entry.entry_id]
+    async_add_device_entities(coordinator, async_add_entities, _device_entities)
+
+
+def _device_entities(coordinator: LykynCoordinator, device_id: str) -> list:
+    """Create the anomaly binary sensors for one device."""
+    return [
+        LykynAnomalySensor(coordinator, device_id, key)
+        for key in coordinator.anomalies.detectors
+    ]
+
+
+class LykynAnomalySensor(LykynEntity, BinarySensorEntity):
+    """Problem reported by one of the streaming anomaly detectors."""
+
+    _attr_device_class = BinarySensorDeviceClass.PROBLEM
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    def __init__(
+        self, coordinator: LykynCoordinator, device_id: str, key: str
+    ) -> None:
+        super().__init__(coordinator, device_id)
+        self._key = key
+        self._attr_translation_key = key
+        self._attr_unique_id = f"{device_id}_{key}"
+        self.requires = DETECTOR_REQUIRES[key]
+
+    def _state_version(self) -> tuple:
+        # Detectors change state on samples that leave the snapshot as is
+        return (self.is_on, *super()._state_version())
+
+    @property
+    def is_on(self) -> bool:
+        return self.coordinator.anomalies.is_active(self._device_id, self._key)
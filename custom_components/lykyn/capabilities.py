@@ -0,0 +1,83 @@
+"""Per-device capability profiles derived from the cloud payload.
+
+A profile is the set of settings a kit actually reports: the top level
+keys of its info plus the keys nested under info.smart and
+info.calibrate, written as "smart.<key>" and "calibrate.<key>". Entities
+declare the keys they read and are only created for kits whose profile
+has at least one of them. Profiles are cached per info dict, which the
+client replaces on every change, so a kit is re-profiled only when its
+snapshot changed.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from .api import LykynApiClient
+
+NESTED = ("smart", "calibrate")
+
+# Readings the sensors, forecasts and detectors fall back through
+TEMPERATURE = ("calibrate.temp", "temp")
+HUMIDITY = ("calibrate.hum", "hum")
+
+
+@dataclass(frozen=True, slots=True)
+class DeviceProfile:
+    """Firmware version and reported keys of one kit."""
+
+    firmware: str | None
+    keys: frozenset[str]
+
+    def supports(self, requires: tuple[str, ...]) -> bool:
+        """Return True when any of the keys is reported; () always matches."""
+        return not requires or any(key in self.keys for key in requires)
+
+
+def device_profile(info: dict) -> DeviceProfile:
+    """Build the profile of a kit from its info dict."""
+    keys = set(info)
+    for name in NESTED:
+        nested = info.get(name)
+        if isinstance(nested, dict):
+            keys.update(f"{name}.{key}" for key in nested)
+    specs = info.get("specs")
+    firmware = specs.get("version") if isinstance(specs, dict) else None
+    return DeviceProfile(firmware, frozenset(keys))
+
+
+class LykynCapabilities:
+    """Cache of device profiles, refreshed when a kit's info changes."""
+
+    def __init__(self, client: LykynApiClient) -> None:
+        self._client = client
+        self._profiles: dict[str, tuple[dict, DeviceProfile]] = {}
+
+    def profile(self, device_id: str) -> DeviceProfile:
+        info = self._client.devices.get(device_id, {}).get("info", {})
+        cached = self._profiles.get(device_id)
+        if cached is not None and cached[0] is info:
+            return cached[1]
+        profile = device_profile(info)
+        self._profiles[device_id] = (info, profile)
+        return profile
+
+    def refresh(self, device_id: str) -> bool:
+        """Re-profile a kit; return True when it reports keys it did not before.
+
+        Kits that were never profiled return False: their entities are
+        created from the profile when the kit is first added.
+        """
+        cached = self._profiles.get(device_id)
+        if cached is None:
+            return False
+        return not self.profile(device_id).keys <= cached[1].keys
+
+    def remove(self, device_id: str) -> None:
+        self._profiles.pop(device_id, None)
+
+    def as_dict(self) -> dict[str, dict]:
+        return {
+            device_id: {"firmware": profile.firmware, "keys": sorted(profile.keys)}
+            for device_id, (_, profile) in self._profiles.items()
+        }
@@ -5,10 +5,38 @@ from typing import Any
 
 import voluptuous as vol
 
-from homeassistant.config_entries import ConfigFlow, ConfigFlowResult
+from homeassistant.config_entries import (
+    ConfigEntry,
+    ConfigFlow,
+    ConfigFlowResult,
+    OptionsFlow,
+)
+from homeassistant.core import callback
 
 from .api import LykynApiClient, LykynAuthError
-from .const import CONF_EMAIL, CONF_PASSWORD, DOMAIN
+from .const import (
+    CONF_CONTROL_FAN_SPEED,
+    CONF_CONTROL_MIN_CYCLE,
+    CONF_EMAIL,
+    CONF_FRESHNESS_THRESHOLD,
+    CONF_HISTORY_PREFETCH,
+    CONF_JOURNAL,
+    CONF_LOCAL_CONTROL,
+    CONF_METRICS,
+    CONF_PASSWORD,
+    CONF_TRANSPORT,
+    CONF_WS_COMPRESSION,
+    CONF_WS_HEARTBEAT,
+    DEFAULT_CONTROL_FAN_SPEED,
+    DEFAULT_CONTROL_MIN_CYCLE,
+    DEFAULT_FRESHNESS_THRESHOLD,
+    DEFAULT_HISTORY_PREFETCH,
+    DEFAULT_WS_HEARTBEAT,
+    DOMAIN,
+    TRANSPORT_AUTO,
+    TRANSPORTS,
+)
+from .handoff import async_store_client
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -18,6 +46,12 @@ class LykynConfigFlow(ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: ConfigEntry) -> OptionsFlow:
+        """Return the options flow."""
+        return LykynOptionsFlow()
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> ConfigFlowResult:
@@ -37,20 +71,21 @@ class LykynConfigFlow(ConfigFlow, domain=DOMAIN):
 
             try:
                 await client.authenticate()
-                devices = await client.get_devices()
-                await client.close()
-
-                return self.async_create_entry(
-                    title=f"Lykyn ({user_input[CONF_EMAIL]})",
-                    data=user_input,
-                )
+                await client.get_devices()
             except LykynAuthError:
                 errors["base"] = "invalid_auth"
+                await client.close()
             except Exception:
                 _LOGGER.exception("Unexpected error during config flow")
                 errors["base"] = "cannot_connect"
-            finally:
                 await client.close()
+            else:
+                # Setup claims this client instead of logging in again
+                async_store_client(self.hass, user_input[CONF_EMAIL], client)
+                return self.async_create_entry(
+                    title=f"Lykyn ({user_input[CONF_EMAIL]})",
+                    data=user_input,
+                )
 
         return self.async_show_form(
             step_id="user",
@@ -62,3 +97,69 @@ class LykynConfigFlow(ConfigFlow, domain=DOMAIN):
             ),
             errors=errors,
         )
+
+
+class LykynOptionsFlow(OptionsFlow):
+    """Handle Lykyn options."""
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Manage the options."""
+        if user_input is not None:
+            return self.async_create_entry(data=user_input)
+
+        options = self.config_entry.options
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Optional(
+                        CONF_TRANSPORT,
+                        default=options.get(CONF_TRANSPORT, TRANSPORT_AUTO),
+                    ): vol.In(list(TRANSPORTS)),
+                    vol.Optional(
+                        CONF_WS_COMPRESSION,
+                        default=options.get(CONF_WS_COMPRESSION, False),
+                    ): bool,
+                    vol.Optional(
+                        CONF_WS_HEARTBEAT,
+                        default=options.get(CONF_WS_HEARTBEAT, DEFAULT_WS_HEARTBEAT),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=300)),
+                    vol.Optional(
+                        CONF_FRESHNESS_THRESHOLD,
+                        default=options.get(
+                            CONF_FRESHNESS_THRESHOLD, DEFAULT_FRESHNESS_THRESHOLD
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=1440)),
+                    vol.Optional(
+                        CONF_LOCAL_CONTROL,
+                        default=options.get(CONF_LOCAL_CONTROL, False),
+                    ): bool,
+                    vol.Optional(
+                        CONF_CONTROL_FAN_SPEED,
+                        default=options.get(
+                            CONF_CONTROL_FAN_SPEED, DEFAULT_CONTROL_FAN_SPEED
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=3)),
+                    vol.Optional(
+                        CONF_CONTROL_MIN_CYCLE,
+                        default=options.get(
+                            CONF_CONTROL_MIN_CYCLE, DEFAULT_CONTROL_MIN_CYCLE
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=3600)),
+                    vol.Optional(
+                        CONF_HISTORY_PREFETCH,
+                        default=options.get(
+                            CONF_HISTORY_PREFETCH, DEFAULT_HISTORY_PREFETCH
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=3600)),
+                    vol.Optional(
+                        CONF_METRICS, default=options.get(CONF_METRICS, False)
+                    ): bool,
+                    vol.Optional(
+                        CONF_JOURNAL, default=options.get(CONF_JOURNAL, False)
+                    ): bool,
+                }
+            ),
+        )
@@ -14,7 +14,143 @@ LYKYN_API_DEVICE = "/api/device/{device_id}"
 LYKYN_API_DEVICE_DATA = "/api/device/{device_id}/data"
 LYKYN_API_DEVICE_ONLINE = "/api/device/online"
 
-PLATFORMS = ["sensor", "switch", "number", "light", "select"]
+# Shared HTTP connection pool
+HTTP_POOL_LIMIT = 20
+HTTP_POOL_LIMIT_PER_HOST = 8
+HTTP_KEEPALIVE_TIMEOUT = 60
+HTTP_DNS_CACHE_TTL = 300
+HTTP_CONNECT_TIMEOUT = 10
+HTTP_REQUEST_TIMEOUT = 30
+
+# Update callback dispatch
+EVENT_QUEUE_SIZE = 256
+CALLBACK_TIMEOUT = 5.0
+OVERFLOW_DROP_OLDEST = "drop_oldest"
+OVERFLOW_DROP_NEWEST = "drop_newest"
+
+# Metrics (seconds and bytes)
+CONF_METRICS = "metrics"
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+PAYLOAD_SIZE_BUCKETS = (128, 512, 1024, 4096, 16384, 65536, 262144)
+DETECTOR_BUCKETS = (1e-6, 5e-6, 1e-5, 5e-5, 1e-4, 5e-4, 1e-3)
+
+# Socket.io transport
+CONF_TRANSPORT = "transport"
+CONF_WS_COMPRESSION = "websocket_compression"
+CONF_WS_HEARTBEAT = "websocket_heartbeat"
+TRANSPORT_AUTO = "auto"
+TRANSPORT_WEBSOCKET = "websocket"
+TRANSPORT_POLLING = "polling"
+# auto starts with long-polling and upgrades to websocket
+TRANSPORTS = {
+    TRANSPORT_AUTO: ["polling", "websocket"],
+    TRANSPORT_WEBSOCKET: ["websocket"],
+    TRANSPORT_POLLING: ["polling"],
+}
+DEFAULT_WS_HEARTBEAT = 0
+# zlib window bits for permessage-deflate
+WS_COMPRESSION_WBITS = 15
+
+# Application-level heartbeat and stream freshness (seconds)
+HEARTBEAT_INTERVAL = 60
+HEARTBEAT_TIMEOUT = 20
+STREAM_STALL_TIMEOUT = 900
+CONF_FRESHNESS_THRESHOLD = "freshness_threshold"
+# Minutes without an event before a device's entities become unavailable
+DEFAULT_FRESHNESS_THRESHOLD = 0
+
+# Local calibration preview: a provisional calibrated reading is kept until
+# the device reports a value within tolerance, or for at most the timeout
+CALIBRATION_PREVIEW_TIMEOUT = 300
+CALIBRATION_TOLERANCE = 0.15
+
+# Grow schedules
+DATA_SCHEDULER = f"{DOMAIN}_scheduler"
+SCHEDULE_STORAGE_VERSION = 1
+# Seconds to wait for the socket before applying missed schedule steps
+SCHEDULE_CONNECT_TIMEOUT = 60
+
+# Local climate control for MANUAL-mode kits
+CONF_LOCAL_CONTROL = "local_control"
+CONF_CONTROL_FAN_SPEED = "control_fan_speed"
+CONF_CONTROL_MIN_CYCLE = "control_min_cycle"
+DEFAULT_CONTROL_FAN_SPEED = 2
+# Seconds an actuator stays on or off before it may switch again
+DEFAULT_CONTROL_MIN_CYCLE = 120
+CONTROL_TEMP_HYSTERESIS = 0.5
+CONTROL_HUM_HYSTERESIS = 3.0
+
+# Light transitions: seconds between frames of one kit, and the cap on
+# frames sent per second across all ramping kits of an account
+RAMP_FRAME_INTERVAL = 0.5
+RAMP_MAX_EMITS_PER_SECOND = 20
+
+# History paging and export
+HISTORY_PAGE_SIZE = 1000
+EXPORT_DIR = f"{DOMAIN}_exports"
+EXPORT_CSV = "csv"
+EXPORT_CSV_GZIP = "csv_gzip"
+EXPORT_PARQUET = "parquet"
+EXPORT_FORMATS = [EXPORT_CSV, EXPORT_CSV_GZIP, EXPORT_PARQUET]
+
+# History query cache: rows per cached segment (one day at the kit's
+# 10 minute cadence), segment lifetime in seconds and total cached rows
+HISTORY_SEGMENT_SIZE = 144
+HISTORY_CACHE_TTL = 120
+HISTORY_CACHE_MAX_ROWS = 20_000
+HISTORY_QUERY_MAX_ROWS = 5000
+# Segments a query reads after seeking to its end time
+HISTORY_QUERY_MAX_SEGMENTS = 64
+
+# History prefetch: window (seconds, 0 = off) over which kits are spread,
+# concurrent fetches, and how long a queried kit keeps prefetch priority
+CONF_HISTORY_PREFETCH = "history_prefetch"
+DEFAULT_HISTORY_PREFETCH = 0
+PREFETCH_CONCURRENCY = 2
+PREFETCH_RECENT_QUERY = 3600
+
+# Trend forecasts: fit window and minimum samples/span (seconds) before a
+# trend is trusted, samples between exact re-summations, the longest
+# prediction reported (minutes) and the default device trigger horizon
+FORECAST_WINDOW = 1800
+FORECAST_MIN_SAMPLES = 5
+FORECAST_MIN_SPAN = 300
+FORECAST_RESUM = 1000
+FORECAST_MAX_MINUTES = 24 * 60
+DEFAULT_FORECAST_HORIZON = 30
+SIGNAL_FORECAST = f"{DOMAIN}_forecast_{{device_id}}"
+
+# Anomaly detectors: a reading is stuck after this many identical samples
+# over this many seconds; a humidifier or fan run (fans at or above the
+# minimum speed, kit above its band) must move humidity or temperature
+# by the given amount within the given seconds
+ANOMALY_STUCK_SAMPLES = 30
+ANOMALY_STUCK_SECONDS = 2 * 3600
+ANOMALY_HUMIDIFIER_SECONDS = 20 * 60
+ANOMALY_HUMIDIFIER_RISE = 1.0
+ANOMALY_FAN_MIN_SPEED = 2
+ANOMALY_FAN_SECONDS = 30 * 60
+ANOMALY_FAN_DROP_TEMP = 0.3
+ANOMALY_FAN_DROP_HUM = 1.0
+
+# Socket event journal
+CONF_JOURNAL = "journal"
+JOURNAL_IN = "in"
+JOURNAL_OUT = "out"
+JOURNAL_META = "meta"
+JOURNAL_SEGMENT_BYTES = 1024 * 1024
+JOURNAL_MAX_SEGMENTS = 8
+JOURNAL_FLUSH_BYTES = 64 * 1024
+JOURNAL_FLUSH_INTERVAL = 5.0
+
+# Seconds the config flow's authenticated client waits to be claimed by setup
+DATA_HANDOFF = f"{DOMAIN}_handoff"
+HANDOFF_TTL = 60
+
+PLATFORMS = ["sensor", "binary_sensor", "switch", "number", "light", "select"]
+
+# Dispatcher signal carrying a list of device ids that need entities
+SIGNAL_NEW_DEVICES = f"{DOMAIN}_new_devices_{{entry_id}}"
 
 MUSHROOM_PRESETS = {
     "OysterPearlGrey": {"minTemp": 12, "maxTemp": 20, "minHum": 85, "maxHum": 89},
@@ -0,0 +1,251 @@
+"""Local closed-loop climate control for MANUAL-mode Lykyn kits.
+
+The cloud enforces info.minTemp/maxTemp/minHum/maxHum only in SMART mode.
+With local control enabled, kits in MANUAL mode are driven from Home
+Assistant instead: every sample is checked against the kit's band with
+hysteresis, actuators respect a minimum on and off time, and the changes
+for one sample go out as a single update_device_info. A change held back
+by the minimum on/off time is re-evaluated when the hold expires, so a kit
+whose readings stop changing is not left waiting for the next sample.
+
+Actuator switches are counted for every kit and labelled with who was in
+charge (local, smart or manual), so local control can be compared with
+the cloud SMART mode even while it is disabled.
+"""
+
+from __future__ import annotations
+
+import functools
+import logging
+import time
+from datetime import datetime
+from typing import TYPE_CHECKING
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant
+from homeassistant.helpers.event import async_call_later
+
+from .api import LykynApiError
+from .const import (
+    CONTROL_HUM_HYSTERESIS,
+    CONTROL_TEMP_HYSTERESIS,
+    LATENCY_BUCKETS,
+)
+from .metrics import MetricsRegistry
+
+if TYPE_CHECKING:
+    from .api import LykynApiClient
+
+_LOGGER = logging.getLogger(__name__)
+
+ACTUATORS = ("humidifier", "airin", "airout")
+
+
+class LykynClimateController:
+    """Hysteresis controller for humidifier and fans of MANUAL-mode kits."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        client: LykynApiClient,
+        metrics: MetricsRegistry,
+        enabled: bool,
+        fan_speed: int,
+        min_cycle: float,
+    ) -> None:
+        self._hass = hass
+        self._client = client
+        self._enabled = enabled
+        self._metrics = metrics
+        self._fan_speed = fan_speed
+        self._min_cycle = min_cycle
+        # device -> actuator -> monotonic time of the last observed switch
+        self._switched: dict[str, dict[str, float]] = {}
+        # device -> last observed actuator states, to count switches
+        self._observed: dict[str, dict[str, object]] = {}
+        self._versions: dict[str, int] = {}
+        self._writing: set[str] = set()
+        # device -> pending re-evaluation once a held actuator may switch
+        self._retries: dict[str, CALLBACK_TYPE] = {}
+        self._stats = {
+            "samples": 0,
+            "writes": 0,
+            "errors": 0,
+            "held": 0,
+            "latency_sum": 0.0,
+            "latency_max": 0.0,
+        }
+        # "<local, smart or manual>:<actuator>" -> switches observed
+        self._switches: dict[str, int] = {}
+
+    @property
+    def stats(self) -> dict:
+        """Return loop counters, latency and actuator switch counts."""
+        stats = dict(self._stats)
+        latency_sum = stats.pop("latency_sum")
+        stats["latency_mean"] = latency_sum / stats["writes"] if stats["writes"] else None
+        stats["switches"] = dict(self._switches)
+        return stats
+
+    def start(self) -> None:
+        self._client.register_update_callback(self.async_handle_update)
+
+    def stop(self) -> None:
+        self._client.unregister_update_callback(self.async_handle_update)
+        for cancel in self._retries.values():
+            cancel()
+        self._retries.clear()
+
+    async def async_handle_update(self, device_id: str | None) -> None:
+        """Evaluate a kit after its snapshot changed."""
+        if device_id is None:
+            return
+        client = self._client
+        device = client.devices.get(device_id)
+        if device is None:
+            self._forget(device_id)
+            return
+        version = client.device_version(device_id)
+        if self._versions.get(device_id) == version:
+            return
+        self._versions[device_id] = version
+        info = device.get("info", {})
+        control_type = info.get("controlType", "MANUAL")
+        local = self._enabled and control_type == "MANUAL"
+        self._observe(device_id, info, "local" if local else control_type.lower())
+        if not local:
+            self._cancel_retry(device_id)
+            return
+        if device_id in self._writing:
+            return
+        self._stats["samples"] += 1
+        await self._async_control(device_id, info)
+
+    async def _async_retry(self, device_id: str, _now: datetime) -> None:
+        """Re-evaluate a kit whose held actuator may switch now."""
+        self._retries.pop(device_id, None)
+        device = self._client.devices.get(device_id)
+        if device is None or not self._enabled:
+            return
+        info = device.get("info", {})
+        if info.get("controlType", "MANUAL") == "MANUAL":
+            await self._async_control(device_id, info)
+
+    def _cancel_retry(self, device_id: str) -> None:
+        cancel = self._retries.pop(device_id, None)
+        if cancel is not None:
+            cancel()
+
+    async def _async_control(self, device_id: str, info: dict) -> None:
+        """Send the actuator changes the current readings call for."""
+        if device_id in self._writing:
+            return
+        self._cancel_retry(device_id)
+        client = self._client
+        update, hold = self._decide(device_id, info)
+        if hold:
+            self._retries[device_id] = async_call_later(
+                self._hass, hold, functools.partial(self._async_retry, device_id)
+            )
+        if not update:
+            return
+        # Only one write per kit at a time; the next sample re-evaluates
+        self._writing.add(device_id)
+        try:
+            await client.update_device_info(device_id, update)
+        except LykynApiError as err:
+            self._stats["errors"] += 1
+            _LOGGER.warning("Local control write for %s failed: %s", device_id, err)
+            return
+        finally:
+            self._writing.discard(device_id)
+        self._stats["writes"] += 1
+        # Sample arrival to write acknowledged by the socket
+        latency = client.device_age(device_id)
+        if latency is not None:
+            self._stats["latency_sum"] += latency
+            self._stats["latency_max"] = max(self._stats["latency_max"], latency)
+            self._metrics.histogram(
+                "control_latency_seconds", LATENCY_BUCKETS
+            ).observe(latency)
+
+    def _decide(self, device_id: str, info: dict) -> tuple[dict, float]:
+        """Return the actuator changes for the current sample.
+
+        Also returns the seconds until the first held-back change may be
+        made, or 0 when nothing is held.
+        """
+        calibrate = info.get("calibrate", {})
+        temp = self._client.calibrated_reading(device_id, "calibratedTemp")
+        hum = self._client.calibrated_reading(device_id, "calibratedHum")
+        temp = temp if temp is not None else calibrate.get("temp")
+        hum = hum if hum is not None else calibrate.get("hum")
+        if temp is None or hum is None:
+            return {}, 0.0
+        update: dict = {}
+        holds: list[float] = []
+
+        humidifier = bool(info.get("humidifier"))
+        min_hum, max_hum = info.get("minHum"), info.get("maxHum")
+        if min_hum is not None:
+            if not humidifier and hum < min_hum:
+                humidifier = True
+            elif humidifier and hum >= min_hum + CONTROL_HUM_HYSTERESIS:
+                humidifier = False
+        if max_hum is not None and hum > max_hum:
+            humidifier = False
+        holds.append(self._propose(device_id, update, "humidifier", info, humidifier))
+
+        venting = bool(info.get("airin") or info.get("airout"))
+        max_temp = info.get("maxTemp")
+        too_warm = max_temp is not None and temp > max_temp
+        too_humid = max_hum is not None and hum > max_hum
+        if too_warm or too_humid:
+            venting = True
+        elif venting and (
+            (max_temp is None or temp <= max_temp - CONTROL_TEMP_HYSTERESIS)
+            and (max_hum is None or hum <= max_hum - CONTROL_HUM_HYSTERESIS)
+        ):
+            venting = False
+        speed = self._fan_speed if venting else 0
+        holds.append(self._propose(device_id, update, "airin", info, speed))
+        holds.append(self._propose(device_id, update, "airout", info, speed))
+        return update, min((hold for hold in holds if hold > 0), default=0.0)
+
+    def _propose(
+        self, device_id: str, update: dict, actuator: str, info: dict, value
+    ) -> float:
+        """Add a change unless it is a no-op or the actuator must hold.
+
+        Returns the seconds left on the hold, or 0 when not held.
+        """
+        # A fan that is already running keeps whatever speed it was given
+        if bool(info.get(actuator)) == bool(value):
+            return 0.0
+        switched = self._switched.get(device_id, {}).get(actuator)
+        if switched is not None:
+            remaining = switched + self._min_cycle - time.monotonic()
+            if remaining > 0:
+                self._stats["held"] += 1
+                return remaining
+        update[actuator] = value
+        return 0.0
+
+    def _observe(self, device_id: str, info: dict, mode: str) -> None:
+        """Count on/off transitions, whether made here, by SMART or by hand."""
+        observed = self._observed.setdefault(device_id, {})
+        now = time.monotonic()
+        for actuator in ACTUATORS:
+            state = bool(info.get(actuator))
+            previous = observed.get(actuator)
+            observed[actuator] = state
+            if previous is None or previous == state:
+                continue
+            self._switched.setdefault(device_id, {})[actuator] = now
+            key = f"{mode}:{actuator}"
+            self._switches[key] = self._switches.get(key, 0) + 1
+            self._metrics.counter("actuator_switches", key).inc()
+
+    def _forget(self, device_id: str) -> None:
+        self._cancel_retry(device_id)
+        for table in (self._switched, self._observed, self._versions):
+            table.pop(device_id, None)
@@ -2,12 +2,33 @@
 
 import asyncio
 import logging
+import time
 
-from homeassistant.core import HomeAssistant
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers import issue_registry as ir
+from homeassistant.helpers.dispatcher import async_dispatcher_send
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 
+from .anomaly import LykynAnomalyMonitor
 from .api import LykynApiClient, LykynApiError
-from .const import DOMAIN
+from .capabilities import LykynCapabilities
+from .const import (
+    CONF_HISTORY_PREFETCH,
+    DEFAULT_HISTORY_PREFETCH,
+    DOMAIN,
+    LATENCY_BUCKETS,
+    SIGNAL_FORECAST,
+    SIGNAL_NEW_DEVICES,
+)
+from .controller import LykynClimateController
+from .fleet import FleetAggregator
+from .forecast import LykynForecaster
+from .history import LykynHistoryCache
+from .prefetch import LykynHistoryPrefetcher
+from .ramp import LykynRampScheduler
+from .metrics import MetricsRegistry
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -15,35 +36,189 @@ _LOGGER = logging.getLogger(__name__)
 class LykynCoordinator(DataUpdateCoordinator):
     """Coordinator for Lykyn devices."""
 
-    def __init__(self, hass: HomeAssistant, client: LykynApiClient) -> None:
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        client: LykynApiClient,
+        metrics: MetricsRegistry | None = None,
+    ) -> None:
         super().__init__(
             hass,
             _LOGGER,
             name=DOMAIN,
             # No polling interval - we use Socket.io push updates
         )
+        self.config_entry = entry
         self.client = client
+        self.new_devices_signal = SIGNAL_NEW_DEVICES.format(entry_id=entry.entry_id)
+        # Devices that have entities; diffed against the client's devices
+        self._known_devices: set[str] = set()
+        self.capabilities = LykynCapabilities(client)
+        self.fleet = FleetAggregator()
+        self.forecast = LykynForecaster()
+        self.controller: LykynClimateController | None = None
+        self.ramps = LykynRampScheduler(client)
+        self.history = LykynHistoryCache(client)
+        self.prefetch = LykynHistoryPrefetcher(
+            client,
+            self.history,
+            entry.options.get(CONF_HISTORY_PREFETCH, DEFAULT_HISTORY_PREFETCH),
+        )
+        # Device snapshot version last folded into the fleet aggregates
+        self._fleet_versions: dict[str, int] = {}
+        self.metrics = metrics or MetricsRegistry()
+        self.client.attach_metrics(self.metrics)
+        self.anomalies = LykynAnomalyMonitor(self.metrics)
         self.client.register_update_callback(self._on_device_update)
+        # Every reading feeds the forecaster and detectors, even when the
+        # update notification for it is coalesced
+        self.client.register_sample_callback(self._process_sample)
 
     async def _on_device_update(self, device_id: str | None) -> None:
         """Handle real-time device update from Socket.io."""
+        start = time.perf_counter()
+        if device_id is not None and (
+            (device_id in self.client.devices) != (device_id in self._known_devices)
+        ):
+            self._async_sync_devices()
+        if device_id is None:
+            self.fleet.set_online(self.client.online_devices)
+        else:
+            self._update_fleet(device_id)
+            if device_id not in self.client.devices:
+                self._forget_samples(device_id)
+            if device_id in self._known_devices and self.capabilities.refresh(
+                device_id
+            ):
+                _LOGGER.debug("Lykyn device %s reports new settings", device_id)
+                async_dispatcher_send(self.hass, self.new_devices_signal, [device_id])
         self.async_set_updated_data(self.client.devices)
+        self.metrics.histogram("coordinator_update_seconds", LATENCY_BUCKETS).observe(
+            time.perf_counter() - start
+        )
 
     async def _async_update_data(self) -> dict[str, dict]:
         """Fetch data from API (fallback, mainly for initial load)."""
         try:
             await self.client.get_devices()
             await self.client.get_online_devices()
-            return self.client.devices
         except LykynApiError as err:
             _LOGGER.error("Error fetching Lykyn data: %s", err)
             raise
+        self._async_sync_devices()
+        self._rebuild_fleet()
+        return self.client.devices
+
+    def _update_fleet(self, device_id: str) -> None:
+        """Fold one device's current snapshot into the fleet aggregates."""
+        client = self.client
+        device = client.devices.get(device_id)
+        if device is None:
+            self._fleet_versions.pop(device_id, None)
+            self.fleet.remove(device_id)
+            return
+        version = client.device_version(device_id)
+        if self._fleet_versions.get(device_id) == version:
+            return
+        self._fleet_versions[device_id] = version
+        info = device.get("info", {})
+        temp, hum = self._readings(device_id, info)
+        self.fleet.update(device_id, temp, hum, _out_of_band(info, temp, hum))
+
+    @callback
+    def _process_sample(self, device_id: str) -> None:
+        """Feed the forecaster and anomaly detectors every sample, changed or not."""
+        device = self.client.devices.get(device_id)
+        seen = self.client.last_event_time(device_id)
+        if device is None or seen is None:
+            return
+        info = device.get("info", {})
+        temp, hum = self._readings(device_id, info)
+        forecast = self.forecast.sample(device_id, seen, {"temp": temp, "hum": hum}, info)
+        if forecast is not None:
+            async_dispatcher_send(
+                self.hass, SIGNAL_FORECAST.format(device_id=device_id), forecast
+            )
+        for key, active in self.anomalies.sample(device_id, seen, info, temp, hum):
+            issue_id = f"{key}_{device_id}"
+            if not active:
+                ir.async_delete_issue(self.hass, DOMAIN, issue_id)
+                continue
+            _LOGGER.warning("Lykyn %s detected on %s", key.replace("_", " "), device_id)
+            ir.async_create_issue(
+                self.hass,
+                DOMAIN,
+                issue_id,
+                is_fixable=False,
+                severity=ir.IssueSeverity.WARNING,
+                translation_key=key,
+                translation_placeholders={"name": device.get("name", device_id)},
+            )
+
+    def _forget_samples(self, device_id: str) -> None:
+        """Drop the trend fit and detector state of a deleted device."""
+        self.forecast.remove(device_id)
+        for key in self.anomalies.remove(device_id):
+            ir.async_delete_issue(self.hass, DOMAIN, f"{key}_{device_id}")
+
+    def _readings(self, device_id: str, info: dict) -> tuple[float | None, float | None]:
+        """Return the calibrated temperature and humidity shown for a device."""
+        calibrate = info.get("calibrate", {})
+        temp = (
+            self.client.calibrated_reading(device_id, "calibratedTemp")
+            or calibrate.get("temp")
+            or info.get("temp")
+        )
+        hum = (
+            self.client.calibrated_reading(device_id, "calibratedHum")
+            or calibrate.get("hum")
+            or info.get("hum")
+        )
+        if hum is not None:
+            hum = min(hum, 100.0)
+        return temp, hum
+
+    def _rebuild_fleet(self) -> None:
+        for device_id in set(self._fleet_versions) | set(self.client.devices):
+            self._update_fleet(device_id)
+        self.fleet.set_online(self.client.online_devices)
+
+    @callback
+    def _async_sync_devices(self) -> None:
+        """Add entities for new devices and remove deleted devices."""
+        current = set(self.client.devices)
+        added = current - self._known_devices
+        removed = self._known_devices - current
+        self._known_devices = current
+        if added:
+            _LOGGER.info("New Lykyn devices: %s", ", ".join(sorted(added)))
+            async_dispatcher_send(self.hass, self.new_devices_signal, sorted(added))
+            self.prefetch.schedule(added)
+        if removed:
+            device_registry = dr.async_get(self.hass)
+            for device_id in removed:
+                _LOGGER.info("Removing deleted Lykyn device %s", device_id)
+                self.capabilities.remove(device_id)
+                device = device_registry.async_get_device(
+                    identifiers={(DOMAIN, device_id)}
+                )
+                if device is not None:
+                    # Removing the device also removes its entities
+                    device_registry.async_update_device(
+                        device.id, remove_config_entry_id=self.config_entry.entry_id
+                    )
 
     async def async_setup(self) -> None:
         """Set up the coordinator: fetch devices and connect socket."""
-        await self.client.get_devices()
+        # A client handed over by the config flow already has the device list
+        if not self.client.devices:
+            await self.client.get_devices()
         await self.client.get_online_devices()
         self.data = self.client.devices
+        self._known_devices = set(self.client.devices)
+        self._rebuild_fleet()
+        self.prefetch.schedule(self._known_devices)
 
         try:
             await self.client.connect_socket()
@@ -52,8 +227,24 @@ class LykynCoordinator(DataUpdateCoordinator):
 
     async def async_shutdown(self) -> None:
         """Shut down the coordinator."""
-        try:
-            self.client.unregister_update_callback(self._on_device_update)
-        except ValueError:
-            pass
+        self.client.unregister_update_callback(self._on_device_update)
+        self.client.unregister_sample_callback(self._process_sample)
+        await self.ramps.async_stop()
+        await self.prefetch.async_stop()
+        for device_id, keys in self.anomalies.active().items():
+            for key in keys:
+                ir.async_delete_issue(self.hass, DOMAIN, f"{key}_{device_id}")
         await self.client.close()
+
+
+def _out_of_band(info: dict, temp: float | None, hum: float | None) -> bool:
+    """Return True when a reading is outside the kit's configured band."""
+    for value, low, high in (
+        (temp, info.get("minTemp"), info.get("maxTemp")),
+        (hum, info.get("minHum"), info.get("maxHum")),
+    ):
+        if value is None:
+            continue
+        if (low is not None and value < low) or (high is not None and value > high):
+            return True
+    return False
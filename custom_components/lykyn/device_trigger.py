@@ -0,0 +1,130 @@
+"""Device triggers for Lykyn trend forecasts."""
+
+from __future__ import annotations
+
+import voluptuous as vol
+
+from homeassistant.components.device_automation import DEVICE_TRIGGER_BASE_SCHEMA
+from homeassistant.components.device_automation.exceptions import (
+    InvalidDeviceAutomationConfig,
+)
+from homeassistant.const import CONF_DEVICE_ID, CONF_DOMAIN, CONF_PLATFORM, CONF_TYPE
+from homeassistant.core import CALLBACK_TYPE, HassJob, HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.trigger import TriggerActionType, TriggerInfo
+from homeassistant.helpers.typing import ConfigType
+
+from .const import DEFAULT_FORECAST_HORIZON, DOMAIN, SIGNAL_FORECAST
+
+CONF_HORIZON = "horizon"
+
+# trigger type -> forecast key
+TRIGGER_TYPES = {
+    "temperature_limit_soon": "temp",
+    "humidity_limit_soon": "hum",
+}
+
+HORIZON_SCHEMA = vol.All(vol.Coerce(int), vol.Range(min=1, max=1440))
+
+TRIGGER_SCHEMA = DEVICE_TRIGGER_BASE_SCHEMA.extend(
+    {
+        vol.Required(CONF_TYPE): vol.In(TRIGGER_TYPES),
+        vol.Optional(CONF_HORIZON, default=DEFAULT_FORECAST_HORIZON): HORIZON_SCHEMA,
+    }
+)
+
+
+def _lykyn_id(hass: HomeAssistant, device_id: str) -> str | None:
+    """Return the Lykyn id of a kit device, or None for other devices."""
+    device = dr.async_get(hass).async_get(device_id)
+    if device is None:
+        return None
+    lykyn_id = next(
+        (ident for domain, ident in device.identifiers if domain == DOMAIN), None
+    )
+    # The account service device is identified by its entry id
+    if lykyn_id is None or lykyn_id in device.config_entries:
+        return None
+    return lykyn_id
+
+
+async def async_get_triggers(
+    hass: HomeAssistant, device_id: str
+) -> list[dict[str, str]]:
+    """List the forecast triggers of a kit."""
+    if _lykyn_id(hass, device_id) is None:
+        return []
+    return [
+        {
+            CONF_PLATFORM: "device",
+            CONF_DOMAIN: DOMAIN,
+            CONF_DEVICE_ID: device_id,
+            CONF_TYPE: trigger_type,
+        }
+        for trigger_type in TRIGGER_TYPES
+    ]
+
+
+async def async_get_trigger_capabilities(
+    hass: HomeAssistant, config: ConfigType
+) -> dict[str, vol.Schema]:
+    """Let the user pick the horizon in minutes."""
+    return {
+        "extra_fields": vol.Schema(
+            {vol.Optional(CONF_HORIZON, default=DEFAULT_FORECAST_HORIZON): HORIZON_SCHEMA}
+        )
+    }
+
+
+async def async_attach_trigger(
+    hass: HomeAssistant,
+    config: ConfigType,
+    action: TriggerActionType,
+    trigger_info: TriggerInfo,
+) -> CALLBACK_TYPE:
+    """Fire when the predicted time to a limit drops to the horizon or below.
+
+    The trigger fires once per approach and re-arms after the prediction
+    goes back above the horizon or becomes unknown.
+    """
+    lykyn_id = _lykyn_id(hass, config[CONF_DEVICE_ID])
+    if lykyn_id is None:
+        raise InvalidDeviceAutomationConfig(
+            f"{config[CONF_DEVICE_ID]} is not a Lykyn kit"
+        )
+    key = TRIGGER_TYPES[config[CONF_TYPE]]
+    horizon = config[CONF_HORIZON]
+    job = HassJob(action)
+    trigger_data = trigger_info["trigger_data"]
+    armed = True
+
+    @callback
+    def _forecast_updated(forecast: dict[str, float | None]) -> None:
+        nonlocal armed
+        minutes = forecast.get(key)
+        if minutes is None or minutes > horizon:
+            armed = True
+            return
+        if not armed:
+            return
+        armed = False
+        hass.async_run_hass_job(
+            job,
+            {
+                "trigger": {
+                    **trigger_data,
+                    CONF_PLATFORM: "device",
+                    CONF_DOMAIN: DOMAIN,
+                    CONF_DEVICE_ID: config[CONF_DEVICE_ID],
+                    CONF_TYPE: config[CONF_TYPE],
+                    CONF_HORIZON: horizon,
+                    "minutes": round(minutes, 1),
+                    "description": f"{config[CONF_TYPE]} in {minutes:.0f} minutes",
+                }
+            },
+        )
+
+    return async_dispatcher_connect(
+        hass, SIGNAL_FORECAST.format(device_id=lykyn_id), _forecast_updated
+    )
@@ -0,0 +1,42 @@
+"""Diagnostics support for Lykyn."""
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import CONF_EMAIL, CONF_PASSWORD, DOMAIN
+from .coordinator import LykynCoordinator
+from .schedule import get_scheduler, schedule_summary
+
+TO_REDACT = {CONF_EMAIL, CONF_PASSWORD, "user_id", "token", "title"}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator: LykynCoordinator = hass.data[DOMAIN][entry.entry_id]
+    client = coordinator.client
+    return {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        "connected": client.connected,
+        "online_devices": client.online_devices,
+        "devices": async_redact_data(client.devices, TO_REDACT),
+        "requests": client.request_stats,
+        "connection_pool": client.pool_stats,
+        "dispatch": client.dispatch_stats,
+        "calibration_preview": client.calibration_stats,
+        "climate_control": coordinator.controller.stats
+        if coordinator.controller is not None
+        else None,
+        "light_ramps": coordinator.ramps.stats,
+        "history_cache": coordinator.history.stats,
+        "history_prefetch": coordinator.prefetch.stats,
+        "anomalies": coordinator.anomalies.stats,
+        "capabilities": coordinator.capabilities.as_dict(),
+        "metrics": coordinator.metrics.as_dict(),
+        "schedules": schedule_summary(get_scheduler(hass).schedules(entry.entry_id)),
+        "scheduler": get_scheduler(hass).stats,
+    }
@@ -1,21 +1,99 @@
 """Base entity for Lykyn."""
 
-from homeassistant.helpers.device_registry import DeviceInfo
+from collections.abc import Callable
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import callback
+from homeassistant.helpers.device_registry import DeviceEntryType, DeviceInfo
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.entity import Entity
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN
 from .coordinator import LykynCoordinator
 
 
-class LykynEntity(CoordinatorEntity[LykynCoordinator]):
+@callback
+def async_add_device_entities(
+    coordinator: LykynCoordinator,
+    async_add_entities: AddEntitiesCallback,
+    factory: Callable[[LykynCoordinator, str], list[Entity]],
+) -> None:
+    """Add per-device entities now and for devices that appear later.
+
+    Only entities whose required keys the device reports are added. The
+    signal is sent again when a device starts reporting new keys, and
+    entities that already exist are skipped.
+    """
+    created: set[str] = set()
+
+    @callback
+    def _add(device_ids: list[str]) -> None:
+        entities: list[Entity] = []
+        for device_id in device_ids:
+            profile = coordinator.capabilities.profile(device_id)
+            for entity in factory(coordinator, device_id):
+                unique_id = entity.unique_id
+                if unique_id in created or not profile.supports(entity.requires):
+                    continue
+                created.add(unique_id)
+                # Let the entity come back if its device is removed and re-added
+                entity.async_on_remove(lambda uid=unique_id: created.discard(uid))
+                entities.append(entity)
+        if entities:
+            async_add_entities(entities)
+
+    _add(list(coordinator.client.devices))
+    coordinator.config_entry.async_on_unload(
+        async_dispatcher_connect(
+            coordinator.hass, coordinator.new_devices_signal, _add
+        )
+    )
+
+
+class _WriteOnChangeEntity(CoordinatorEntity[LykynCoordinator]):
+    """Coordinator entity that skips state writes while nothing changed.
+
+    The coordinator updates on every device event; an entity only writes
+    its state when _state_version differs from the last written one.
+    """
+
+    _written_version: tuple | None = None
+
+    def _state_version(self) -> tuple:
+        """Return a key that changes whenever the entity state may change."""
+        return (self.coordinator.last_update_success,)
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        version = self._state_version()
+        if version == self._written_version:
+            return
+        self._written_version = version
+        self.async_write_ha_state()
+
+
+class LykynEntity(_WriteOnChangeEntity):
     """Base entity for Lykyn devices."""
 
     _attr_has_entity_name = True
+    # Info keys the entity reads; it is created if the device reports any
+    requires: tuple[str, ...] = ()
 
     def __init__(self, coordinator: LykynCoordinator, device_id: str) -> None:
         super().__init__(coordinator)
         self._device_id = device_id
 
+    def _state_version(self) -> tuple:
+        """Change with this device's snapshot or availability."""
+        client = self.coordinator.client
+        return (
+            client.device_version(self._device_id),
+            client.availability_version,
+            self.coordinator.last_update_success,
+        )
+
     @property
     def _device_data(self) -> dict:
         """Get the device data from coordinator."""
@@ -34,7 +112,11 @@ class LykynEntity(CoordinatorEntity[LykynCoordinator]):
     @property
     def available(self) -> bool:
         """Return True if entity is available."""
-        return self._is_online and super().available
+        return (
+            self._is_online
+            and self.coordinator.client.is_fresh(self._device_id)
+            and super().available
+        )
 
     @property
     def device_info(self) -> DeviceInfo:
@@ -47,3 +129,20 @@ class LykynEntity(CoordinatorEntity[LykynCoordinator]):
             model="Mushroom Grow Kit",
             sw_version=device.get("info", {}).get("specs", {}).get("version"),
         )
+
+
+class LykynAccountEntity(_WriteOnChangeEntity):
+    """Base entity for per-account (config entry) Lykyn entities."""
+
+    _attr_has_entity_name = True
+
+    def __init__(self, coordinator: LykynCoordinator, entry: ConfigEntry) -> None:
+        super().__init__(coordinator)
+        self._entry_id = entry.entry_id
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, entry.entry_id)},
+            name=entry.title,
+            manufacturer="Lykyn (Swayfish)",
+            model="Lykyn account",
+            entry_type=DeviceEntryType.SERVICE,
+        )
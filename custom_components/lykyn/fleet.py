@@ -0,0 +1,159 @@
+"""Incrementally maintained fleet aggregates for a Lykyn account."""
+
+import heapq
+
+
+class _Extremes:
+    """Min or max of a keyed set of values using a lazy-deletion heap.
+
+    Replaced and removed values stay in the heap until they reach the top,
+    so updates are O(log n) and reading the extreme is amortized O(log n).
+    """
+
+    def __init__(self, largest: bool = False) -> None:
+        self._sign = -1 if largest else 1
+        self._heap: list[tuple[float, str]] = []
+        self._values: dict[str, float] = {}
+
+    def set(self, key: str, value: float | None) -> None:
+        if value is None:
+            self._values.pop(key, None)
+            return
+        if self._values.get(key) == value:
+            return
+        self._values[key] = value
+        heapq.heappush(self._heap, (self._sign * value, key))
+        # Bound the stale entries kept around by frequent updates
+        if len(self._heap) > 2 * len(self._values) + 16:
+            self._heap = [(self._sign * v, k) for k, v in self._values.items()]
+            heapq.heapify(self._heap)
+
+    @property
+    def value(self) -> float | None:
+        heap = self._heap
+        while heap:
+            signed, key = heap[0]
+            if self._values.get(key) == self._sign * signed:
+                return self._sign * signed
+            heapq.heappop(heap)
+        return None
+
+
+class _Average:
+    """Running sum and count of a keyed set of values."""
+
+    def __init__(self) -> None:
+        self._values: dict[str, float] = {}
+        self._sum = 0.0
+
+    def set(self, key: str, value: float | None) -> None:
+        self._sum -= self._values.pop(key, 0.0)
+        if value is not None:
+            self._values[key] = value
+            self._sum += value
+        if not self._values:
+            # Reset float drift whenever the set empties
+            self._sum = 0.0
+
+    @property
+    def value(self) -> float | None:
+        return self._sum / len(self._values) if self._values else None
+
+
+class FleetAggregator:
+    """Average, minimum and maximum readings and band/online counts.
+
+    Each device contributes one sample; replacing a device's sample costs
+    O(log n) regardless of fleet size. Only online devices contribute
+    readings, so offline kits do not hold the aggregates at old values.
+    """
+
+    def __init__(self) -> None:
+        self._samples: dict[str, tuple[float | None, float | None, bool]] = {}
+        self._online: set[str] = set()
+        # Online devices that belong to the account (have a sample)
+        self._online_known: set[str] = set()
+        self._out_of_band: set[str] = set()
+        self._temp_avg = _Average()
+        self._hum_avg = _Average()
+        self._temp_min = _Extremes()
+        self._temp_max = _Extremes(largest=True)
+        self._hum_min = _Extremes()
+        self._hum_max = _Extremes(largest=True)
+
+    def update(
+        self,
+        device_id: str,
+        temp: float | None,
+        hum: float | None,
+        out_of_band: bool,
+    ) -> None:
+        """Replace the sample of one device."""
+        self._samples[device_id] = (temp, hum, out_of_band)
+        self._apply(device_id)
+
+    def remove(self, device_id: str) -> None:
+        """Forget a device."""
+        self._samples.pop(device_id, None)
+        self._online.discard(device_id)
+        self._apply(device_id)
+
+    def set_online(self, device_ids: list[str]) -> None:
+        """Update online devices; only devices whose state flipped are touched."""
+        online = set(device_ids)
+        changed = online ^ self._online
+        self._online = online
+        for device_id in changed:
+            self._apply(device_id)
+
+    def _apply(self, device_id: str) -> None:
+        sample = self._samples.get(device_id)
+        if sample is None or device_id not in self._online:
+            self._online_known.discard(device_id)
+            temp = hum = None
+            out_of_band = False
+        else:
+            self._online_known.add(device_id)
+            temp, hum, out_of_band = sample
+        self._temp_avg.set(device_id, temp)
+        self._temp_min.set(device_id, temp)
+        self._temp_max.set(device_id, temp)
+        self._hum_avg.set(device_id, hum)
+        self._hum_min.set(device_id, hum)
+        self._hum_max.set(device_id, hum)
+        if out_of_band:
+            self._out_of_band.add(device_id)
+        else:
+            self._out_of_band.discard(device_id)
+
+    @property
+    def online(self) -> int:
+        return len(self._online_known)
+
+    @property
+    def out_of_band(self) -> int:
+        return len(self._out_of_band)
+
+    @property
+    def avg_temperature(self) -> float | None:
+        return self._temp_avg.value
+
+    @property
+    def min_temperature(self) -> float | None:
+        return self._temp_min.value
+
+    @property
+    def max_temperature(self) -> float | None:
+        return self._temp_max.value
+
+    @property
+    def avg_humidity(self) -> float | None:
+        return self._hum_avg.value
+
+    @property
+    def min_humidity(self) -> float | None:
+        return self._hum_min.value
+
+    @property
+    def max_humidity(self) -> float | None:
+        return self._hum_max.value
@@ -0,0 +1,145 @@
+"""Incremental trend forecasts of when a kit leaves its setpoint band.
+
+Each kit keeps a sliding-window least-squares line through its recent
+temperature and humidity samples. The window sums (n, Σt, Σy, Σt², Σty)
+are updated when a sample enters or leaves, so a new sample costs O(1)
+amortized instead of refitting the window. The sums are recomputed from
+the window every FORECAST_RESUM samples, which also rebases time to the
+oldest sample and bounds floating point drift.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+
+from .const import (
+    FORECAST_MAX_MINUTES,
+    FORECAST_MIN_SAMPLES,
+    FORECAST_MIN_SPAN,
+    FORECAST_RESUM,
+    FORECAST_WINDOW,
+)
+
+# key -> (info keys of the lower and upper limit)
+LIMITS = {
+    "temp": ("minTemp", "maxTemp"),
+    "hum": ("minHum", "maxHum"),
+}
+
+
+class _TrendFit:
+    """Least-squares line over the samples of the last window seconds."""
+
+    __slots__ = ("_window", "_samples", "_base", "_added", "n", "st", "sy", "stt", "sty")
+
+    def __init__(self, window: float) -> None:
+        self._window = window
+        self._samples: deque[tuple[float, float]] = deque()
+        self._base = 0.0
+        self._added = 0
+        self.n = 0
+        self.st = self.sy = self.stt = self.sty = 0.0
+
+    def add(self, t: float, y: float) -> None:
+        if not self._samples:
+            self._base = t
+        self._samples.append((t, y))
+        self._apply(t - self._base, y, 1)
+        while self._samples[0][0] < t - self._window:
+            old_t, old_y = self._samples.popleft()
+            self._apply(old_t - self._base, old_y, -1)
+        self._added += 1
+        if self._added >= FORECAST_RESUM:
+            self._resum()
+
+    def _apply(self, x: float, y: float, sign: int) -> None:
+        self.n += sign
+        self.st += sign * x
+        self.sy += sign * y
+        self.stt += sign * x * x
+        self.sty += sign * x * y
+
+    def _resum(self) -> None:
+        self._added = 0
+        self._base = self._samples[0][0]
+        self.n = 0
+        self.st = self.sy = self.stt = self.sty = 0.0
+        for t, y in self._samples:
+            self._apply(t - self._base, y, 1)
+
+    @property
+    def span(self) -> float:
+        return self._samples[-1][0] - self._samples[0][0] if self._samples else 0.0
+
+    def line(self, t: float) -> tuple[float, float] | None:
+        """Return (fitted value at t, slope per second), or None if undetermined."""
+        denominator = self.n * self.stt - self.st * self.st
+        if self.n < FORECAST_MIN_SAMPLES or self.span < FORECAST_MIN_SPAN or denominator <= 0:
+            return None
+        slope = (self.n * self.sty - self.st * self.sy) / denominator
+        intercept = (self.sy - slope * self.st) / self.n
+        return intercept + slope * (t - self._base), slope
+
+
+def _minutes_to_limit(line: tuple[float, float], low, high) -> float | None:
+    """Return minutes until the fitted line crosses the limit it is heading for."""
+    value, slope = line
+    if (low is not None and value < low) or (high is not None and value > high):
+        return 0.0
+    if slope < 0 and low is not None:
+        seconds = (low - value) / slope
+    elif slope > 0 and high is not None:
+        seconds = (high - value) / slope
+    else:
+        return None
+    minutes = seconds / 60
+    return minutes if minutes <= FORECAST_MAX_MINUTES else None
+
+
+class LykynForecaster:
+    """Per-kit trend fits and predicted minutes until each limit is crossed."""
+
+    def __init__(self, window: float = FORECAST_WINDOW) -> None:
+        self._window = window
+        self._fits: dict[str, dict[str, _TrendFit]] = {}
+        self._last: dict[str, float] = {}
+        self._forecasts: dict[str, dict[str, float | None]] = {}
+
+    def sample(
+        self,
+        device_id: str,
+        t: float,
+        readings: dict[str, float | None],
+        info: dict,
+    ) -> dict[str, float | None] | None:
+        """Add the readings seen at time t; return the new forecast.
+
+        Returns None when t is not newer than the device's last sample.
+        """
+        if t <= self._last.get(device_id, float("-inf")):
+            return None
+        self._last[device_id] = t
+        fits = self._fits.setdefault(device_id, {})
+        forecast: dict[str, float | None] = {}
+        for key, (low_key, high_key) in LIMITS.items():
+            value = readings.get(key)
+            fit = fits.get(key)
+            if value is not None:
+                if fit is None:
+                    fit = fits[key] = _TrendFit(self._window)
+                fit.add(t, value)
+            line = fit.line(t) if fit is not None else None
+            forecast[key] = (
+                _minutes_to_limit(line, info.get(low_key), info.get(high_key))
+                if line is not None
+                else None
+            )
+        self._forecasts[device_id] = forecast
+        return forecast
+
+    def time_to_limit(self, device_id: str, key: str) -> float | None:
+        return self._forecasts.get(device_id, {}).get(key)
+
+    def remove(self, device_id: str) -> None:
+        for table in (self._fits, self._last, self._forecasts):
+            table.pop(device_id, None)
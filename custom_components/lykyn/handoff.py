@@ -0,0 +1,64 @@
+"""Hand the config flow's authenticated client over to entry setup."""
+
+import logging
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+from .api import LykynApiClient
+from .const import DATA_HANDOFF, HANDOFF_TTL
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@callback
+def async_store_client(
+    hass: HomeAssistant, email: str, client: LykynApiClient
+) -> None:
+    """Park a logged-in client (with its fetched devices) for setup to claim.
+
+    If setup doesn't claim it within HANDOFF_TTL seconds the client is
+    closed and setup falls back to a fresh login.
+    """
+    handoffs: dict[str, tuple[LykynApiClient, CALLBACK_TYPE]]
+    handoffs = hass.data.setdefault(DATA_HANDOFF, {})
+    _async_discard(hass, handoffs, email)
+
+    async def _expire(_now) -> None:
+        stored = handoffs.get(email)
+        if stored is None or stored[0] is not client:
+            return
+        del handoffs[email]
+        _LOGGER.debug("Unclaimed Lykyn client for %s expired", email)
+        await client.close()
+
+    handoffs[email] = (client, async_call_later(hass, HANDOFF_TTL, _expire))
+
+
+@callback
+def async_take_client(hass: HomeAssistant, email: str) -> LykynApiClient | None:
+    """Claim the parked client for email, if it is still there."""
+    handoffs = hass.data.get(DATA_HANDOFF, {})
+    stored = handoffs.pop(email, None)
+    if stored is None:
+        return None
+    client, cancel_expiry = stored
+    cancel_expiry()
+    if client.user_id is None:
+        hass.async_create_task(client.close())
+        return None
+    _LOGGER.debug("Reusing authenticated Lykyn client from config flow")
+    return client
+
+
+@callback
+def _async_discard(
+    hass: HomeAssistant,
+    handoffs: dict[str, tuple[LykynApiClient, CALLBACK_TYPE]],
+    email: str,
+) -> None:
+    stored = handoffs.pop(email, None)
+    if stored is not None:
+        client, cancel_expiry = stored
+        cancel_expiry()
+        hass.async_create_task(client.close())
@@ -0,0 +1,436 @@
+"""Lykyn sensor history: streaming export and a segment cache for queries.
+
+async_export_history pages through a kit's whole history and writes it
+to CSV, gzip-compressed CSV or Parquet, downloading the next page while
+the previous one is written in the executor.
+
+LykynHistoryCache answers time-range queries (the get_history service
+and the prefetcher) from fixed-size segments of rows, keyed by device and
+offset from the newest row, with a TTL and an LRU bound on cached rows.
+A range that ends in the past does not walk every newer segment: the
+query seeks to the first segment reaching its end by estimating the
+offset from the row spacing, doubling when the estimate is unusable and
+bisecting any overshoot, then reads at most HISTORY_QUERY_MAX_SEGMENTS
+segments from there.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import csv
+import gzip
+import importlib.util
+import io
+import logging
+import os
+import time
+from collections import OrderedDict
+from contextlib import aclosing
+from dataclasses import dataclass
+from datetime import datetime
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    EXPORT_CSV_GZIP,
+    EXPORT_DIR,
+    EXPORT_PARQUET,
+    HISTORY_CACHE_MAX_ROWS,
+    HISTORY_CACHE_TTL,
+    HISTORY_PAGE_SIZE,
+    HISTORY_QUERY_MAX_SEGMENTS,
+    HISTORY_SEGMENT_SIZE,
+    PREFETCH_RECENT_QUERY,
+)
+
+if TYPE_CHECKING:
+    from .api import LykynApiClient
+
+_LOGGER = logging.getLogger(__name__)
+
+# Columns of a /api/device/{id}/data row; unknown keys are dropped
+HISTORY_COLUMNS = (
+    "created_at",
+    "temp",
+    "hum",
+    "airin",
+    "airout",
+    "humidifier",
+    "light",
+    "minTemp",
+    "maxTemp",
+    "minHum",
+    "maxHum",
+)
+
+EXTENSIONS = {EXPORT_CSV_GZIP: ".csv.gz", EXPORT_PARQUET: ".parquet"}
+
+
+class _CsvWriter:
+    """Append pages to a (optionally gzip-compressed) CSV file."""
+
+    def __init__(self, path: str, compress: bool) -> None:
+        if compress:
+            self._file = io.TextIOWrapper(gzip.open(path, "wb"), newline="")
+        else:
+            self._file = open(path, "w", newline="", encoding="utf-8")
+        self._writer = csv.DictWriter(
+            self._file, HISTORY_COLUMNS, extrasaction="ignore"
+        )
+        self._writer.writeheader()
+
+    def write(self, rows: list[dict]) -> None:
+        self._writer.writerows(rows)
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class _ParquetWriter:
+    """Append pages to a Parquet file, one row group per page."""
+
+    def __init__(self, path: str) -> None:
+        import pyarrow as pa  # pylint: disable=import-outside-toplevel
+        import pyarrow.parquet as pq  # pylint: disable=import-outside-toplevel
+
+        self._pa = pa
+        self._schema = pa.schema(
+            [("created_at", pa.string()), ("temp", pa.float64()), ("hum", pa.float64())]
+            + [(column, pa.int64()) for column in HISTORY_COLUMNS[3:]]
+        )
+        self._writer = pq.ParquetWriter(path, self._schema, compression="zstd")
+
+    def write(self, rows: list[dict]) -> None:
+        self._writer.write_table(
+            self._pa.Table.from_pylist(
+                [{column: row.get(column) for column in HISTORY_COLUMNS} for row in rows],
+                schema=self._schema,
+            )
+        )
+
+    def close(self) -> None:
+        self._writer.close()
+
+
+def parquet_available() -> bool:
+    try:
+        return importlib.util.find_spec("pyarrow.parquet") is not None
+    except ModuleNotFoundError:
+        # find_spec imports the parent package, which may be missing
+        return False
+
+
+def _open_writer(path: str, fmt: str) -> _CsvWriter | _ParquetWriter:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    if fmt == EXPORT_PARQUET:
+        return _ParquetWriter(path)
+    return _CsvWriter(path, fmt == EXPORT_CSV_GZIP)
+
+
+def _created_at(row: dict) -> datetime | None:
+    created = dt_util.parse_datetime(row.get("created_at") or "")
+    if created is not None and created.tzinfo is None:
+        created = created.replace(tzinfo=dt_util.UTC)
+    return created
+
+
+def _older_than(row: dict, since: datetime) -> bool:
+    created = _created_at(row)
+    return created is not None and created < since
+
+
+async def async_export_history(
+    hass: HomeAssistant,
+    client: LykynApiClient,
+    device_id: str,
+    path: str,
+    fmt: str,
+    max_rows: int | None = None,
+    since: datetime | None = None,
+) -> dict[str, Any]:
+    """Stream a device's history to path and return rows and throughput.
+
+    At most two pages are held in memory: the one being written in the
+    executor and the next one being downloaded. Encoding and compression
+    happen in the executor as well.
+    """
+    start = time.monotonic()
+    writer = await hass.async_add_executor_job(_open_writer, path, fmt)
+    rows = pages = 0
+    pending = None
+    pages_iter = client.iter_device_data(device_id, HISTORY_PAGE_SIZE, max_rows)
+    try:
+        async with aclosing(pages_iter):
+            async for page in pages_iter:
+                done = False
+                if since is not None and _older_than(page[-1], since):
+                    # Newest first: the cut-off lies within this page
+                    page = [row for row in page if not _older_than(row, since)]
+                    done = True
+                if pending is not None:
+                    await pending
+                pending = hass.async_add_executor_job(writer.write, page)
+                rows += len(page)
+                pages += 1
+                if done:
+                    break
+        if pending is not None:
+            await pending
+    finally:
+        if pending is not None and not pending.done():
+            await asyncio.wait([pending])
+        await hass.async_add_executor_job(writer.close)
+    size = await hass.async_add_executor_job(os.path.getsize, path)
+    seconds = time.monotonic() - start
+    result = {
+        "path": path,
+        "rows": rows,
+        "pages": pages,
+        "bytes": size,
+        "seconds": round(seconds, 3),
+        "rows_per_second": round(rows / seconds, 1) if seconds else None,
+    }
+    _LOGGER.info(
+        "Exported %s history rows of %s to %s (%.0f rows/s)",
+        rows, device_id, path, result["rows_per_second"] or 0,
+    )
+    return result
+
+
+def export_path(hass: HomeAssistant, device_id: str, fmt: str) -> str:
+    """Return the default export file path for a device."""
+    stamp = dt_util.now().strftime("%Y%m%d-%H%M%S")
+    return hass.config.path(
+        EXPORT_DIR, f"{device_id}-{stamp}{EXTENSIONS.get(fmt, '.csv')}"
+    )
+
+
+@dataclass
+class _Segment:
+    """HISTORY_SEGMENT_SIZE rows of one device at one offset."""
+
+    fetched: float
+    rows: list[dict]
+    # created_at of every row, parsed once
+    times: list[datetime | None]
+
+
+class LykynHistoryCache:
+    """LRU/TTL cache of history segments in front of get_device_data.
+
+    History is cached in fixed-size segments keyed by (device, offset),
+    so overlapping time ranges share segments and only the missing ones
+    are fetched. Offsets are relative to the newest row, so when segment
+    0 comes back with a new head the device's deeper segments have
+    shifted and are dropped.
+    """
+
+    def __init__(
+        self,
+        client: LykynApiClient,
+        segment_size: int = HISTORY_SEGMENT_SIZE,
+        ttl: float = HISTORY_CACHE_TTL,
+        max_rows: int = HISTORY_CACHE_MAX_ROWS,
+    ) -> None:
+        self._client = client
+        self._segment_size = segment_size
+        self._ttl = ttl
+        self._max_rows = max_rows
+        self._segments: OrderedDict[tuple[str, int], _Segment] = OrderedDict()
+        self._rows = 0
+        # device -> created_at of its newest row when segment 0 was fetched
+        self._heads: dict[str, str | None] = {}
+        # device -> monotonic time of its last interactive query
+        self._queried: dict[str, float] = {}
+        self._active = 0
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "expired": 0,
+            "evictions": 0,
+            "invalidations": 0,
+            "prefetched": 0,
+        }
+
+    @property
+    def stats(self) -> dict[str, int]:
+        stats = dict(self._stats)
+        stats["segments"] = len(self._segments)
+        stats["rows"] = self._rows
+        return stats
+
+    @property
+    def busy(self) -> bool:
+        """Return True while an interactive query is running."""
+        return self._active > 0
+
+    async def async_wait_idle(self) -> None:
+        await self._idle.wait()
+
+    def recently_queried(self, device_id: str) -> bool:
+        queried = self._queried.get(device_id)
+        return queried is not None and time.monotonic() - queried < PREFETCH_RECENT_QUERY
+
+    async def async_prefetch(self, device_id: str) -> None:
+        """Load a device's newest segment unless it is cached."""
+        if (device_id, 0) in self._segments:
+            return
+        await self._segment(device_id, 0)
+        self._stats["prefetched"] += 1
+
+    async def async_query(
+        self,
+        device_id: str,
+        start: datetime,
+        end: datetime | None = None,
+        max_rows: int | None = None,
+    ) -> list[dict]:
+        """Return a device's rows recorded in [start, end], newest first."""
+        self._queried[device_id] = time.monotonic()
+        self._active += 1
+        self._idle.clear()
+        try:
+            return await self._query(device_id, start, end, max_rows)
+        finally:
+            self._active -= 1
+            if not self._active:
+                self._idle.set()
+
+    async def _query(
+        self,
+        device_id: str,
+        start: datetime,
+        end: datetime | None,
+        max_rows: int | None,
+    ) -> list[dict]:
+        result: list[dict] = []
+        last: datetime | None = None
+        previous_head = None
+        index = await self._seek(device_id, end) if end is not None else 0
+        first = index
+        while max_rows is None or len(result) < max_rows:
+            if index - first >= HISTORY_QUERY_MAX_SEGMENTS:
+                _LOGGER.debug(
+                    "History query for %s stopped after %s segments",
+                    device_id,
+                    HISTORY_QUERY_MAX_SEGMENTS,
+                )
+                break
+            segment = await self._segment(device_id, index)
+            if not segment.rows or (index > first and segment.rows[0] == previous_head):
+                break
+            previous_head = segment.rows[0]
+            for row, created in zip(segment.rows, segment.times):
+                if created is None or (end is not None and created > end):
+                    continue
+                if created < start:
+                    return result
+                # Segments fetched at different times may overlap
+                if last is not None and created >= last:
+                    continue
+                last = created
+                result.append(row)
+                if max_rows is not None and len(result) >= max_rows:
+                    return result
+            if len(segment.rows) < self._segment_size:
+                break
+            index += 1
+        return result
+
+    async def _seek(self, device_id: str, end: datetime) -> int:
+        """Return the first segment that can hold rows recorded at or before end.
+
+        Segments entirely newer than end are skipped by estimating the
+        distance from the row spacing, then bisecting any overshoot, so a
+        range far in the past costs a few requests instead of one per
+        segment.
+        """
+        lo = 0
+        lo_segment = await self._segment(device_id, 0)
+        if self._reaches(lo_segment, lo_segment, end):
+            return 0
+        guesses = 0
+        while True:
+            skip = self._skip(lo_segment, end)
+            # Grow geometrically while the spacing gives no useful estimate
+            guesses = 0 if skip > 1 else guesses + 1
+            step = skip if skip > 1 else 2 ** (guesses - 1)
+            segment = await self._segment(device_id, lo + step)
+            if self._reaches(segment, lo_segment, end):
+                hi = lo + step
+                break
+            lo, lo_segment = lo + step, segment
+        while hi - lo > 1:
+            mid = (lo + hi) // 2
+            segment = await self._segment(device_id, mid)
+            if self._reaches(segment, lo_segment, end):
+                hi = mid
+            else:
+                lo, lo_segment = mid, segment
+        return hi
+
+    def _reaches(self, segment: _Segment, newer: _Segment, end: datetime) -> bool:
+        """Return True unless every row of segment is newer than end."""
+        times = [created for created in segment.times if created is not None]
+        return (
+            len(segment.rows) < self._segment_size
+            or not times
+            or times[-1] <= end
+            # The server ignored the offset and sent the newer rows again
+            or (segment is not newer and segment.rows[0] == newer.rows[0])
+        )
+
+    def _skip(self, segment: _Segment, end: datetime) -> int:
+        """Estimate how many segments past this one the rows at end are."""
+        times = [created for created in segment.times if created is not None]
+        if len(times) < 2:
+            return 1
+        span = (times[0] - times[-1]).total_seconds()
+        if span <= 0:
+            return 1
+        rows = (times[-1] - end).total_seconds() / (span / (len(times) - 1))
+        return max(1, int(rows // self._segment_size))
+
+    async def _segment(self, device_id: str, index: int) -> _Segment:
+        key = (device_id, index)
+        now = time.monotonic()
+        segment = self._segments.get(key)
+        if segment is not None:
+            if now - segment.fetched < self._ttl:
+                self._stats["hits"] += 1
+                self._segments.move_to_end(key)
+                return segment
+            self._stats["expired"] += 1
+            self._pop(key)
+        self._stats["misses"] += 1
+        rows = await self._client.get_device_data(
+            device_id, self._segment_size, index * self._segment_size
+        )
+        if index == 0:
+            head = rows[0].get("created_at") if rows else None
+            if device_id in self._heads and self._heads[device_id] != head:
+                self._invalidate(device_id)
+            self._heads[device_id] = head
+        self._pop(key)
+        segment = _Segment(now, rows, [_created_at(row) for row in rows])
+        self._segments[key] = segment
+        self._rows += len(rows)
+        while self._rows > self._max_rows and len(self._segments) > 1:
+            self._stats["evictions"] += 1
+            self._pop(next(iter(self._segments)))
+        return segment
+
+    def _pop(self, key: tuple[str, int]) -> None:
+        segment = self._segments.pop(key, None)
+        if segment is not None:
+            self._rows -= len(segment.rows)
+
+    def _invalidate(self, device_id: str) -> None:
+        """Drop a device's segments after new rows shifted its offsets."""
+        self._stats["invalidations"] += 1
+        for key in [key for key in self._segments if key[0] == device_id]:
+            self._pop(key)
@@ -0,0 +1,230 @@
+"""Socket event journal and deterministic replay for Lykyn."""
+
+import asyncio
+import gzip
+import logging
+import os
+import time
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+
+from .api import JSON_CODEC, LykynApiClient
+from .const import (
+    JOURNAL_FLUSH_BYTES,
+    JOURNAL_FLUSH_INTERVAL,
+    JOURNAL_IN,
+    JOURNAL_MAX_SEGMENTS,
+    JOURNAL_META,
+    JOURNAL_SEGMENT_BYTES,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+SEGMENT_PREFIX = "segment-"
+SEGMENT_SUFFIX = ".jsonl.gz"
+
+
+class LykynEventJournal:
+    """Write socket events to a size-bounded ring of gzip segments.
+
+    Each record is one JSON line ``{"t", "d", "e", "a"}``: monotonic time,
+    direction (in/out), event name and arguments. Records are buffered in
+    memory and compressed/written on a dedicated thread, so recording costs
+    the event loop one JSON encode per event.
+
+    Every segment starts with a "devices" meta record holding the device
+    snapshots known when it was started, so the segments that survive
+    pruning can be replayed on their own.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        segment_bytes: int = JOURNAL_SEGMENT_BYTES,
+        max_segments: int = JOURNAL_MAX_SEGMENTS,
+    ) -> None:
+        self._directory = directory
+        self._segment_bytes = segment_bytes
+        self._max_segments = max_segments
+        self._buffer: list[str] = []
+        self._buffered_bytes = 0
+        self._last_flush = time.monotonic()
+        self._segment_index: int | None = None
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="lykyn_journal"
+        )
+        self._pending: asyncio.Future | None = None
+        # Latest full snapshot per device, and the snapshots as of the
+        # first record still in the buffer
+        self._devices: dict[str, dict] = {}
+        self._seed: list[dict] = []
+        self._seed_time = 0.0
+        self.records = 0
+        self.record(
+            JOURNAL_META, "start", ({"wall": time.time(), "codec": JSON_CODEC.name},)
+        )
+
+    @property
+    def directory(self) -> str:
+        return self._directory
+
+    def record(self, direction: str, event: str, args: tuple) -> None:
+        """Buffer one event; hands a full buffer to the writer thread."""
+        now = time.monotonic()
+        if not self._buffer:
+            self._seed = list(self._devices.values())
+            self._seed_time = now
+        self._track_devices(direction, event, args)
+        line = JSON_CODEC.dumps({"t": now, "d": direction, "e": event, "a": list(args)})
+        self._buffer.append(line)
+        self._buffered_bytes += len(line) + 1
+        self.records += 1
+        if (
+            self._buffered_bytes >= min(JOURNAL_FLUSH_BYTES, self._segment_bytes)
+            or now - self._last_flush >= JOURNAL_FLUSH_INTERVAL
+        ):
+            self._schedule_flush()
+
+    def _track_devices(self, direction: str, event: str, args: tuple) -> None:
+        if direction == JOURNAL_META and event == "devices":
+            self._devices = {device["id"]: device for device in args[0]}
+        elif direction != JOURNAL_IN or not args:
+            return
+        elif event == "updateDevice" and isinstance(args[0], dict) and "id" in args[0]:
+            self._devices[args[0]["id"]] = args[0]
+        elif event == "deleteDevice":
+            self._devices.pop(args[0], None)
+
+    def _schedule_flush(self) -> None:
+        if not self._buffer:
+            return
+        chunk = "\n".join(self._buffer) + "\n"
+        # Snapshots are never mutated, so the writer thread may encode them
+        seed = {
+            "t": self._seed_time,
+            "d": JOURNAL_META,
+            "e": "devices",
+            "a": [self._seed],
+        }
+        self._buffer = []
+        self._buffered_bytes = 0
+        self._last_flush = time.monotonic()
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._write(chunk, seed)
+            return
+        self._pending = loop.run_in_executor(
+            self._executor, self._write, chunk, seed
+        )
+
+    def _write(self, chunk: str, seed: dict) -> None:
+        """Append chunk to the current segment, rotating first if it won't fit.
+
+        seed is the devices record that opens the segment when chunk is the
+        first thing written to it.
+        """
+        try:
+            os.makedirs(self._directory, exist_ok=True)
+            if self._segment_index is None:
+                indexes = _segment_indexes(self._directory)
+                self._segment_index = indexes[-1] + 1 if indexes else 0
+            path = self._segment_path(self._segment_index)
+            # Each flush appends one gzip member; readers see one stream
+            data = gzip.compress(chunk.encode(), compresslevel=6)
+            size = os.path.getsize(path) if os.path.exists(path) else 0
+            if size and size + len(data) > self._segment_bytes:
+                self._segment_index += 1
+                self._prune()
+                path = self._segment_path(self._segment_index)
+                size = 0
+            if not size:
+                data = gzip.compress(
+                    f"{JSON_CODEC.dumps(seed)}\n{chunk}".encode(), compresslevel=6
+                )
+            with open(path, "ab") as file:
+                file.write(data)
+        except OSError as err:
+            _LOGGER.warning("Failed to write Lykyn event journal: %s", err)
+
+    def _segment_path(self, index: int) -> str:
+        return os.path.join(
+            self._directory, f"{SEGMENT_PREFIX}{index:06d}{SEGMENT_SUFFIX}"
+        )
+
+    def _prune(self) -> None:
+        indexes = _segment_indexes(self._directory)
+        for index in indexes[: max(len(indexes) - self._max_segments + 1, 0)]:
+            os.remove(self._segment_path(index))
+
+    async def async_close(self) -> None:
+        """Flush buffered records and stop the writer thread."""
+        self._schedule_flush()
+        if self._pending is not None:
+            await self._pending
+        self._executor.shutdown(wait=False)
+
+
+def _segment_indexes(directory: str) -> list[int]:
+    try:
+        names = os.listdir(directory)
+    except FileNotFoundError:
+        return []
+    return sorted(
+        int(name[len(SEGMENT_PREFIX) : -len(SEGMENT_SUFFIX)])
+        for name in names
+        if name.startswith(SEGMENT_PREFIX) and name.endswith(SEGMENT_SUFFIX)
+    )
+
+
+def read_journal(directory: str) -> Iterator[dict]:
+    """Yield journal records from oldest to newest segment."""
+    for index in _segment_indexes(directory):
+        path = os.path.join(directory, f"{SEGMENT_PREFIX}{index:06d}{SEGMENT_SUFFIX}")
+        try:
+            with gzip.open(path, "rt") as file:
+                for line in file:
+                    if line.strip():
+                        yield JSON_CODEC.loads(line)
+        except (EOFError, gzip.BadGzipFile):
+            # A segment cut short by a crash still replays up to the damage
+            _LOGGER.warning("Journal segment %s is truncated", path)
+
+
+async def async_replay(
+    client: LykynApiClient, directory: str, speed: float | None = 1.0
+) -> int:
+    """Feed a journal's inbound events back through client.
+
+    With speed set, events are paced by their recorded timestamps divided
+    by speed (1.0 = original speed); with speed None they are fed as fast
+    as possible. Device lists fetched over REST seed the client's cache and
+    outbound events are skipped. Returns the number of events replayed.
+    """
+    loop = asyncio.get_running_loop()
+    records = await loop.run_in_executor(None, list, read_journal(directory))
+    replayed = 0
+    start = time.monotonic()
+    first: float | None = None
+    previous = float("-inf")
+    for record in records:
+        if record["t"] < previous:
+            # Monotonic clock restarted with Home Assistant; re-anchor pacing
+            first = None
+        previous = record["t"]
+        if record["d"] == JOURNAL_META and record["e"] == "devices":
+            for device in record["a"][0]:
+                await client.handle_event("updateDevice", device)
+            continue
+        if record["d"] != JOURNAL_IN:
+            continue
+        if speed:
+            if first is None:
+                first = record["t"]
+                start = time.monotonic()
+            delay = (record["t"] - first) / speed - (time.monotonic() - start)
+            if delay > 0:
+                await asyncio.sleep(delay)
+        await client.handle_event(record["e"], *record["a"])
+        replayed += 1
+    return replayed
@@ -6,6 +6,7 @@ from homeassistant.components.light import (
     ATTR_BRIGHTNESS,
     ATTR_EFFECT,
     ATTR_RGB_COLOR,
+    ATTR_TRANSITION,
     ColorMode,
     LightEntity,
     LightEntityFeature,
@@ -17,7 +18,8 @@ from homeassistant.config_entries import ConfigEntry
 
 from .const import DEFAULT_LIGHT_SETTINGS, DOMAIN, LIGHT_ANIMATIONS
 from .coordinator import LykynCoordinator
-from .entity import LykynEntity
+from .entity import LykynEntity, async_add_device_entities
+from .ramp import hex_to_rgb, rgb_to_hex
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -31,38 +33,24 @@ async def async_setup_entry(
 ) -> None:
     """Set up Lykyn light entities."""
     coordinator: LykynCoordinator = hass.data[DOMAIN][entry.entry_id]
-    entities = []
+    async_add_device_entities(coordinator, async_add_entities, _device_entities)
 
-    for device_id in coordinator.client.devices:
-        entities.append(LykynLight(coordinator, device_id))
 
-    async_add_entities(entities)
-
-
-def _hex_to_rgb(hex_color: str) -> tuple[int, int, int]:
-    """Convert hex color string to RGB tuple."""
-    hex_color = hex_color.lstrip("#")
-    if len(hex_color) != 6:
-        return (255, 255, 255)
-    return (
-        int(hex_color[0:2], 16),
-        int(hex_color[2:4], 16),
-        int(hex_color[4:6], 16),
-    )
-
-
-def _rgb_to_hex(rgb: tuple[int, int, int]) -> str:
-    """Convert RGB tuple to hex color string."""
-    return f"#{rgb[0]:02x}{rgb[1]:02x}{rgb[2]:02x}"
+def _device_entities(coordinator: LykynCoordinator, device_id: str) -> list:
+    """Create the light entities for one device."""
+    return [LykynLight(coordinator, device_id)]
 
 
 class LykynLight(LykynEntity, LightEntity):
     """Light entity for the Lykyn LED strip."""
 
     _attr_translation_key = "led_strip"
+    requires = ("light", "lightMode")
     _attr_supported_color_modes = {ColorMode.RGB}
     _attr_color_mode = ColorMode.RGB
-    _attr_supported_features = LightEntityFeature.EFFECT
+    _attr_supported_features = (
+        LightEntityFeature.EFFECT | LightEntityFeature.TRANSITION
+    )
 
     def __init__(self, coordinator: LykynCoordinator, device_id: str) -> None:
         super().__init__(coordinator, device_id)
@@ -82,7 +70,7 @@ class LykynLight(LykynEntity, LightEntity):
     @property
     def rgb_color(self) -> tuple[int, int, int] | None:
         hex_color = self._device_info_data.get("lightColor", "#FFFFFF")
-        return _hex_to_rgb(hex_color)
+        return hex_to_rgb(hex_color)
 
     @property
     def effect(self) -> str | None:
@@ -95,6 +83,8 @@ class LykynLight(LykynEntity, LightEntity):
         return None
 
     async def async_turn_on(self, **kwargs) -> None:
+        ramps = self.coordinator.ramps
+        await ramps.async_cancel(self._device_id)
         update = {"light": True}
 
         if ATTR_BRIGHTNESS in kwargs:
@@ -110,16 +100,50 @@ class LykynLight(LykynEntity, LightEntity):
                 update["lightAnimation"] = effect
         elif ATTR_RGB_COLOR in kwargs:
             update["lightMode"] = "MANUAL"
-            update["lightColor"] = _rgb_to_hex(kwargs[ATTR_RGB_COLOR])
+            update["lightColor"] = rgb_to_hex(kwargs[ATTR_RGB_COLOR])
 
         # If turning on with no mode specified and light was off, use defaults
         if "lightMode" not in update and not self.is_on:
             update["lightMode"] = DEFAULT_LIGHT_SETTINGS["lightMode"]
             update["lightAnimation"] = DEFAULT_LIGHT_SETTINGS["lightAnimation"]
 
+        transition = kwargs.get(ATTR_TRANSITION)
+        if not transition:
+            await self.coordinator.client.update_device_info(self._device_id, update)
+            return
+
+        # Switch on (or change mode) right away, then fade brightness/color
+        info = self._device_info_data
+        was_on = self.is_on
+        current = info.get("lightBrightness", 50) if was_on else 0
+        target = update.pop("lightBrightness", info.get("lightBrightness", 50))
+        color = None
+        if "lightColor" in update and info.get("lightMode") == "MANUAL" and was_on:
+            color = (
+                hex_to_rgb(info.get("lightColor", "#FFFFFF")),
+                hex_to_rgb(update.pop("lightColor")),
+            )
+        if not was_on:
+            update["lightBrightness"] = 0
         await self.coordinator.client.update_device_info(self._device_id, update)
+        await ramps.async_start(
+            self._device_id, transition, brightness=(current, target), color=color
+        )
 
     async def async_turn_off(self, **kwargs) -> None:
-        await self.coordinator.client.update_device_info(
-            self._device_id, {"light": False}
+        ramps = self.coordinator.ramps
+        await ramps.async_cancel(self._device_id)
+        transition = kwargs.get(ATTR_TRANSITION)
+        if not transition or not self.is_on:
+            await self.coordinator.client.update_device_info(
+                self._device_id, {"light": False}
+            )
+            return
+        # Fade to 0, then switch off and restore the brightness for next time
+        brightness = self._device_info_data.get("lightBrightness", 50)
+        await ramps.async_start(
+            self._device_id,
+            transition,
+            brightness=(brightness, 0),
+            final={"light": False, "lightBrightness": brightness},
         )
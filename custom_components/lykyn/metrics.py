@@ -0,0 +1,137 @@
+"""Lightweight metrics primitives for the Lykyn integration."""
+
+import time
+from bisect import bisect_left
+
+
+class Histogram:
+    """Fixed-bucket histogram; a value lands in the first bucket >= value."""
+
+    __slots__ = ("buckets", "counts", "count", "total")
+
+    def __init__(self, buckets: tuple[float, ...]) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.total += value
+
+    def as_dict(self) -> dict:
+        buckets = {f"le_{bound:g}": n for bound, n in zip(self.buckets, self.counts)}
+        buckets["le_inf"] = self.counts[-1]
+        return {"count": self.count, "sum": self.total, "buckets": buckets}
+
+
+class Counter:
+    """Monotonically increasing count."""
+
+    __slots__ = ("value",)
+
+    def __init__(self) -> None:
+        self.value = 0
+
+    def inc(self, amount: int = 1) -> None:
+        self.value += amount
+
+
+class Gauge:
+    """Last-set value."""
+
+    __slots__ = ("value",)
+
+    def __init__(self) -> None:
+        self.value: float | None = None
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+
+class _NullMetric:
+    """Stands in for every metric type while the registry is disabled."""
+
+    __slots__ = ()
+
+    def inc(self, amount: int = 1) -> None:
+        pass
+
+    def set(self, value: float) -> None:
+        pass
+
+    def observe(self, value: float) -> None:
+        pass
+
+
+NULL_METRIC = _NullMetric()
+
+
+class MetricsRegistry:
+    """Named counters, gauges and histograms with an optional label.
+
+    While disabled every lookup returns a shared no-op metric, so
+    instrumented hot paths cost one attribute check and a method call.
+    Guard work that is only needed to compute a value (e.g. payload sizes)
+    with ``registry.enabled``.
+    """
+
+    def __init__(self, enabled: bool = False) -> None:
+        self.enabled = enabled
+        self._started = time.monotonic()
+        self._counters: dict[tuple[str, str | None], Counter] = {}
+        self._gauges: dict[tuple[str, str | None], Gauge] = {}
+        self._histograms: dict[tuple[str, str | None], Histogram] = {}
+
+    @property
+    def uptime(self) -> float:
+        return time.monotonic() - self._started
+
+    def counter(self, name: str, label: str | None = None) -> Counter | _NullMetric:
+        if not self.enabled:
+            return NULL_METRIC
+        metric = self._counters.get((name, label))
+        if metric is None:
+            metric = self._counters[(name, label)] = Counter()
+        return metric
+
+    def gauge(self, name: str, label: str | None = None) -> Gauge | _NullMetric:
+        if not self.enabled:
+            return NULL_METRIC
+        metric = self._gauges.get((name, label))
+        if metric is None:
+            metric = self._gauges[(name, label)] = Gauge()
+        return metric
+
+    def histogram(
+        self, name: str, buckets: tuple[float, ...], label: str | None = None
+    ) -> Histogram | _NullMetric:
+        if not self.enabled:
+            return NULL_METRIC
+        metric = self._histograms.get((name, label))
+        if metric is None:
+            metric = self._histograms[(name, label)] = Histogram(buckets)
+        return metric
+
+    def total(self, name: str) -> int:
+        """Return the sum of a counter over all its labels."""
+        return sum(
+            metric.value for (key, _), metric in self._counters.items() if key == name
+        )
+
+    def as_dict(self) -> dict:
+        """Return every metric, grouped by name and label."""
+        result: dict = {"enabled": self.enabled, "uptime": self.uptime}
+        for kind, metrics, value in (
+            ("counters", self._counters, lambda metric: metric.value),
+            ("gauges", self._gauges, lambda metric: metric.value),
+            ("histograms", self._histograms, lambda metric: metric.as_dict()),
+        ):
+            group: dict = result.setdefault(kind, {})
+            for (name, label), metric in metrics.items():
+                if label is None:
+                    group[name] = value(metric)
+                else:
+                    group.setdefault(name, {})[label] = value(metric)
+        return result
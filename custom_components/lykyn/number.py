@@ -11,7 +11,7 @@ from homeassistant.config_entries import ConfigEntry
 
 from .const import DOMAIN
 from .coordinator import LykynCoordinator
-from .entity import LykynEntity
+from .entity import LykynEntity, async_add_device_entities
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -29,100 +29,100 @@ async def async_setup_entry(
 ) -> None:
     """Set up Lykyn number entities."""
     coordinator: LykynCoordinator = hass.data[DOMAIN][entry.entry_id]
-    entities = []
-
-    for device_id in coordinator.client.devices:
-        entities.extend([
-            LykynFanSpeedEntity(
-                coordinator, device_id,
-                key="airin", name_key="fan_in_speed",
-                icon="mdi:fan",
-            ),
-            LykynFanSpeedEntity(
-                coordinator, device_id,
-                key="airout", name_key="fan_out_speed",
-                icon="mdi:fan",
-            ),
-            LykynNumberEntity(
-                coordinator, device_id,
-                key="minTemp", name_key="min_temperature",
-                min_val=0, max_val=40, step=1,
-                unit=UnitOfTemperature.CELSIUS, icon="mdi:thermometer-low",
-            ),
-            LykynNumberEntity(
-                coordinator, device_id,
-                key="maxTemp", name_key="max_temperature",
-                min_val=0, max_val=40, step=1,
-                unit=UnitOfTemperature.CELSIUS, icon="mdi:thermometer-high",
-            ),
-            LykynNumberEntity(
-                coordinator, device_id,
-                key="minHum", name_key="min_humidity",
-                min_val=0, max_val=100, step=1,
-                unit=PERCENTAGE, icon="mdi:water-percent",
-            ),
-            LykynNumberEntity(
-                coordinator, device_id,
-                key="maxHum", name_key="max_humidity",
-                min_val=0, max_val=100, step=1,
-                unit=PERCENTAGE, icon="mdi:water-percent",
-            ),
-            LykynSmartNumberEntity(
-                coordinator, device_id,
-                key="airinOn", name_key="intake_fan_on",
-                min_val=0, max_val=60, step=1,
-                unit=UnitOfTime.MINUTES, icon="mdi:fan",
-            ),
-            LykynSmartNumberEntity(
-                coordinator, device_id,
-                key="airinOff", name_key="intake_fan_off",
-                min_val=0, max_val=60, step=1,
-                unit=UnitOfTime.MINUTES, icon="mdi:fan-off",
-            ),
-            LykynSmartNumberEntity(
-                coordinator, device_id,
-                key="airoutOn", name_key="exhaust_fan_on",
-                min_val=0, max_val=60, step=1,
-                unit=UnitOfTime.MINUTES, icon="mdi:fan",
-            ),
-            LykynSmartNumberEntity(
-                coordinator, device_id,
-                key="airoutOff", name_key="exhaust_fan_off",
-                min_val=0, max_val=60, step=1,
-                unit=UnitOfTime.MINUTES, icon="mdi:fan-off",
-            ),
-            LykynSmartNumberEntity(
-                coordinator, device_id,
-                key="humidifierOnDuration", name_key="humidifier_on_duration",
-                min_val=0, max_val=60, step=1,
-                unit=UnitOfTime.MINUTES, icon="mdi:air-humidifier",
-            ),
-            LykynSmartNumberEntity(
-                coordinator, device_id,
-                key="humidifierBelowMinDuration",
-                name_key="humidifier_below_min_duration",
-                min_val=0, max_val=60, step=1,
-                unit=UnitOfTime.MINUTES, icon="mdi:air-humidifier",
-            ),
-            LykynNumberEntity(
-                coordinator, device_id,
-                key="lightBrightness", name_key="light_brightness",
-                min_val=0, max_val=100, step=1,
-                unit=PERCENTAGE, icon="mdi:brightness-6",
-            ),
-            LykynCalibrationNumber(
-                coordinator, device_id,
-                key="tempPercent", name_key="temp_calibration_offset",
-                icon="mdi:thermometer-alert",
-            ),
-            LykynCalibrationNumber(
-                coordinator, device_id,
-                key="humPercent", name_key="humidity_calibration_offset",
-                icon="mdi:water-percent-alert",
-            ),
-        ])
-
-    async_add_entities(entities)
+    async_add_device_entities(coordinator, async_add_entities, _device_entities)
+
+
+def _device_entities(coordinator: LykynCoordinator, device_id: str) -> list:
+    """Create the number entities for one device."""
+    return [
+        LykynFanSpeedEntity(
+            coordinator, device_id,
+            key="airin", name_key="fan_in_speed",
+            icon="mdi:fan",
+        ),
+        LykynFanSpeedEntity(
+            coordinator, device_id,
+            key="airout", name_key="fan_out_speed",
+            icon="mdi:fan",
+        ),
+        LykynNumberEntity(
+            coordinator, device_id,
+            key="minTemp", name_key="min_temperature",
+            min_val=0, max_val=40, step=1,
+            unit=UnitOfTemperature.CELSIUS, icon="mdi:thermometer-low",
+        ),
+        LykynNumberEntity(
+            coordinator, device_id,
+            key="maxTemp", name_key="max_temperature",
+            min_val=0, max_val=40, step=1,
+            unit=UnitOfTemperature.CELSIUS, icon="mdi:thermometer-high",
+        ),
+        LykynNumberEntity(
+            coordinator, device_id,
+            key="minHum", name_key="min_humidity",
+            min_val=0, max_val=100, step=1,
+            unit=PERCENTAGE, icon="mdi:water-percent",
+        ),
+        LykynNumberEntity(
+            coordinator, device_id,
+            key="maxHum", name_key="max_humidity",
+            min_val=0, max_val=100, step=1,
+            unit=PERCENTAGE, icon="mdi:water-percent",
+        ),
+        LykynSmartNumberEntity(
+            coordinator, device_id,
+            key="airinOn", name_key="intake_fan_on",
+            min_val=0, max_val=60, step=1,
+            unit=UnitOfTime.MINUTES, icon="mdi:fan",
+        ),
+        LykynSmartNumberEntity(
+            coordinator, device_id,
+            key="airinOff", name_key="intake_fan_off",
+            min_val=0, max_val=60, step=1,
+            unit=UnitOfTime.MINUTES, icon="mdi:fan-off",
+        ),
+        LykynSmartNumberEntity(
+            coordinator, device_id,
+            key="airoutOn", name_key="exhaust_fan_on",
+            min_val=0, max_val=60, step=1,
+            unit=UnitOfTime.MINUTES, icon="mdi:fan",
+        ),
+        LykynSmartNumberEntity(
+            coordinator, device_id,
+            key="airoutOff", name_key="exhaust_fan_off",
+            min_val=0, max_val=60, step=1,
+            unit=UnitOfTime.MINUTES, icon="mdi:fan-off",
+        ),
+        LykynSmartNumberEntity(
+            coordinator, device_id,
+            key="humidifierOnDuration", name_key="humidifier_on_duration",
+            min_val=0, max_val=60, step=1,
+            unit=UnitOfTime.MINUTES, icon="mdi:air-humidifier",
+        ),
+        LykynSmartNumberEntity(
+            coordinator, device_id,
+            key="humidifierBelowMinDuration",
+            name_key="humidifier_below_min_duration",
+            min_val=0, max_val=60, step=1,
+            unit=UnitOfTime.MINUTES, icon="mdi:air-humidifier",
+        ),
+        LykynNumberEntity(
+            coordinator, device_id,
+            key="lightBrightness", name_key="light_brightness",
+            min_val=0, max_val=100, step=1,
+            unit=PERCENTAGE, icon="mdi:brightness-6",
+        ),
+        LykynCalibrationNumber(
+            coordinator, device_id,
+            key="tempPercent", name_key="temp_calibration_offset",
+            icon="mdi:thermometer-alert",
+        ),
+        LykynCalibrationNumber(
+            coordinator, device_id,
+            key="humPercent", name_key="humidity_calibration_offset",
+            icon="mdi:water-percent-alert",
+        ),
+    ]
 
 
 class LykynNumberEntity(LykynEntity, NumberEntity):
@@ -145,6 +145,7 @@ class LykynNumberEntity(LykynEntity, NumberEntity):
         super().__init__(coordinator, device_id)
         self._key = key
         self._attr_unique_id = f"{device_id}_{key}"
+        self.requires = (key,)
         self._attr_translation_key = name_key
         self._attr_native_min_value = min_val
         self._attr_native_max_value = max_val
@@ -182,6 +183,7 @@ class LykynSmartNumberEntity(LykynEntity, NumberEntity):
         super().__init__(coordinator, device_id)
         self._key = key
         self._attr_unique_id = f"{device_id}_{key}"
+        self.requires = (f"smart.{key}",)
         self._attr_translation_key = name_key
         self._attr_native_min_value = min_val
         self._attr_native_max_value = max_val
@@ -219,6 +221,7 @@ class LykynCalibrationNumber(LykynEntity, NumberEntity):
         super().__init__(coordinator, device_id)
         self._key = key
         self._attr_unique_id = f"{device_id}_calibrate_{key}"
+        self.requires = (f"calibrate.{key}",)
         self._attr_translation_key = name_key
         self._attr_icon = icon
 
@@ -252,6 +255,7 @@ class LykynFanSpeedEntity(LykynEntity, NumberEntity):
         super().__init__(coordinator, device_id)
         self._key = key
         self._attr_unique_id = f"{device_id}_{key}_speed"
+        self.requires = (key,)
         self._attr_translation_key = name_key
         self._attr_icon = icon
 
@@ -0,0 +1,195 @@
+"""Shared HTTP connection pool for Lykyn API clients."""
+
+import asyncio
+import logging
+from types import SimpleNamespace
+
+import aiohttp
+
+from .const import (
+    HTTP_CONNECT_TIMEOUT,
+    HTTP_DNS_CACHE_TTL,
+    HTTP_KEEPALIVE_TIMEOUT,
+    HTTP_POOL_LIMIT,
+    HTTP_POOL_LIMIT_PER_HOST,
+    HTTP_REQUEST_TIMEOUT,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class LykynConnectionPool:
+    """Keep-alive TCP connector shared by every Lykyn client on a loop.
+
+    Each client still gets its own ClientSession and cookie jar, so
+    accounts stay isolated while TLS connections and DNS results to
+    lykyn.app are reused across config entries and the config flow.
+
+    Socket.io sessions use a second connector without a per-host limit: a
+    websocket or long-poll request holds its connection for as long as it
+    is open, and on the REST connector enough accounts would take every
+    slot to lykyn.app and leave REST calls queued until they time out.
+    """
+
+    def __init__(self) -> None:
+        self._connector: aiohttp.TCPConnector | None = None
+        self._socket_connector: aiohttp.TCPConnector | None = None
+        self._users = 0
+        self._stats = {
+            "new_connections": 0,
+            "reused_connections": 0,
+            "queued_connections": 0,
+            "dns_cache_hits": 0,
+            "dns_cache_misses": 0,
+            "http_bytes_sent": 0,
+            "http_bytes_received": 0,
+        }
+        self._trace_config = aiohttp.TraceConfig()
+        self._trace_config.on_connection_create_end.append(
+            self._count("new_connections")
+        )
+        self._trace_config.on_connection_reuseconn.append(
+            self._count("reused_connections")
+        )
+        self._trace_config.on_connection_queued_start.append(
+            self._count("queued_connections")
+        )
+        self._trace_config.on_dns_cache_hit.append(self._count("dns_cache_hits"))
+        self._trace_config.on_dns_cache_miss.append(
+            self._count("dns_cache_misses")
+        )
+        # Body bytes, covering REST calls and Socket.io long-polling
+        self._trace_config.on_request_chunk_sent.append(self._count_bytes_sent)
+        self._trace_config.on_response_chunk_received.append(
+            self._count_bytes_received
+        )
+
+    def _count(self, key: str):
+        async def _on_trace_event(
+            session: aiohttp.ClientSession,
+            context: SimpleNamespace,
+            params: object,
+        ) -> None:
+            self._stats[key] += 1
+
+        return _on_trace_event
+
+    async def _count_bytes_sent(
+        self,
+        session: aiohttp.ClientSession,
+        context: SimpleNamespace,
+        params: aiohttp.TraceRequestChunkSentParams,
+    ) -> None:
+        self._stats["http_bytes_sent"] += len(params.chunk)
+
+    async def _count_bytes_received(
+        self,
+        session: aiohttp.ClientSession,
+        context: SimpleNamespace,
+        params: aiohttp.TraceResponseChunkReceivedParams,
+    ) -> None:
+        self._stats["http_bytes_received"] += len(params.chunk)
+
+    @property
+    def users(self) -> int:
+        return self._users
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """Return connection reuse counters and current pool occupancy."""
+        stats = dict(self._stats)
+        stats["users"] = self._users
+        if self._connector is not None and not self._connector.closed:
+            stats["limit"] = self._connector.limit
+            stats["limit_per_host"] = self._connector.limit_per_host
+        return stats
+
+    def acquire(self) -> None:
+        """Register a client using the pool."""
+        self._users += 1
+
+    async def release(self) -> None:
+        """Unregister a client, closing the connector once nobody uses it."""
+        self._users = max(self._users - 1, 0)
+        if self._users > 0:
+            return
+        closed = False
+        for attr in ("_connector", "_socket_connector"):
+            connector = getattr(self, attr)
+            if connector is None:
+                continue
+            setattr(self, attr, None)
+            if not connector.closed:
+                await connector.close()
+            closed = True
+        if closed:
+            _LOGGER.debug("Closed shared Lykyn connection pool")
+
+    def _ensure_connector(self) -> aiohttp.TCPConnector:
+        if self._connector is None or self._connector.closed:
+            self._connector = aiohttp.TCPConnector(
+                limit=HTTP_POOL_LIMIT,
+                limit_per_host=HTTP_POOL_LIMIT_PER_HOST,
+                keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT,
+                ttl_dns_cache=HTTP_DNS_CACHE_TTL,
+                use_dns_cache=True,
+            )
+        return self._connector
+
+    def _ensure_socket_connector(self) -> aiohttp.TCPConnector:
+        if self._socket_connector is None or self._socket_connector.closed:
+            # One long-lived connection per account; no limits to run into
+            self._socket_connector = aiohttp.TCPConnector(
+                limit=0,
+                keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT,
+                ttl_dns_cache=HTTP_DNS_CACHE_TTL,
+                use_dns_cache=True,
+            )
+        return self._socket_connector
+
+    def create_session(self) -> aiohttp.ClientSession:
+        """Create a session with its own cookie jar on the shared connector."""
+        return aiohttp.ClientSession(
+            connector=self._ensure_connector(),
+            connector_owner=False,
+            cookie_jar=aiohttp.CookieJar(),
+            timeout=aiohttp.ClientTimeout(
+                total=HTTP_REQUEST_TIMEOUT, connect=HTTP_CONNECT_TIMEOUT
+            ),
+            trace_configs=[self._trace_config],
+            headers={
+                "User-Agent": "HomeAssistant/Lykyn",
+                "Accept-Encoding": "gzip, deflate",
+            },
+        )
+
+    def create_socket_session(
+        self, cookie_jar: aiohttp.abc.AbstractCookieJar
+    ) -> aiohttp.ClientSession:
+        """Create a Socket.io session on the socket connector.
+
+        It shares cookie_jar with the client's REST session. Engine.IO sets
+        its own timeouts per request, so only the connect timeout applies.
+        """
+        return aiohttp.ClientSession(
+            connector=self._ensure_socket_connector(),
+            connector_owner=False,
+            cookie_jar=cookie_jar,
+            timeout=aiohttp.ClientTimeout(total=None, connect=HTTP_CONNECT_TIMEOUT),
+            trace_configs=[self._trace_config],
+            headers={"User-Agent": "HomeAssistant/Lykyn"},
+        )
+
+
+_POOLS: dict[asyncio.AbstractEventLoop, LykynConnectionPool] = {}
+
+
+def get_connection_pool() -> LykynConnectionPool:
+    """Return the connection pool shared on the running event loop."""
+    loop = asyncio.get_running_loop()
+    pool = _POOLS.get(loop)
+    if pool is None:
+        for stale_loop in [stale for stale in _POOLS if stale.is_closed()]:
+            del _POOLS[stale_loop]
+        pool = _POOLS[loop] = LykynConnectionPool()
+    return pool
@@ -0,0 +1,154 @@
+"""Staggered prefetch of recent history into the history cache.
+
+Fetching history for every kit the moment Home Assistant starts sends a
+burst of requests to lykyn.app while the rest of the system is booting.
+The prefetcher instead gives each kit a slot spread evenly over a window,
+with random jitter inside the slot, and runs at most a few fetches at a
+time. Online kits and kits whose history was queried recently get the
+earliest slots, and a fetch waits while an interactive history query is
+running so it never competes with one.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import logging
+import random
+import time
+from typing import TYPE_CHECKING
+
+from .api import REQUEST_ERRORS
+from .const import PREFETCH_CONCURRENCY
+
+if TYPE_CHECKING:
+    from .api import LykynApiClient
+    from .history import LykynHistoryCache
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class LykynHistoryPrefetcher:
+    """Spread per-kit history fetches over a window with bounded concurrency."""
+
+    def __init__(
+        self,
+        client: LykynApiClient,
+        cache: LykynHistoryCache,
+        window: float,
+        concurrency: int = PREFETCH_CONCURRENCY,
+        rng: random.Random | None = None,
+    ) -> None:
+        self._client = client
+        self._cache = cache
+        self._window = window
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._rng = rng or random.Random()
+        # (due monotonic time, sequence, device id)
+        self._queue: list[tuple[float, int, str]] = []
+        self._seq = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._fetches: set[asyncio.Task] = set()
+        self._task: asyncio.Task | None = None
+        self._started: float | None = None
+        self._stats = {
+            "queued": 0,
+            "completed": 0,
+            "errors": 0,
+            "yielded": 0,
+            "completion_seconds": None,
+        }
+
+    @property
+    def enabled(self) -> bool:
+        return self._window > 0
+
+    @property
+    def stats(self) -> dict:
+        stats = dict(self._stats)
+        stats["queue_depth"] = len(self._queue)
+        stats["in_flight"] = len(self._fetches)
+        return stats
+
+    def schedule(self, device_ids: set[str] | list[str]) -> None:
+        """Queue kits for prefetch, spread over the window from now."""
+        if not self.enabled or not device_ids:
+            return
+        online = set(self._client.online_devices)
+        ordered = sorted(
+            device_ids,
+            key=lambda device_id: (
+                device_id not in online,
+                not self._cache.recently_queried(device_id),
+                device_id,
+            ),
+        )
+        now = time.monotonic()
+        slot = self._window / len(ordered)
+        for index, device_id in enumerate(ordered):
+            due = now + index * slot + self._rng.uniform(0, slot)
+            heapq.heappush(self._queue, (due, next(self._seq), device_id))
+        self._stats["queued"] += len(ordered)
+        if self._started is None:
+            self._started = now
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        self._wakeup.set()
+
+    async def async_stop(self) -> None:
+        """Drop queued kits and cancel running fetches."""
+        self._queue.clear()
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        for task in self._fetches:
+            task.cancel()
+
+    async def _run(self) -> None:
+        # Kits scheduled while the last fetches run are picked up by this
+        # task, which schedule() sees as still alive
+        while self._queue or self._fetches:
+            if not self._queue:
+                self._wakeup.clear()
+                wakeup = asyncio.create_task(self._wakeup.wait())
+                try:
+                    await asyncio.wait(
+                        {wakeup, *self._fetches},
+                        return_when=asyncio.FIRST_COMPLETED,
+                    )
+                finally:
+                    wakeup.cancel()
+                continue
+            due, _, device_id = self._queue[0]
+            delay = due - time.monotonic()
+            if delay > 0:
+                # Kits queued later may be due earlier
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            heapq.heappop(self._queue)
+            if device_id not in self._client.devices:
+                continue
+            if self._cache.busy:
+                self._stats["yielded"] += 1
+                await self._cache.async_wait_idle()
+            await self._semaphore.acquire()
+            task = asyncio.create_task(self._fetch(device_id))
+            self._fetches.add(task)
+            task.add_done_callback(self._fetches.discard)
+        self._stats["completion_seconds"] = round(time.monotonic() - self._started, 1)
+        self._started = None
+
+    async def _fetch(self, device_id: str) -> None:
+        try:
+            await self._cache.async_prefetch(device_id)
+            self._stats["completed"] += 1
+        except REQUEST_ERRORS as err:
+            self._stats["errors"] += 1
+            _LOGGER.debug("History prefetch for %s failed: %r", device_id, err)
+        finally:
+            self._semaphore.release()
@@ -0,0 +1,195 @@
+"""Rate-limited brightness and color ramps for Lykyn LED strips.
+
+Light transitions are not supported by the kit itself, so they are
+rendered here as a series of updateDevice frames. One scheduler per
+client ticks every RAMP_FRAME_INTERVAL seconds. On each tick it computes
+the current frame of every ramping kit from the elapsed time and sends
+them together, up to a global emit budget. When more kits ramp than the
+budget allows, kits are served round-robin: each gets fewer frames, and
+a ramp ends on the first turn after its duration has elapsed.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from .api import LykynApiError
+from .const import RAMP_FRAME_INTERVAL, RAMP_MAX_EMITS_PER_SECOND
+
+if TYPE_CHECKING:
+    from .api import LykynApiClient
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def hex_to_rgb(hex_color: str) -> tuple[int, int, int]:
+    """Convert hex color string to RGB tuple."""
+    hex_color = hex_color.lstrip("#")
+    if len(hex_color) != 6:
+        return (255, 255, 255)
+    return (
+        int(hex_color[0:2], 16),
+        int(hex_color[2:4], 16),
+        int(hex_color[4:6], 16),
+    )
+
+
+def rgb_to_hex(rgb: tuple[int, int, int]) -> str:
+    """Convert RGB tuple to hex color string."""
+    return f"#{rgb[0]:02x}{rgb[1]:02x}{rgb[2]:02x}"
+
+
+@dataclass
+class _Ramp:
+    """Interpolation of one kit's brightness and/or color."""
+
+    started: float
+    duration: float
+    brightness: tuple[int, int] | None
+    color: tuple[tuple[int, int, int], tuple[int, int, int]] | None
+    # Fields written together with the last frame (e.g. light off)
+    final: dict
+    last: dict = field(default_factory=dict)
+
+    def frame(self, now: float) -> tuple[dict, bool]:
+        """Return the frame for now and whether the ramp is complete."""
+        progress = min((now - self.started) / self.duration, 1.0)
+        frame: dict = {}
+        if self.brightness is not None:
+            start, end = self.brightness
+            frame["lightBrightness"] = round(start + (end - start) * progress)
+        if self.color is not None:
+            start, end = self.color
+            frame["lightColor"] = rgb_to_hex(
+                tuple(round(a + (b - a) * progress) for a, b in zip(start, end))
+            )
+        return frame, progress >= 1.0
+
+
+class LykynRampScheduler:
+    """Shared, paced scheduler for the light ramps of one client."""
+
+    def __init__(
+        self,
+        client: LykynApiClient,
+        frame_interval: float = RAMP_FRAME_INTERVAL,
+        max_emits_per_second: float = RAMP_MAX_EMITS_PER_SECOND,
+    ) -> None:
+        self._client = client
+        self._frame_interval = frame_interval
+        self._budget = max(1, int(max_emits_per_second * frame_interval))
+        self._ramps: dict[str, _Ramp] = {}
+        # Round-robin order, so an over-budget tick starts where the last ended
+        self._order: deque[str] = deque()
+        self._inflight: dict[str, asyncio.Task] = {}
+        self._task: asyncio.Task | None = None
+        self._stats = {
+            "ramps": 0,
+            "completed": 0,
+            "cancelled": 0,
+            "frames": 0,
+            "skipped": 0,
+            "errors": 0,
+        }
+
+    @property
+    def stats(self) -> dict[str, int]:
+        stats = dict(self._stats)
+        stats["active"] = len(self._ramps)
+        return stats
+
+    def is_ramping(self, device_id: str) -> bool:
+        return device_id in self._ramps
+
+    async def async_start(
+        self,
+        device_id: str,
+        duration: float,
+        brightness: tuple[int, int] | None = None,
+        color: tuple[tuple[int, int, int], tuple[int, int, int]] | None = None,
+        final: dict | None = None,
+    ) -> None:
+        """Ramp brightness (0-100) and/or RGB color over duration seconds.
+
+        Replaces any ramp already running for the kit.
+        """
+        await self.async_cancel(device_id)
+        ramp = _Ramp(time.monotonic(), duration, brightness, color, final or {})
+        # The starting point is already the kit's state
+        ramp.last = ramp.frame(ramp.started)[0]
+        self._ramps[device_id] = ramp
+        self._order.append(device_id)
+        self._stats["ramps"] += 1
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def async_cancel(self, device_id: str) -> None:
+        """Stop a ramp where it is and wait for its frame in flight."""
+        if self._ramps.pop(device_id, None) is not None:
+            self._stats["cancelled"] += 1
+            self._order.remove(device_id)
+        inflight = self._inflight.get(device_id)
+        if inflight is not None:
+            # Waits without raising whatever ended the frame
+            await asyncio.wait({inflight})
+
+    async def async_stop(self) -> None:
+        """Cancel all ramps and the ticker."""
+        self._stats["cancelled"] += len(self._ramps)
+        self._ramps.clear()
+        self._order.clear()
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self) -> None:
+        while self._ramps:
+            tick = time.monotonic()
+            batch = []
+            for _ in range(min(self._budget, len(self._order))):
+                device_id = self._order[0]
+                self._order.rotate(-1)
+                batch.append(device_id)
+            self._stats["skipped"] += len(self._order) - len(batch)
+            writes = [self._send_frame(device_id, tick) for device_id in batch]
+            await asyncio.gather(*writes, return_exceptions=True)
+            await asyncio.sleep(max(0.0, self._frame_interval - (time.monotonic() - tick)))
+
+    async def _send_frame(self, device_id: str, now: float) -> None:
+        ramp = self._ramps.get(device_id)
+        if ramp is None:
+            return
+        frame, done = ramp.frame(now)
+        if done:
+            frame.update(ramp.final)
+            del self._ramps[device_id]
+            self._order.remove(device_id)
+            self._stats["completed"] += 1
+        elif frame == ramp.last:
+            return
+        ramp.last = frame
+        task = asyncio.current_task()
+        self._inflight[device_id] = task
+        try:
+            await self._client.update_device_info(device_id, frame)
+            self._stats["frames"] += 1
+        except LykynApiError as err:
+            self._stats["errors"] += 1
+            _LOGGER.warning("Light ramp for %s aborted: %s", device_id, err)
+            self._abort(device_id)
+        except Exception:  # socketio raises its own errors
+            self._stats["errors"] += 1
+            _LOGGER.exception("Light ramp for %s aborted", device_id)
+            self._abort(device_id)
+        finally:
+            if self._inflight.get(device_id) is task:
+                del self._inflight[device_id]
+
+    def _abort(self, device_id: str) -> None:
+        if self._ramps.pop(device_id, None) is not None:
+            self._order.remove(device_id)
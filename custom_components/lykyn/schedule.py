@@ -0,0 +1,298 @@
+"""Grow schedules driven by one shared timer wheel.
+
+A schedule is a list of daily steps ("at" a local time, "set" an info
+update) applied to one or more kits. All steps of all config entries sit
+in a 1440-slot wheel, one slot per minute of the day, and a single timer
+is armed for the next occupied slot. When it fires, every step due up to
+that minute is folded into one update per kit and written with a single
+update_device_info call.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import bisect
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime, time, timedelta
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_point_in_time
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .api import LykynApiError, merge_info
+from .const import (
+    DATA_SCHEDULER,
+    DOMAIN,
+    SCHEDULE_CONNECT_TIMEOUT,
+    SCHEDULE_STORAGE_VERSION,
+)
+
+if TYPE_CHECKING:
+    from .api import LykynApiClient
+
+_LOGGER = logging.getLogger(__name__)
+
+MINUTES_PER_DAY = 24 * 60
+
+
+def parse_minute(value: str | time) -> int:
+    """Return the minute of the day for an "HH:MM" string or a time."""
+    if isinstance(value, str):
+        value = time.fromisoformat(value)
+    return value.hour * 60 + value.minute
+
+
+def format_minute(minute: int) -> str:
+    return f"{minute // 60:02d}:{minute % 60:02d}"
+
+
+def expand_steps(steps: list[dict]) -> list[tuple[int, dict]]:
+    """Turn stored steps into (minute, update) pairs.
+
+    A step with "every" (minutes) repeats from "at" until "until" (or the
+    end of the day), which covers periodic fan purges in one step.
+    """
+    expanded = []
+    for step in steps:
+        start = parse_minute(step["at"])
+        every = step.get("every")
+        if not every:
+            expanded.append((start, step["set"]))
+            continue
+        end = parse_minute(step["until"]) if step.get("until") else MINUTES_PER_DAY - 1
+        expanded.extend((minute, step["set"]) for minute in range(start, end + 1, every))
+    return expanded
+
+
+def schedule_store(hass: HomeAssistant, entry_id: str) -> Store:
+    """Return the storage holding a config entry's schedules."""
+    return Store(hass, SCHEDULE_STORAGE_VERSION, f"{DOMAIN}.schedules.{entry_id}")
+
+
+@dataclass
+class _EntrySchedules:
+    """Schedules and client of one config entry."""
+
+    client: LykynApiClient
+    store: Store
+    schedules: dict[str, dict] = field(default_factory=dict)
+    catch_up: asyncio.Task | None = None
+
+
+class LykynScheduler:
+    """Shared timer wheel for the schedules of all Lykyn config entries."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self._hass = hass
+        self._entries: dict[str, _EntrySchedules] = {}
+        # minute of day -> [(entry_id, schedule_id, device ids, update)]
+        self._wheel: dict[int, list[tuple[str, str, list[str], dict]]] = {}
+        self._slots: list[int] = []
+        self._unsub: CALLBACK_TYPE | None = None
+        # Last minute of the day whose steps have been applied
+        self._last_minute: int | None = None
+        self._stats = {"boundaries": 0, "steps": 0, "writes": 0, "errors": 0}
+
+    @property
+    def stats(self) -> dict[str, int]:
+        stats = dict(self._stats)
+        stats["slots"] = len(self._slots)
+        return stats
+
+    def schedules(self, entry_id: str) -> dict[str, dict]:
+        """Return the stored schedules of a config entry."""
+        entry = self._entries.get(entry_id)
+        return dict(entry.schedules) if entry else {}
+
+    async def async_add_entry(self, entry_id: str, client: LykynApiClient) -> None:
+        """Load an entry's schedules and apply the steps it missed."""
+        store = schedule_store(self._hass, entry_id)
+        data = await store.async_load() or {}
+        entry = _EntrySchedules(client, store, data.get("schedules", {}))
+        self._entries[entry_id] = entry
+        self._rebuild()
+        if entry.schedules:
+            # Writes need the socket, which connects after setup returns
+            entry.catch_up = self._hass.async_create_background_task(
+                self._async_catch_up_when_connected(entry_id, entry),
+                f"{DOMAIN} schedule catch-up {entry_id}",
+            )
+
+    @callback
+    def async_remove_entry(self, entry_id: str) -> None:
+        entry = self._entries.pop(entry_id, None)
+        if entry is None:
+            return
+        if entry.catch_up is not None:
+            entry.catch_up.cancel()
+        self._rebuild()
+
+    async def _async_catch_up_when_connected(
+        self, entry_id: str, entry: _EntrySchedules
+    ) -> None:
+        if not await entry.client.async_wait_connected(SCHEDULE_CONNECT_TIMEOUT):
+            _LOGGER.warning("Lykyn socket not connected; schedule catch-up skipped")
+            return
+        await self._async_catch_up(entry_id, entry.schedules)
+
+    async def async_set_schedule(
+        self,
+        entry_id: str,
+        schedule_id: str,
+        devices: list[str],
+        steps: list[dict],
+        catch_up: bool = True,
+    ) -> None:
+        """Create or replace a schedule and apply its current state."""
+        entry = self._entries[entry_id]
+        schedule = {"devices": devices, "steps": steps, "catch_up": catch_up}
+        entry.schedules[schedule_id] = schedule
+        await entry.store.async_save({"schedules": entry.schedules})
+        await self._async_catch_up(entry_id, {schedule_id: schedule})
+        self._rebuild()
+
+    async def async_remove_schedule(self, schedule_id: str) -> bool:
+        """Remove a schedule from every entry; return False if unknown."""
+        found = False
+        for entry in self._entries.values():
+            if entry.schedules.pop(schedule_id, None) is not None:
+                found = True
+                await entry.store.async_save({"schedules": entry.schedules})
+        if found:
+            self._rebuild()
+        return found
+
+    @callback
+    def _rebuild(self) -> None:
+        """Re-slot all steps and re-arm the shared timer."""
+        wheel: dict[int, list] = {}
+        for entry_id, entry in self._entries.items():
+            for schedule_id in sorted(entry.schedules):
+                schedule = entry.schedules[schedule_id]
+                for minute, update in expand_steps(schedule["steps"]):
+                    wheel.setdefault(minute, []).append(
+                        (entry_id, schedule_id, schedule["devices"], update)
+                    )
+        self._wheel = wheel
+        self._slots = sorted(wheel)
+        # Steps up to now are covered by catch-up, not by the next boundary
+        self._last_minute = self._minute_of(dt_util.now())
+        self._arm()
+
+    @staticmethod
+    def _minute_of(now: datetime) -> int:
+        return now.hour * 60 + now.minute
+
+    @callback
+    def _arm(self) -> None:
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+        if not self._slots:
+            return
+        now = dt_util.now()
+        index = bisect.bisect_right(self._slots, self._minute_of(now))
+        day = now.date()
+        if index == len(self._slots):
+            index = 0
+            day += timedelta(days=1)
+        minute = self._slots[index]
+        point = datetime.combine(
+            day, time(minute // 60, minute % 60), tzinfo=dt_util.get_default_time_zone()
+        )
+        self._unsub = async_track_point_in_time(self._hass, self._async_fire, point)
+
+    async def _async_fire(self, now: datetime) -> None:
+        """Apply every step due since the last boundary, then re-arm."""
+        self._unsub = None
+        minute = self._minute_of(dt_util.as_local(now))
+        due = self._due_slots(self._last_minute, minute)
+        self._last_minute = minute
+        self._arm()
+        batches: dict[tuple[str, str], dict] = {}
+        for slot in due:
+            self._stats["boundaries"] += 1
+            for entry_id, _schedule_id, devices, update in self._wheel.get(slot, []):
+                self._stats["steps"] += 1
+                for device_id in devices:
+                    key = (entry_id, device_id)
+                    batches[key] = merge_info(batches.get(key, {}), update)
+        await self._async_write(batches)
+
+    def _due_slots(self, last: int | None, minute: int) -> list[int]:
+        """Return occupied slots in (last, minute], wrapping past midnight.
+
+        A late or skipped timer (event loop stall, clock change) therefore
+        still applies the missed steps, oldest first.
+        """
+        if last is None or last == minute:
+            return [minute] if minute in self._wheel else []
+        lo = bisect.bisect_right(self._slots, last)
+        hi = bisect.bisect_right(self._slots, minute)
+        if last < minute:
+            return self._slots[lo:hi]
+        # Wrapped past midnight: (last, 23:59] then [00:00, minute]
+        return self._slots[lo:] + self._slots[:hi]
+
+    async def _async_catch_up(self, entry_id: str, schedules: dict[str, dict]) -> None:
+        """Apply the state each schedule should be in right now.
+
+        Steps of the past 24 hours are folded oldest first, so the result
+        only depends on the schedules and the current minute.
+        """
+        now = self._minute_of(dt_util.now())
+        steps: list[tuple[int, str, int, list[str], dict]] = []
+        for schedule_id, schedule in schedules.items():
+            if not schedule.get("catch_up", True):
+                continue
+            for index, (minute, update) in enumerate(expand_steps(schedule["steps"])):
+                age = (now - minute) % MINUTES_PER_DAY
+                steps.append((-age, schedule_id, index, schedule["devices"], update))
+        batches: dict[tuple[str, str], dict] = {}
+        for *_order, devices, update in sorted(steps, key=lambda step: step[:3]):
+            for device_id in devices:
+                key = (entry_id, device_id)
+                batches[key] = merge_info(batches.get(key, {}), update)
+        await self._async_write(batches)
+
+    async def _async_write(self, batches: dict[tuple[str, str], dict]) -> None:
+        """Issue one update_device_info per kit, concurrently."""
+        writes = []
+        for (entry_id, device_id), update in batches.items():
+            entry = self._entries.get(entry_id)
+            if entry is None or device_id not in entry.client.devices:
+                continue
+            writes.append(entry.client.update_device_info(device_id, update))
+        if not writes:
+            return
+        self._stats["writes"] += len(writes)
+        for result in await asyncio.gather(*writes, return_exceptions=True):
+            if isinstance(result, LykynApiError):
+                self._stats["errors"] += 1
+                _LOGGER.warning("Scheduled Lykyn update failed: %s", result)
+            elif isinstance(result, Exception):
+                self._stats["errors"] += 1
+                _LOGGER.exception("Scheduled Lykyn update failed", exc_info=result)
+
+
+def get_scheduler(hass: HomeAssistant) -> LykynScheduler:
+    """Return the scheduler shared by all config entries."""
+    if (scheduler := hass.data.get(DATA_SCHEDULER)) is None:
+        scheduler = hass.data[DATA_SCHEDULER] = LykynScheduler(hass)
+    return scheduler
+
+
+def schedule_summary(schedules: dict[str, dict]) -> dict[str, Any]:
+    """Return schedules with expanded step times, for diagnostics."""
+    return {
+        schedule_id: {
+            "devices": schedule["devices"],
+            "times": sorted(
+                {format_minute(minute) for minute, _ in expand_steps(schedule["steps"])}
+            ),
+        }
+        for schedule_id, schedule in schedules.items()
+    }
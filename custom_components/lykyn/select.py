@@ -10,7 +10,7 @@ from homeassistant.config_entries import ConfigEntry
 
 from .const import DOMAIN, LIGHT_ANIMATIONS, LIGHT_MODES, MUSHROOM_PRESETS
 from .coordinator import LykynCoordinator
-from .entity import LykynEntity
+from .entity import LykynEntity, async_add_device_entities
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -56,23 +56,24 @@ async def async_setup_entry(
 ) -> None:
     """Set up Lykyn select entities."""
     coordinator: LykynCoordinator = hass.data[DOMAIN][entry.entry_id]
-    entities = []
+    async_add_device_entities(coordinator, async_add_entities, _device_entities)
 
-    for device_id in coordinator.client.devices:
-        entities.extend([
-            LykynControlTypeSelect(coordinator, device_id),
-            LykynMushroomSelect(coordinator, device_id),
-            LykynLightModeSelect(coordinator, device_id),
-            LykynLightAnimationSelect(coordinator, device_id),
-        ])
 
-    async_add_entities(entities)
+def _device_entities(coordinator: LykynCoordinator, device_id: str) -> list:
+    """Create the select entities for one device."""
+    return [
+        LykynControlTypeSelect(coordinator, device_id),
+        LykynMushroomSelect(coordinator, device_id),
+        LykynLightModeSelect(coordinator, device_id),
+        LykynLightAnimationSelect(coordinator, device_id),
+    ]
 
 
 class LykynControlTypeSelect(LykynEntity, SelectEntity):
     """Control type selector (SMART/MANUAL)."""
 
     _attr_translation_key = "control_type"
+    requires = ("controlType",)
     _attr_icon = "mdi:cog"
     _attr_options = CONTROL_TYPES
 
@@ -94,6 +95,7 @@ class LykynMushroomSelect(LykynEntity, SelectEntity):
     """Mushroom type selector."""
 
     _attr_translation_key = "mushroom_type"
+    requires = ("selectedMushroom",)
     _attr_icon = "mdi:mushroom"
     _attr_options = list(MUSHROOM_LABELS.keys())
 
@@ -122,6 +124,7 @@ class LykynLightModeSelect(LykynEntity, SelectEntity):
     """Light mode selector (ANIMATION/MANUAL/EMOTIONAL)."""
 
     _attr_translation_key = "light_mode"
+    requires = ("lightMode",)
     _attr_icon = "mdi:lightbulb-cog"
     _attr_options = LIGHT_MODES
 
@@ -143,6 +146,7 @@ class LykynLightAnimationSelect(LykynEntity, SelectEntity):
     """Light animation selector (29 animations)."""
 
     _attr_translation_key = "light_animation"
+    requires = ("lightAnimation", "lightMode")
     _attr_icon = "mdi:animation"
     _attr_options = LIGHT_ANIMATIONS
 
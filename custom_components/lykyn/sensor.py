@@ -1,24 +1,141 @@
 """Sensor platform for Lykyn."""
 
 import logging
+from collections.abc import Callable
+from datetime import datetime, timedelta
 
 from homeassistant.components.sensor import (
     SensorDeviceClass,
     SensorEntity,
     SensorStateClass,
 )
-from homeassistant.const import PERCENTAGE, UnitOfTemperature
+from homeassistant.const import (
+    PERCENTAGE,
+    EntityCategory,
+    UnitOfInformation,
+    UnitOfTemperature,
+    UnitOfTime,
+)
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.util import dt as dt_util
 
 from homeassistant.config_entries import ConfigEntry
 
-from .const import DOMAIN
+from .capabilities import HUMIDITY, TEMPERATURE
+from .const import CONF_METRICS, DOMAIN, LATENCY_BUCKETS
 from .coordinator import LykynCoordinator
-from .entity import LykynEntity
+from .entity import LykynAccountEntity, LykynEntity, async_add_device_entities
+from .fleet import FleetAggregator
+from .metrics import MetricsRegistry
 
 _LOGGER = logging.getLogger(__name__)
 
+# Only the diagnostic metric sensors poll; everything else is pushed
+SCAN_INTERVAL = timedelta(seconds=30)
+
+
+def _mean_ms(
+    name: str, label: str | None = None
+) -> Callable[[MetricsRegistry], float | None]:
+    def value(metrics: MetricsRegistry) -> float | None:
+        histogram = metrics.histogram(name, LATENCY_BUCKETS, label)
+        if not histogram.count:
+            return None
+        return round(histogram.total / histogram.count * 1000, 1)
+
+    return value
+
+
+# key -> (value function, unit, state class)
+METRIC_SENSORS: dict[str, tuple[Callable, str | None, SensorStateClass]] = {
+    "socket_events": (
+        lambda metrics: metrics.total("socket_events"),
+        None,
+        SensorStateClass.TOTAL_INCREASING,
+    ),
+    "event_rate": (
+        lambda metrics: round(metrics.total("socket_events") / metrics.uptime * 60, 2),
+        "events/min",
+        SensorStateClass.MEASUREMENT,
+    ),
+    "socket_reconnects": (
+        lambda metrics: max(metrics.total("connects") - 1, 0),
+        None,
+        SensorStateClass.TOTAL_INCREASING,
+    ),
+    "bytes_received": (
+        lambda metrics: metrics.total("bytes_in"),
+        UnitOfInformation.BYTES,
+        SensorStateClass.TOTAL_INCREASING,
+    ),
+    "bytes_sent": (
+        lambda metrics: metrics.total("bytes_out"),
+        UnitOfInformation.BYTES,
+        SensorStateClass.TOTAL_INCREASING,
+    ),
+    "emit_latency": (
+        _mean_ms("emit_seconds", "updateDevice"),
+        UnitOfTime.MILLISECONDS,
+        SensorStateClass.MEASUREMENT,
+    ),
+    "control_latency": (
+        _mean_ms("control_latency_seconds"),
+        UnitOfTime.MILLISECONDS,
+        SensorStateClass.MEASUREMENT,
+    ),
+    "actuator_switches": (
+        lambda metrics: metrics.total("actuator_switches"),
+        None,
+        SensorStateClass.TOTAL_INCREASING,
+    ),
+}
+
+
+def _rounded(name: str) -> Callable[[FleetAggregator], float | None]:
+    def value(fleet: FleetAggregator) -> float | None:
+        result = getattr(fleet, name)
+        return round(result, 1) if result is not None else None
+
+    return value
+
+
+# key -> (value function, device class, unit)
+FLEET_SENSORS: dict[str, tuple[Callable, SensorDeviceClass | None, str | None]] = {
+    "fleet_avg_temperature": (
+        _rounded("avg_temperature"),
+        SensorDeviceClass.TEMPERATURE,
+        UnitOfTemperature.CELSIUS,
+    ),
+    "fleet_min_temperature": (
+        _rounded("min_temperature"),
+        SensorDeviceClass.TEMPERATURE,
+        UnitOfTemperature.CELSIUS,
+    ),
+    "fleet_max_temperature": (
+        _rounded("max_temperature"),
+        SensorDeviceClass.TEMPERATURE,
+        UnitOfTemperature.CELSIUS,
+    ),
+    "fleet_avg_humidity": (
+        _rounded("avg_humidity"),
+        SensorDeviceClass.HUMIDITY,
+        PERCENTAGE,
+    ),
+    "fleet_min_humidity": (
+        _rounded("min_humidity"),
+        SensorDeviceClass.HUMIDITY,
+        PERCENTAGE,
+    ),
+    "fleet_max_humidity": (
+        _rounded("max_humidity"),
+        SensorDeviceClass.HUMIDITY,
+        PERCENTAGE,
+    ),
+    "fleet_out_of_band": (lambda fleet: fleet.out_of_band, None, None),
+    "fleet_online": (lambda fleet: fleet.online, None, None),
+}
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -27,23 +144,38 @@ async def async_setup_entry(
 ) -> None:
     """Set up Lykyn sensors."""
     coordinator: LykynCoordinator = hass.data[DOMAIN][entry.entry_id]
-    entities = []
-
-    for device_id in coordinator.client.devices:
-        entities.extend([
-            LykynTemperatureSensor(coordinator, device_id),
-            LykynHumiditySensor(coordinator, device_id),
-            LykynRawTemperatureSensor(coordinator, device_id),
-            LykynRawHumiditySensor(coordinator, device_id),
-            LykynTargetTempMinSensor(coordinator, device_id),
-            LykynTargetTempMaxSensor(coordinator, device_id),
-            LykynTargetHumMinSensor(coordinator, device_id),
-            LykynTargetHumMaxSensor(coordinator, device_id),
-        ])
+    async_add_device_entities(coordinator, async_add_entities, _device_entities)
+
+    entities: list = [LykynRoundTripSensor(coordinator, entry)]
+    entities.extend(
+        LykynFleetSensor(coordinator, entry, key) for key in FLEET_SENSORS
+    )
+
+    if entry.options.get(CONF_METRICS):
+        entities.extend(
+            LykynMetricSensor(coordinator, entry, key) for key in METRIC_SENSORS
+        )
 
     async_add_entities(entities)
 
 
+def _device_entities(coordinator: LykynCoordinator, device_id: str) -> list:
+    """Create the sensor entities for one device."""
+    return [
+        LykynTemperatureSensor(coordinator, device_id),
+        LykynHumiditySensor(coordinator, device_id),
+        LykynRawTemperatureSensor(coordinator, device_id),
+        LykynRawHumiditySensor(coordinator, device_id),
+        LykynTargetTempMinSensor(coordinator, device_id),
+        LykynTargetTempMaxSensor(coordinator, device_id),
+        LykynTargetHumMinSensor(coordinator, device_id),
+        LykynTargetHumMaxSensor(coordinator, device_id),
+        LykynLastUpdateSensor(coordinator, device_id),
+        LykynTimeToLimitSensor(coordinator, device_id, "temp"),
+        LykynTimeToLimitSensor(coordinator, device_id, "hum"),
+    ]
+
+
 class LykynTemperatureSensor(LykynEntity, SensorEntity):
     """Calibrated temperature sensor."""
 
@@ -51,6 +183,7 @@ class LykynTemperatureSensor(LykynEntity, SensorEntity):
     _attr_state_class = SensorStateClass.MEASUREMENT
     _attr_native_unit_of_measurement = UnitOfTemperature.CELSIUS
     _attr_translation_key = "temperature"
+    requires = TEMPERATURE
 
     def __init__(self, coordinator: LykynCoordinator, device_id: str) -> None:
         super().__init__(coordinator, device_id)
@@ -60,7 +193,10 @@ class LykynTemperatureSensor(LykynEntity, SensorEntity):
     def native_value(self) -> float | None:
         info = self._device_info_data
         calibrate = info.get("calibrate", {})
-        return calibrate.get("calibratedTemp") or calibrate.get("temp") or info.get("temp")
+        calibrated = self.coordinator.client.calibrated_reading(
+            self._device_id, "calibratedTemp"
+        )
+        return calibrated or calibrate.get("temp") or info.get("temp")
 
 
 class LykynHumiditySensor(LykynEntity, SensorEntity):
@@ -70,6 +206,7 @@ class LykynHumiditySensor(LykynEntity, SensorEntity):
     _attr_state_class = SensorStateClass.MEASUREMENT
     _attr_native_unit_of_measurement = PERCENTAGE
     _attr_translation_key = "humidity"
+    requires = HUMIDITY
 
     def __init__(self, coordinator: LykynCoordinator, device_id: str) -> None:
         super().__init__(coordinator, device_id)
@@ -79,7 +216,10 @@ class LykynHumiditySensor(LykynEntity, SensorEntity):
     def native_value(self) -> float | None:
         info = self._device_info_data
         calibrate = info.get("calibrate", {})
-        val = calibrate.get("calibratedHum") or calibrate.get("hum") or info.get("hum")
+        calibrated = self.coordinator.client.calibrated_reading(
+            self._device_id, "calibratedHum"
+        )
+        val = calibrated or calibrate.get("hum") or info.get("hum")
         if val is not None:
             return min(val, 100.0)
         return None
@@ -93,6 +233,7 @@ class LykynRawTemperatureSensor(LykynEntity, SensorEntity):
     _attr_native_unit_of_measurement = UnitOfTemperature.CELSIUS
     _attr_translation_key = "raw_temperature"
     _attr_entity_registry_enabled_default = False
+    requires = TEMPERATURE
 
     def __init__(self, coordinator: LykynCoordinator, device_id: str) -> None:
         super().__init__(coordinator, device_id)
@@ -113,6 +254,7 @@ class LykynRawHumiditySensor(LykynEntity, SensorEntity):
     _attr_native_unit_of_measurement = PERCENTAGE
     _attr_translation_key = "raw_humidity"
     _attr_entity_registry_enabled_default = False
+    requires = HUMIDITY
 
     def __init__(self, coordinator: LykynCoordinator, device_id: str) -> None:
         super().__init__(coordinator, device_id)
@@ -135,6 +277,7 @@ class LykynTargetTempMinSensor(LykynEntity, SensorEntity):
     _attr_native_unit_of_measurement = UnitOfTemperature.CELSIUS
     _attr_translation_key = "target_temp_min"
     _attr_entity_registry_enabled_default = False
+    requires = ("minTemp",)
 
     def __init__(self, coordinator: LykynCoordinator, device_id: str) -> None:
         super().__init__(coordinator, device_id)
@@ -152,6 +295,7 @@ class LykynTargetTempMaxSensor(LykynEntity, SensorEntity):
     _attr_native_unit_of_measurement = UnitOfTemperature.CELSIUS
     _attr_translation_key = "target_temp_max"
     _attr_entity_registry_enabled_default = False
+    requires = ("maxTemp",)
 
     def __init__(self, coordinator: LykynCoordinator, device_id: str) -> None:
         super().__init__(coordinator, device_id)
@@ -169,6 +313,7 @@ class LykynTargetHumMinSensor(LykynEntity, SensorEntity):
     _attr_native_unit_of_measurement = PERCENTAGE
     _attr_translation_key = "target_hum_min"
     _attr_entity_registry_enabled_default = False
+    requires = ("minHum",)
 
     def __init__(self, coordinator: LykynCoordinator, device_id: str) -> None:
         super().__init__(coordinator, device_id)
@@ -186,6 +331,7 @@ class LykynTargetHumMaxSensor(LykynEntity, SensorEntity):
     _attr_native_unit_of_measurement = PERCENTAGE
     _attr_translation_key = "target_hum_max"
     _attr_entity_registry_enabled_default = False
+    requires = ("maxHum",)
 
     def __init__(self, coordinator: LykynCoordinator, device_id: str) -> None:
         super().__init__(coordinator, device_id)
@@ -194,3 +340,135 @@ class LykynTargetHumMaxSensor(LykynEntity, SensorEntity):
     @property
     def native_value(self) -> float | None:
         return self._device_info_data.get("maxHum")
+
+
+class LykynLastUpdateSensor(LykynEntity, SensorEntity):
+    """Time of the last data received from the device."""
+
+    _attr_device_class = SensorDeviceClass.TIMESTAMP
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_translation_key = "last_update"
+
+    def __init__(self, coordinator: LykynCoordinator, device_id: str) -> None:
+        super().__init__(coordinator, device_id)
+        self._attr_unique_id = f"{device_id}_last_update"
+
+    @property
+    def available(self) -> bool:
+        """Stay available so staleness remains visible."""
+        return self.coordinator.last_update_success
+
+    def _state_version(self) -> tuple:
+        return (
+            self.coordinator.client.last_event_time(self._device_id),
+            self.coordinator.last_update_success,
+        )
+
+    @property
+    def native_value(self) -> datetime | None:
+        seen = self.coordinator.client.last_event_time(self._device_id)
+        return dt_util.utc_from_timestamp(seen) if seen is not None else None
+
+
+class LykynTimeToLimitSensor(LykynEntity, SensorEntity):
+    """Predicted minutes until temperature or humidity leaves the band."""
+
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_native_unit_of_measurement = UnitOfTime.MINUTES
+    _attr_entity_registry_enabled_default = False
+
+    def __init__(
+        self, coordinator: LykynCoordinator, device_id: str, key: str
+    ) -> None:
+        super().__init__(coordinator, device_id)
+        self._key = key
+        name = "temperature" if key == "temp" else "humidity"
+        self._attr_translation_key = f"time_to_{name}_limit"
+        self._attr_unique_id = f"{device_id}_time_to_{name}_limit"
+        self.requires = TEMPERATURE if key == "temp" else HUMIDITY
+
+    def _state_version(self) -> tuple:
+        # The forecast moves with every sample, not only on snapshot changes
+        return (self.native_value, *super()._state_version())
+
+    @property
+    def native_value(self) -> int | None:
+        minutes = self.coordinator.forecast.time_to_limit(self._device_id, self._key)
+        return round(minutes) if minutes is not None else None
+
+
+class LykynRoundTripSensor(LykynAccountEntity, SensorEntity):
+    """Socket round-trip time measured by the heartbeat probe."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_translation_key = "round_trip_time"
+
+    def __init__(self, coordinator: LykynCoordinator, entry: ConfigEntry) -> None:
+        super().__init__(coordinator, entry)
+        self._attr_unique_id = f"{entry.entry_id}_round_trip_time"
+
+    @property
+    def native_value(self) -> float | None:
+        rtt = self.coordinator.client.rtt
+        return round(rtt * 1000, 1) if rtt is not None else None
+
+    def _state_version(self) -> tuple:
+        return (self.native_value, *super()._state_version())
+
+
+class LykynFleetSensor(LykynAccountEntity, SensorEntity):
+    """Account-wide aggregate maintained incrementally by the coordinator."""
+
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(
+        self, coordinator: LykynCoordinator, entry: ConfigEntry, key: str
+    ) -> None:
+        super().__init__(coordinator, entry)
+        self._value, device_class, unit = FLEET_SENSORS[key]
+        self._attr_unique_id = f"{entry.entry_id}_{key}"
+        self._attr_translation_key = key
+        self._attr_device_class = device_class
+        self._attr_native_unit_of_measurement = unit
+
+    @property
+    def native_value(self) -> float | None:
+        return self._value(self.coordinator.fleet)
+
+    def _state_version(self) -> tuple:
+        return (self.native_value, *super()._state_version())
+
+
+class LykynMetricSensor(LykynAccountEntity, SensorEntity):
+    """Diagnostic sensor reading a value from the metrics registry.
+
+    Polled every SCAN_INTERVAL rather than written on every socket event.
+    """
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    def __init__(
+        self, coordinator: LykynCoordinator, entry: ConfigEntry, key: str
+    ) -> None:
+        super().__init__(coordinator, entry)
+        self._value, unit, state_class = METRIC_SENSORS[key]
+        self._attr_unique_id = f"{entry.entry_id}_{key}"
+        self._attr_translation_key = key
+        self._attr_native_unit_of_measurement = unit
+        self._attr_state_class = state_class
+
+    @property
+    def should_poll(self) -> bool:
+        return True
+
+    @property
+    def native_value(self) -> float | None:
+        return self._value(self.coordinator.metrics)
+
+    def _handle_coordinator_update(self) -> None:
+        """Ignore push updates; the state is refreshed by polling."""
+
+    async def async_update(self) -> None:
+        """Nothing to fetch; native_value reads the registry."""
@@ -0,0 +1,220 @@
+"""Services for the Lykyn integration."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+
+import voluptuous as vol
+
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+)
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers import device_registry as dr
+from homeassistant.util import dt as dt_util
+
+from .api import REQUEST_ERRORS
+from .const import (
+    DOMAIN,
+    EXPORT_CSV,
+    EXPORT_FORMATS,
+    EXPORT_PARQUET,
+    HISTORY_QUERY_MAX_ROWS,
+)
+from .history import async_export_history, export_path, parquet_available
+from .schedule import get_scheduler
+
+SERVICE_SET_SCHEDULE = "set_schedule"
+SERVICE_REMOVE_SCHEDULE = "remove_schedule"
+SERVICE_EXPORT_HISTORY = "export_history"
+SERVICE_GET_HISTORY = "get_history"
+
+ATTR_SCHEDULE_ID = "schedule_id"
+ATTR_DEVICE_ID = "device_id"
+ATTR_STEPS = "steps"
+ATTR_CATCH_UP = "catch_up"
+ATTR_FORMAT = "format"
+ATTR_PATH = "path"
+ATTR_MAX_ROWS = "max_rows"
+ATTR_SINCE = "since"
+ATTR_START = "start"
+ATTR_END = "end"
+
+STEP_SCHEMA = vol.Schema(
+    {
+        vol.Required("at"): cv.time,
+        vol.Required("set"): vol.All(dict, vol.Length(min=1)),
+        vol.Optional("every"): vol.All(vol.Coerce(int), vol.Range(min=1, max=720)),
+        vol.Optional("until"): cv.time,
+    }
+)
+
+SET_SCHEDULE_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_SCHEDULE_ID): cv.slug,
+        vol.Required(ATTR_DEVICE_ID): vol.All(cv.ensure_list, [cv.string]),
+        vol.Required(ATTR_STEPS): vol.All(cv.ensure_list, [STEP_SCHEMA], vol.Length(min=1)),
+        vol.Optional(ATTR_CATCH_UP, default=True): cv.boolean,
+    }
+)
+
+REMOVE_SCHEDULE_SCHEMA = vol.Schema({vol.Required(ATTR_SCHEDULE_ID): cv.slug})
+
+EXPORT_HISTORY_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_DEVICE_ID): cv.string,
+        vol.Optional(ATTR_FORMAT, default=EXPORT_CSV): vol.In(EXPORT_FORMATS),
+        vol.Optional(ATTR_PATH): cv.string,
+        vol.Optional(ATTR_MAX_ROWS): vol.All(vol.Coerce(int), vol.Range(min=1)),
+        vol.Optional(ATTR_SINCE): cv.datetime,
+    }
+)
+
+GET_HISTORY_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_DEVICE_ID): cv.string,
+        vol.Optional(ATTR_START): cv.datetime,
+        vol.Optional(ATTR_END): cv.datetime,
+        vol.Optional(ATTR_MAX_ROWS, default=HISTORY_QUERY_MAX_ROWS): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=HISTORY_QUERY_MAX_ROWS)
+        ),
+    }
+)
+
+
+def _resolve_devices(
+    hass: HomeAssistant, device_ids: list[str]
+) -> dict[str, list[str]]:
+    """Map Home Assistant device ids to Lykyn device ids per config entry."""
+    registry = dr.async_get(hass)
+    loaded = hass.data.get(DOMAIN, {})
+    resolved: dict[str, list[str]] = {}
+    for device_id in device_ids:
+        device = registry.async_get(device_id)
+        lykyn_id = entry_id = None
+        if device is not None:
+            lykyn_id = next(
+                (ident for domain, ident in device.identifiers if domain == DOMAIN),
+                None,
+            )
+            entry_id = next(
+                (entry for entry in device.config_entries if entry in loaded), None
+            )
+        # The account service device is identified by its entry id
+        if lykyn_id is None or entry_id is None or lykyn_id == entry_id:
+            raise ServiceValidationError(f"{device_id} is not a loaded Lykyn kit")
+        resolved.setdefault(entry_id, []).append(lykyn_id)
+    return resolved
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the Lykyn services."""
+
+    async def async_set_schedule(call: ServiceCall) -> None:
+        scheduler = get_scheduler(hass)
+        steps = [
+            {
+                key: value.strftime("%H:%M") if key in ("at", "until") else value
+                for key, value in step.items()
+            }
+            for step in call.data[ATTR_STEPS]
+        ]
+        resolved = _resolve_devices(hass, call.data[ATTR_DEVICE_ID])
+        # A replaced schedule may have covered kits of other accounts
+        await scheduler.async_remove_schedule(call.data[ATTR_SCHEDULE_ID])
+        for entry_id, devices in resolved.items():
+            await scheduler.async_set_schedule(
+                entry_id,
+                call.data[ATTR_SCHEDULE_ID],
+                devices,
+                steps,
+                call.data[ATTR_CATCH_UP],
+            )
+
+    async def async_remove_schedule(call: ServiceCall) -> None:
+        if not await get_scheduler(hass).async_remove_schedule(
+            call.data[ATTR_SCHEDULE_ID]
+        ):
+            raise ServiceValidationError(
+                f"Unknown schedule {call.data[ATTR_SCHEDULE_ID]}"
+            )
+
+    async def async_export(call: ServiceCall) -> ServiceResponse:
+        fmt = call.data[ATTR_FORMAT]
+        if fmt == EXPORT_PARQUET and not await hass.async_add_executor_job(
+            parquet_available
+        ):
+            raise ServiceValidationError("Parquet export requires pyarrow")
+        ((entry_id, (device_id,)),) = _resolve_devices(
+            hass, [call.data[ATTR_DEVICE_ID]]
+        ).items()
+        path = call.data.get(ATTR_PATH)
+        if path is None:
+            path = export_path(hass, device_id, fmt)
+        elif not hass.config.is_allowed_path(path):
+            raise ServiceValidationError(f"{path} is not in allowlist_external_dirs")
+        since = call.data.get(ATTR_SINCE)
+        if since is not None:
+            since = dt_util.as_utc(since)
+        try:
+            result = await async_export_history(
+                hass,
+                hass.data[DOMAIN][entry_id].client,
+                device_id,
+                path,
+                fmt,
+                call.data.get(ATTR_MAX_ROWS),
+                since,
+            )
+        except REQUEST_ERRORS as err:
+            raise HomeAssistantError(f"History export failed: {err!r}") from err
+        return result if call.return_response else None
+
+    async def async_get_history(call: ServiceCall) -> ServiceResponse:
+        ((entry_id, (device_id,)),) = _resolve_devices(
+            hass, [call.data[ATTR_DEVICE_ID]]
+        ).items()
+        end = call.data.get(ATTR_END)
+        end = dt_util.as_utc(end) if end is not None else None
+        start = call.data.get(ATTR_START)
+        if start is not None:
+            start = dt_util.as_utc(start)
+        else:
+            start = (end or dt_util.utcnow()) - timedelta(days=1)
+        if end is not None and end < start:
+            raise ServiceValidationError("end must not be before start")
+        try:
+            rows = await hass.data[DOMAIN][entry_id].history.async_query(
+                device_id, start, end, call.data[ATTR_MAX_ROWS]
+            )
+        except REQUEST_ERRORS as err:
+            raise HomeAssistantError(f"History query failed: {err!r}") from err
+        return {"device_id": device_id, "count": len(rows), "rows": rows}
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_SET_SCHEDULE, async_set_schedule, schema=SET_SCHEDULE_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_REMOVE_SCHEDULE,
+        async_remove_schedule,
+        schema=REMOVE_SCHEDULE_SCHEMA,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_EXPORT_HISTORY,
+        async_export,
+        schema=EXPORT_HISTORY_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_HISTORY,
+        async_get_history,
+        schema=GET_HISTORY_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
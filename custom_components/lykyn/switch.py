@@ -10,7 +10,7 @@ from homeassistant.config_entries import ConfigEntry
 
 from .const import DOMAIN
 from .coordinator import LykynCoordinator
-from .entity import LykynEntity
+from .entity import LykynEntity, async_add_device_entities
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -22,23 +22,24 @@ async def async_setup_entry(
 ) -> None:
     """Set up Lykyn switches."""
     coordinator: LykynCoordinator = hass.data[DOMAIN][entry.entry_id]
-    entities = []
+    async_add_device_entities(coordinator, async_add_entities, _device_entities)
 
-    for device_id in coordinator.client.devices:
-        entities.extend([
-            LykynHumidifierSwitch(coordinator, device_id),
-            LykynLightSwitch(coordinator, device_id),
-            LykynSmartLightSwitch(coordinator, device_id),
-            LykynSmartHumidifierSwitch(coordinator, device_id),
-        ])
 
-    async_add_entities(entities)
+def _device_entities(coordinator: LykynCoordinator, device_id: str) -> list:
+    """Create the switch entities for one device."""
+    return [
+        LykynHumidifierSwitch(coordinator, device_id),
+        LykynLightSwitch(coordinator, device_id),
+        LykynSmartLightSwitch(coordinator, device_id),
+        LykynSmartHumidifierSwitch(coordinator, device_id),
+    ]
 
 
 class LykynHumidifierSwitch(LykynEntity, SwitchEntity):
     """Humidifier on/off switch."""
 
     _attr_translation_key = "humidifier"
+    requires = ("humidifier",)
     _attr_icon = "mdi:air-humidifier"
 
     def __init__(self, coordinator: LykynCoordinator, device_id: str) -> None:
@@ -64,6 +65,7 @@ class LykynLightSwitch(LykynEntity, SwitchEntity):
     """Light on/off switch (also controlled by the light entity)."""
 
     _attr_translation_key = "light_switch"
+    requires = ("light",)
     _attr_icon = "mdi:led-strip-variant"
 
     def __init__(self, coordinator: LykynCoordinator, device_id: str) -> None:
@@ -89,6 +91,7 @@ class LykynSmartLightSwitch(LykynEntity, SwitchEntity):
     """Enable light subsystem in SMART mode (info.smart.light)."""
 
     _attr_translation_key = "smart_light"
+    requires = ("smart.light",)
     _attr_icon = "mdi:lightbulb-auto"
 
     def __init__(self, coordinator: LykynCoordinator, device_id: str) -> None:
@@ -115,6 +118,7 @@ class LykynSmartHumidifierSwitch(LykynEntity, SwitchEntity):
     """Enable humidifier subsystem in SMART mode (info.smart.humidifier)."""
 
     _attr_translation_key = "smart_humidifier"
+    requires = ("smart.humidifier",)
     _attr_icon = "mdi:air-humidifier"
 
     def __init__(self, coordinator: LykynCoordinator, device_id: str) -> None:
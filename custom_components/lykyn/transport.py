@@ -0,0 +1,86 @@
+"""Socket.io client with wire-level byte accounting."""
+
+import re
+
+import socketio
+from socketio import packet
+
+from .api import JSON_CODEC
+from .const import PAYLOAD_SIZE_BUCKETS
+from .metrics import MetricsRegistry
+
+# Socket.io packet type digit -> label for packets that aren't named events
+_PACKET_TYPES = {
+    str(packet.CONNECT): "connect",
+    str(packet.DISCONNECT): "disconnect",
+    str(packet.ACK): "ack",
+    str(packet.CONNECT_ERROR): "connect_error",
+    str(packet.BINARY_ACK): "ack",
+}
+_EVENT_NAME = re.compile(r'\[\s*"([^"]+)"')
+
+
+def _inbound_label(data: str | bytes) -> str:
+    """Return the event name of an encoded Socket.io packet."""
+    if isinstance(data, bytes):
+        return "binary"
+    if data[:1] in (str(packet.EVENT), str(packet.BINARY_EVENT)):
+        match = _EVENT_NAME.search(data, 0, 128)
+        if match:
+            return match.group(1)
+    return _PACKET_TYPES.get(data[:1], "other")
+
+
+def _size(data: str | bytes) -> int:
+    return len(data.encode() if isinstance(data, str) else data)
+
+
+class CodecPacket(packet.Packet):
+    """Socket.io packet encoded with the integration's JSON codec.
+
+    Passing json= to AsyncClient would replace the codec of socketio's and
+    engineio's Packet classes for every client in the process; this
+    subclass is only used by our own client.
+    """
+
+    json = JSON_CODEC
+
+
+class MeteredAsyncClient(socketio.AsyncClient):
+    """AsyncClient that counts Socket.io packet bytes per direction and event.
+
+    Sizes are those of the encoded Socket.io packets, i.e. before websocket
+    compression; Engine.IO ping/pong frames are not included. Counting
+    only happens while the metrics registry is enabled.
+    """
+
+    def __init__(self, *args, metrics: MetricsRegistry, **kwargs) -> None:
+        super().__init__(*args, serializer=CodecPacket, **kwargs)
+        self._metrics = metrics
+
+    def _count(self, direction: str, label: str, size: int) -> None:
+        self._metrics.counter(f"bytes_{direction}", label).inc(size)
+        self._metrics.histogram(
+            f"packet_bytes_{direction}", PAYLOAD_SIZE_BUCKETS, label
+        ).observe(size)
+
+    async def _handle_eio_message(self, data):
+        if self._metrics.enabled:
+            self._count("in", _inbound_label(data), _size(data))
+        await super()._handle_eio_message(data)
+
+    async def _send_packet(self, pkt):
+        if not self._metrics.enabled:
+            await super()._send_packet(pkt)
+            return
+        if pkt.packet_type in (packet.EVENT, packet.BINARY_EVENT) and pkt.data:
+            label = str(pkt.data[0])
+        else:
+            label = _PACKET_TYPES.get(str(pkt.packet_type), "other")
+        # Mirrors socketio.AsyncClient._send_packet, sizing what is sent
+        encoded_packet = pkt.encode()
+        if not isinstance(encoded_packet, list):
+            encoded_packet = [encoded_packet]
+        for encoded in encoded_packet:
+            self._count("out", label, _size(encoded))
+            await self.eio.send(encoded)
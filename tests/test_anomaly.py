@@ -0,0 +1,83 @@
+"""Tests for the streaming anomaly detectors."""
+
+import pytest
+
+from custom_components.lykyn.anomaly import (
+    FANS_INEFFECTIVE,
+    HUMIDIFIER_INEFFECTIVE,
+    SENSOR_STUCK,
+    LykynAnomalyMonitor,
+    _Detector,
+)
+from custom_components.lykyn.const import (
+    ANOMALY_FAN_SECONDS,
+    ANOMALY_HUMIDIFIER_SECONDS,
+    ANOMALY_STUCK_SAMPLES,
+    ANOMALY_STUCK_SECONDS,
+)
+from custom_components.lykyn.metrics import MetricsRegistry
+
+
+def _monitor() -> LykynAnomalyMonitor:
+    return LykynAnomalyMonitor(MetricsRegistry())
+
+
+def test_detector_base_is_abstract():
+    with pytest.raises(TypeError):
+        _Detector()
+
+
+def test_stuck_sensor_raised_and_cleared():
+    monitor = _monitor()
+    step = ANOMALY_STUCK_SECONDS / (ANOMALY_STUCK_SAMPLES - 1)
+    changes = []
+    for n in range(ANOMALY_STUCK_SAMPLES):
+        changes += monitor.sample("kit1", n * step, {}, 24.0, None)
+    assert changes == [(SENSOR_STUCK, True)]
+    assert monitor.sample("kit1", ANOMALY_STUCK_SECONDS + 1, {}, 24.1, None) == [
+        (SENSOR_STUCK, False)
+    ]
+
+
+def test_humidifier_anomaly_clears_when_humidifier_turns_off():
+    monitor = _monitor()
+    running = {"humidifier": 1}
+    assert monitor.sample("kit1", 0, running, None, 50.0) == []
+    assert monitor.sample(
+        "kit1", ANOMALY_HUMIDIFIER_SECONDS, running, None, 50.2
+    ) == [(HUMIDIFIER_INEFFECTIVE, True)]
+    assert monitor.sample(
+        "kit1", ANOMALY_HUMIDIFIER_SECONDS + 1, {"humidifier": 0}, None, 50.2
+    ) == [(HUMIDIFIER_INEFFECTIVE, False)]
+    assert not monitor.is_active("kit1", HUMIDIFIER_INEFFECTIVE)
+
+
+def test_humidifier_rise_clears_anomaly():
+    monitor = _monitor()
+    running = {"humidifier": 1}
+    monitor.sample("kit1", 0, running, None, 50.0)
+    monitor.sample("kit1", ANOMALY_HUMIDIFIER_SECONDS, running, None, 50.0)
+    assert monitor.sample(
+        "kit1", ANOMALY_HUMIDIFIER_SECONDS + 1, running, None, 52.0
+    ) == [(HUMIDIFIER_INEFFECTIVE, False)]
+
+
+def test_fan_anomaly_clears_when_fans_stop():
+    monitor = _monitor()
+    venting = {"airin": 3, "airout": 3, "maxTemp": 28}
+    assert monitor.sample("kit1", 0, venting, 30.0, None) == []
+    assert monitor.sample("kit1", ANOMALY_FAN_SECONDS, venting, 30.0, None) == [
+        (FANS_INEFFECTIVE, True)
+    ]
+    assert monitor.sample(
+        "kit1", ANOMALY_FAN_SECONDS + 1, {"airin": 0, "airout": 0}, 30.0, None
+    ) == [(FANS_INEFFECTIVE, False)]
+
+
+def test_remove_returns_active_anomalies():
+    monitor = _monitor()
+    venting = {"airin": 3, "maxTemp": 28}
+    monitor.sample("kit1", 0, venting, 30.0, None)
+    monitor.sample("kit1", ANOMALY_FAN_SECONDS, venting, 30.0, None)
+    assert monitor.remove("kit1") == [FANS_INEFFECTIVE]
+    assert monitor.active() == {}
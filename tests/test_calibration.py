@@ -0,0 +1,111 @@
+"""Tests for the local preview of calibrated readings."""
+
+import asyncio
+
+from custom_components.lykyn.api import LykynApiClient
+from custom_components.lykyn.const import CALIBRATION_PREVIEW_TIMEOUT
+
+
+async def _client() -> LykynApiClient:
+    client = LykynApiClient("test@example.com", "secret")
+    sent: list[dict] = []
+
+    async def update_device(device_id: str, update: dict) -> None:
+        sent.append(update)
+
+    client.update_device = update_device
+    await client.handle_event(
+        "updateDevice",
+        {
+            "id": "kit1",
+            "info": {
+                "calibrate": {
+                    "temp": 20.0,
+                    "calibratedTemp": 21.0,
+                    "tempPercent": 1.0,
+                }
+            },
+        },
+    )
+    return client
+
+
+def _age(client: LykynApiClient, seconds: float) -> None:
+    """Pretend the pending previews were started seconds earlier."""
+    previews = client._previews["kit1"]
+    for key, (raw_key, offset, started) in previews.items():
+        previews[key] = (raw_key, offset, started - seconds)
+
+
+async def _realtime(client: LykynApiClient, **readings) -> None:
+    await client.handle_event("realtimeDeviceUpdates", {"id": "kit1", **readings})
+
+
+def test_preview_is_shown_immediately():
+    async def run():
+        client = await _client()
+        await client.update_device_info("kit1", {"calibrate": {"tempPercent": 2.5}})
+        assert client.calibrated_reading("kit1", "calibratedTemp") == 22.5
+        # It follows the raw reading until confirmed
+        await _realtime(client, temp=20.4)
+        assert client.calibrated_reading("kit1", "calibratedTemp") == 22.9
+        assert client.calibration_stats["pending"] == 1
+        await client.close()
+
+    asyncio.run(run())
+
+
+def test_preview_confirmed_within_tolerance():
+    async def run():
+        client = await _client()
+        await client.update_device_info("kit1", {"calibrate": {"tempPercent": 2.5}})
+        # 0.2 away from raw + offset: not confirmed yet
+        await _realtime(client, calibratedTemp=22.7)
+        assert client.calibration_stats["pending"] == 1
+        await _realtime(client, calibratedTemp=22.6)
+        stats = client.calibration_stats
+        assert stats["pending"] == 0
+        assert stats["confirmed"] == 1
+        assert abs(stats["max_abs_error"] - 0.1) < 1e-9
+        assert client.calibrated_reading("kit1", "calibratedTemp") == 22.6
+        await client.close()
+
+    asyncio.run(run())
+
+
+def test_preview_expires_after_timeout():
+    async def run():
+        client = await _client()
+        await client.update_device_info("kit1", {"calibrate": {"tempPercent": 2.5}})
+        _age(client, CALIBRATION_PREVIEW_TIMEOUT - 1)
+        await _realtime(client, temp=20.1)
+        assert client.calibration_stats["pending"] == 1
+        _age(client, 1)
+        await _realtime(client, temp=20.2)
+        stats = client.calibration_stats
+        assert stats["pending"] == 0
+        assert stats["expired"] == 1
+        # The device's own (unconfirmed) value is shown again
+        assert client.calibrated_reading("kit1", "calibratedTemp") == 21.0
+        await client.close()
+
+    asyncio.run(run())
+
+
+def test_second_offset_change_supersedes_the_preview():
+    async def run():
+        client = await _client()
+        await client.update_device_info("kit1", {"calibrate": {"tempPercent": 2.5}})
+        await client.update_device_info("kit1", {"calibrate": {"tempPercent": -1.0}})
+        assert client.calibrated_reading("kit1", "calibratedTemp") == 19.0
+        stats = client.calibration_stats
+        assert stats["superseded"] == 1
+        assert stats["pending"] == 1
+        # The first offset's value no longer confirms anything
+        await _realtime(client, calibratedTemp=22.5)
+        assert client.calibration_stats["pending"] == 1
+        await _realtime(client, calibratedTemp=19.0)
+        assert client.calibration_stats["confirmed"] == 1
+        await client.close()
+
+    asyncio.run(run())
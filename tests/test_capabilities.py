@@ -0,0 +1,89 @@
+"""Tests for capability profiles and entity gating."""
+
+import asyncio
+import tempfile
+from types import SimpleNamespace
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+
+from custom_components.lykyn import switch
+from custom_components.lykyn.api import LykynApiClient
+from custom_components.lykyn.capabilities import device_profile
+from custom_components.lykyn.coordinator import LykynCoordinator
+from custom_components.lykyn.entity import async_add_device_entities
+
+
+def test_profile_includes_nested_keys_and_firmware():
+    profile = device_profile(
+        {
+            "humidifier": False,
+            "smart": {"light": True},
+            "calibrate": {"temp": 21.0},
+            "specs": {"version": "1.4.2"},
+        }
+    )
+    assert profile.firmware == "1.4.2"
+    assert {"humidifier", "smart.light", "calibrate.temp"} <= profile.keys
+    assert profile.supports(("light", "smart.light"))
+    assert not profile.supports(("light",))
+    assert profile.supports(())
+
+
+async def _setup(info: dict):
+    hass = HomeAssistant(tempfile.mkdtemp(prefix="lykyn-test-"))
+    client = LykynApiClient("test@example.com", "secret")
+    await client.handle_event("updateDevice", {"id": "kit1", "info": info})
+    entry = SimpleNamespace(
+        entry_id="test", title="Test", options={}, async_on_unload=lambda _: None
+    )
+    coordinator = LykynCoordinator(hass, entry, client)
+    coordinator._async_sync_devices()
+    added: list[str] = []
+    async_add_device_entities(
+        coordinator,
+        lambda entities: added.extend(entity.unique_id for entity in entities),
+        switch._device_entities,
+    )
+    return client, coordinator, added
+
+
+async def _update(client: LykynApiClient, info: dict) -> None:
+    await client.handle_event("updateDevice", {"id": "kit1", "info": info})
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+
+def test_only_entities_for_reported_keys_are_created():
+    async def run():
+        client, coordinator, added = await _setup({"humidifier": False})
+        assert added == ["kit1_humidifier"]
+        await coordinator.async_shutdown()
+
+    asyncio.run(run())
+
+
+def test_entities_added_when_a_kit_reports_a_new_key():
+    async def run():
+        client, coordinator, added = await _setup({"humidifier": False})
+        await _update(client, {"humidifier": True, "light": False})
+        assert added == ["kit1_humidifier", "kit1_light_switch"]
+        await _update(client, {"humidifier": True, "light": True, "smart": {"light": True}})
+        assert sorted(added) == ["kit1_humidifier", "kit1_light_switch", "kit1_smart_light"]
+        await coordinator.async_shutdown()
+
+    asyncio.run(run())
+
+
+def test_entities_are_not_created_twice():
+    async def run():
+        client, coordinator, added = await _setup({"humidifier": False})
+        await _update(client, {"humidifier": True, "light": False})
+        # Same keys again, and a repeated signal for the kit
+        await _update(client, {"humidifier": False, "light": True})
+        coordinator._async_sync_devices()
+        async_dispatcher_send(coordinator.hass, coordinator.new_devices_signal, ["kit1"])
+        assert added == ["kit1_humidifier", "kit1_light_switch"]
+        await coordinator.async_shutdown()
+
+    asyncio.run(run())
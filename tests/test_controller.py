@@ -0,0 +1,157 @@
+"""Tests for the local climate controller."""
+
+import asyncio
+import tempfile
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.lykyn.controller import LykynClimateController
+from custom_components.lykyn.metrics import MetricsRegistry
+
+BAND = {"minHum": 60, "maxHum": 85, "maxTemp": 28}
+
+
+class _Client:
+    """Device cache that applies writes the way update_device_info does."""
+
+    def __init__(self, **info) -> None:
+        self.devices = {"kit1": {"id": "kit1", "info": {}}}
+        self.writes: list[dict] = []
+        self._version = 0
+        self.set_info(**{"controlType": "MANUAL", **BAND, **info})
+
+    def set_info(self, temp: float = 24.0, hum: float = 70.0, **info) -> None:
+        current = self.devices["kit1"]["info"]
+        self.devices["kit1"] = {
+            "id": "kit1",
+            "info": {**current, **info, "calibrate": {"temp": temp, "hum": hum}},
+        }
+        self._version += 1
+
+    def register_update_callback(self, callback) -> None:
+        pass
+
+    def unregister_update_callback(self, callback) -> None:
+        pass
+
+    def device_version(self, device_id: str) -> int:
+        return self._version
+
+    def calibrated_reading(self, device_id: str, key: str) -> float | None:
+        return None
+
+    def device_age(self, device_id: str) -> float | None:
+        return 0.01
+
+    async def update_device_info(self, device_id: str, info_update: dict) -> None:
+        self.writes.append(info_update)
+        info = {**self.devices[device_id]["info"], **info_update}
+        self.devices[device_id] = {"id": device_id, "info": info}
+        self._version += 1
+
+
+def _run(test, **options) -> None:
+    async def run():
+        hass = HomeAssistant(tempfile.mkdtemp(prefix="lykyn-test-"))
+        client = _Client(**options.pop("info", {}))
+        controller = LykynClimateController(
+            hass,
+            client,
+            MetricsRegistry(),
+            options.get("enabled", True),
+            fan_speed=2,
+            min_cycle=options.get("min_cycle", 0),
+        )
+
+        async def sample(**readings) -> list[dict]:
+            before = len(client.writes)
+            info = client.devices["kit1"]["info"]
+            client.set_info(
+                **{
+                    "temp": info["calibrate"]["temp"],
+                    "hum": info["calibrate"]["hum"],
+                    **readings,
+                }
+            )
+            await controller.async_handle_update("kit1")
+            # The written snapshot comes back like a socket update
+            await controller.async_handle_update("kit1")
+            return client.writes[before:]
+
+        try:
+            await test(controller, client, sample)
+        finally:
+            controller.stop()
+
+    asyncio.run(run())
+
+
+def test_humidifier_hysteresis():
+    async def test(controller, client, sample):
+        assert await sample(hum=59.0) == [{"humidifier": True}]
+        # Inside the hysteresis band nothing changes
+        assert await sample(hum=61.0) == []
+        assert await sample(hum=63.0) == [{"humidifier": False}]
+        assert await sample(hum=61.0) == []
+
+    _run(test)
+
+
+def test_fan_hysteresis():
+    async def test(controller, client, sample):
+        assert await sample(temp=29.0) == [{"airin": 2, "airout": 2}]
+        assert await sample(temp=27.8) == []
+        assert await sample(temp=27.4) == [{"airin": 0, "airout": 0}]
+
+    _run(test)
+
+
+def test_one_combined_write_per_sample():
+    async def test(controller, client, sample):
+        assert await sample(temp=30.0, hum=50.0) == [
+            {"humidifier": True, "airin": 2, "airout": 2}
+        ]
+        assert controller.stats["writes"] == 1
+
+    _run(test)
+
+
+def test_only_manual_kits_are_controlled():
+    async def test(controller, client, sample):
+        assert await sample(hum=50.0) == []
+        assert controller.stats["samples"] == 0
+
+    _run(test, info={"controlType": "SMART"})
+
+
+def test_disabled_controller_does_not_write():
+    async def test(controller, client, sample):
+        assert await sample(hum=50.0) == []
+
+    _run(test, enabled=False)
+
+
+def test_min_cycle_holds_and_retries_when_the_hold_expires():
+    async def test(controller, client, sample):
+        assert await sample(hum=50.0) == [{"humidifier": True}]
+        # Switching back off is held by the minimum on time
+        assert await sample(hum=70.0) == []
+        assert controller.stats["held"] == 1
+        # No new sample arrives; the hold expiry re-evaluates the kit
+        await asyncio.sleep(0.5)
+        assert client.writes[-1] == {"humidifier": False}
+
+    _run(test, min_cycle=0.2)
+
+
+def test_new_sample_in_band_drops_the_pending_retry():
+    async def test(controller, client, sample):
+        await sample(hum=50.0)
+        await sample(hum=70.0)
+        assert controller._retries
+        await sample(hum=61.0)
+        assert not controller._retries
+        await asyncio.sleep(0.3)
+        assert client.writes == [{"humidifier": True}]
+
+    _run(test, min_cycle=0.2)
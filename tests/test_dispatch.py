@@ -0,0 +1,93 @@
+"""Tests for update callback dispatch in LykynApiClient."""
+
+import asyncio
+
+from custom_components.lykyn import api
+from custom_components.lykyn.api import LykynApiClient
+
+
+async def _drain() -> None:
+    """Let queued callback tasks run."""
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+
+def _device(device_id: str = "kit1") -> dict:
+    return {"id": device_id, "name": "Kit", "info": {"calibrate": {"temp": 20.0}}}
+
+
+def test_slow_callback_does_not_delay_others():
+    async def run():
+        client = LykynApiClient("test@example.com", "secret")
+        release = asyncio.Event()
+        fast: list[str | None] = []
+
+        async def slow(device_id):
+            await release.wait()
+
+        async def quick(device_id):
+            fast.append(device_id)
+
+        client.register_update_callback(slow)
+        client.register_update_callback(quick)
+        for device_id in ("a", "b", "c"):
+            client._notify_update(device_id)
+        await _drain()
+        assert fast == ["a", "b", "c"]
+        release.set()
+        await client.close()
+
+    asyncio.run(run())
+
+
+def test_overrunning_callback_is_not_cancelled(monkeypatch):
+    monkeypatch.setattr(api, "CALLBACK_TIMEOUT", 0.01)
+
+    async def run():
+        client = LykynApiClient("test@example.com", "secret")
+        finished: list[str | None] = []
+
+        async def slow(device_id):
+            await asyncio.sleep(0.05)
+            finished.append(device_id)
+
+        client.register_update_callback(slow)
+        client._notify_update("a")
+        client._notify_update("b")
+        await asyncio.sleep(0.03)
+        # "b" was delivered while "a" was still running
+        assert client.dispatch_stats["timeouts"] >= 1
+        assert client.dispatch_stats["running"] == 2
+        await asyncio.sleep(0.1)
+        assert sorted(finished) == ["a", "b"]
+        await client.close()
+
+    asyncio.run(run())
+
+
+def test_samples_are_not_coalesced():
+    async def run():
+        client = LykynApiClient("test@example.com", "secret")
+        await client.handle_event("updateDevice", _device())
+        samples: list[float] = []
+        updates: list[str | None] = []
+
+        def on_sample(device_id):
+            samples.append(client.devices[device_id]["info"]["calibrate"]["temp"])
+
+        async def on_update(device_id):
+            updates.append(device_id)
+
+        client.register_sample_callback(on_sample)
+        client.register_update_callback(on_update)
+        for temp in (21.0, 22.0, 23.0):
+            await client.handle_event(
+                "realtimeDeviceUpdates", {"id": "kit1", "temp": temp}
+            )
+        await _drain()
+        assert samples == [21.0, 22.0, 23.0]
+        assert updates == ["kit1"]
+        assert client.dispatch_stats["coalesced"] == 2
+        await client.close()
+
+    asyncio.run(run())
@@ -0,0 +1,128 @@
+"""Tests for the incrementally maintained fleet aggregates."""
+
+import asyncio
+import random
+import tempfile
+from types import SimpleNamespace
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr
+
+from custom_components.lykyn.api import LykynApiClient
+from custom_components.lykyn.coordinator import LykynCoordinator
+from custom_components.lykyn.fleet import FleetAggregator
+from custom_components.lykyn.sensor import LykynFleetSensor
+
+
+def test_only_online_devices_contribute():
+    fleet = FleetAggregator()
+    fleet.update("a", 20.0, 50.0, False)
+    fleet.update("b", 30.0, 70.0, True)
+    assert fleet.avg_temperature is None
+    fleet.set_online(["a", "b", "unknown"])
+    assert fleet.online == 2
+    assert fleet.avg_temperature == 25.0
+    assert (fleet.min_temperature, fleet.max_temperature) == (20.0, 30.0)
+    assert (fleet.min_humidity, fleet.max_humidity) == (50.0, 70.0)
+    assert fleet.out_of_band == 1
+    fleet.set_online(["a"])
+    assert fleet.online == 1
+    assert fleet.max_temperature == 20.0
+    assert fleet.out_of_band == 0
+
+
+def test_remove_and_missing_readings():
+    fleet = FleetAggregator()
+    fleet.set_online(["a", "b"])
+    fleet.update("a", 20.0, None, False)
+    fleet.update("b", 24.0, 60.0, False)
+    assert fleet.avg_humidity == 60.0
+    fleet.remove("b")
+    assert fleet.max_temperature == 20.0
+    assert fleet.max_humidity is None
+    fleet.remove("a")
+    assert fleet.online == 0
+    assert fleet.avg_temperature is None
+
+
+def test_matches_recomputed_aggregates():
+    rng = random.Random(1)
+    fleet = FleetAggregator()
+    ids = [f"kit{n}" for n in range(20)]
+    samples: dict[str, float] = {}
+    online = set(ids)
+    fleet.set_online(ids)
+    for _ in range(2000):
+        device_id = rng.choice(ids)
+        if rng.random() < 0.05:
+            online ^= {device_id}
+            fleet.set_online(sorted(online))
+            continue
+        temp = round(rng.uniform(15, 35), 1)
+        samples[device_id] = temp
+        fleet.update(device_id, temp, None, False)
+        values = [samples[k] for k in samples if k in online]
+        assert fleet.min_temperature == (min(values) if values else None)
+        assert fleet.max_temperature == (max(values) if values else None)
+        if values:
+            assert abs(fleet.avg_temperature - sum(values) / len(values)) < 1e-9
+
+
+async def _coordinator():
+    hass = HomeAssistant(tempfile.mkdtemp(prefix="lykyn-test-"))
+    await dr.async_load(hass)
+    client = LykynApiClient("test@example.com", "secret")
+    entry = SimpleNamespace(entry_id="test", title="Test", options={})
+    return LykynCoordinator(hass, entry, client), client
+
+
+async def _event(client: LykynApiClient, event: str, *args) -> None:
+    await client.handle_event(event, *args)
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+
+def _kit(device_id: str, temp: float) -> dict:
+    return {"id": device_id, "info": {"calibrate": {"temp": temp, "hum": 60.0}}}
+
+
+def test_kits_added_and_removed_through_the_coordinator():
+    async def run():
+        coordinator, client = await _coordinator()
+        fleet = coordinator.fleet
+        await _event(client, "updateDevice", _kit("a", 20.0))
+        await _event(client, "onlineDevices", ["a", "b"])
+        assert (fleet.online, fleet.max_temperature) == (1, 20.0)
+        # A kit added to the account contributes right away
+        await _event(client, "updateDevice", _kit("b", 26.0))
+        assert (fleet.online, fleet.max_temperature) == (2, 26.0)
+        assert fleet.avg_temperature == 23.0
+        await _event(client, "deleteDevice", "b")
+        assert (fleet.online, fleet.max_temperature) == (1, 20.0)
+        await _event(client, "deleteDevice", "a")
+        assert fleet.online == 0
+        assert fleet.avg_temperature is None
+        await coordinator.async_shutdown()
+
+    asyncio.run(run())
+
+
+def test_fleet_sensor_writes_only_when_the_aggregate_changes():
+    async def run():
+        coordinator, client = await _coordinator()
+        sensor = LykynFleetSensor(coordinator, coordinator.config_entry, "fleet_online")
+        writes = []
+        sensor.async_write_ha_state = lambda: writes.append(sensor.native_value)
+        await _event(client, "updateDevice", _kit("a", 20.0))
+        await _event(client, "onlineDevices", ["a"])
+        sensor._handle_coordinator_update()
+        for temp in (21.0, 22.0):
+            await _event(client, "realtimeDeviceUpdates", {"id": "a", "temp": temp})
+            sensor._handle_coordinator_update()
+        assert writes == [1]
+        await _event(client, "onlineDevices", [])
+        sensor._handle_coordinator_update()
+        assert writes == [1, 0]
+        await coordinator.async_shutdown()
+
+    asyncio.run(run())
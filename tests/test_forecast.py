@@ -0,0 +1,52 @@
+"""Tests for the sliding-window trend forecasts."""
+
+import pytest
+
+from custom_components.lykyn import forecast
+from custom_components.lykyn.forecast import LykynForecaster, _TrendFit
+
+INFO = {"minTemp": 18, "maxTemp": 28, "minHum": 40, "maxHum": 70}
+
+
+def test_rising_temperature_predicts_time_to_upper_limit():
+    forecaster = LykynForecaster()
+    # +0.1 °C per minute from 24 °C: 28 °C is reached 40 minutes after start
+    for minute in range(11):
+        result = forecaster.sample("kit1", minute * 60.0, {"temp": 24 + minute / 10}, INFO)
+    assert result["temp"] == pytest.approx(30.0)
+    assert result["hum"] is None
+    assert forecaster.time_to_limit("kit1", "temp") == pytest.approx(30.0)
+
+
+def test_flat_or_outside_band():
+    forecaster = LykynForecaster()
+    for minute in range(11):
+        result = forecaster.sample("kit1", minute * 60.0, {"hum": 55.0}, INFO)
+    assert result["hum"] is None
+    for minute in range(11, 22):
+        result = forecaster.sample("kit1", minute * 60.0, {"hum": 75.0}, INFO)
+    assert result["hum"] == 0.0
+
+
+def test_stale_samples_are_ignored():
+    forecaster = LykynForecaster()
+    assert forecaster.sample("kit1", 10.0, {"temp": 20.0}, INFO) is not None
+    assert forecaster.sample("kit1", 10.0, {"temp": 21.0}, INFO) is None
+    forecaster.remove("kit1")
+    assert forecaster.time_to_limit("kit1", "temp") is None
+
+
+def test_window_sums_match_a_fresh_fit(monkeypatch):
+    monkeypatch.setattr(forecast, "FORECAST_RESUM", 7)
+    fit = _TrendFit(600)
+    for n in range(200):
+        fit.add(n * 30.0, 20 + (n % 13) * 0.1)
+    fresh = _TrendFit(600)
+    for n in range(200 - 21, 200):
+        fresh.add(n * 30.0, 20 + (n % 13) * 0.1)
+    t = 199 * 30.0
+    value, slope = fit.line(t)
+    expected_value, expected_slope = fresh.line(t)
+    assert fit.n == fresh.n == 21
+    assert value == pytest.approx(expected_value)
+    assert slope == pytest.approx(expected_slope)
@@ -0,0 +1,76 @@
+"""Tests for socket recovery and device freshness."""
+
+import asyncio
+
+import pytest
+
+from benchmarks.fake_cloud import FakeLykynCloud
+from custom_components.lykyn import api
+from custom_components.lykyn.api import LykynApiClient, LykynApiError
+
+
+async def _client(cloud: FakeLykynCloud) -> LykynApiClient:
+    base_url = await cloud.start()
+    client = LykynApiClient("test@example.com", "secret", base_url=base_url)
+    client.set_transport_options("polling", False, 0)
+    await client.authenticate()
+    return client
+
+
+def test_failed_first_connect_is_retried(monkeypatch):
+    monkeypatch.setattr(api, "HEARTBEAT_INTERVAL", 0.01)
+
+    async def run():
+        client = LykynApiClient("test@example.com", "secret")
+        attempts = 0
+
+        async def connect_socket():
+            nonlocal attempts
+            attempts += 1
+            client._sio = object()
+            if attempts < 3:
+                raise LykynApiError("refused")
+            await client._on_connect()
+
+        async def disconnect_socket():
+            client._sio = None
+
+        monkeypatch.setattr(client, "connect_socket", connect_socket)
+        monkeypatch.setattr(client, "disconnect_socket", disconnect_socket)
+        monkeypatch.setattr(client, "_emit", lambda *args: asyncio.sleep(0))
+        with pytest.raises(LykynApiError):
+            await client.connect_socket()
+        client._heartbeat = asyncio.create_task(client._heartbeat_loop())
+        assert await client.async_wait_connected(1)
+        assert attempts == 3
+        # An established socket is left to python-socketio's reconnection
+        await client._on_disconnect()
+        await asyncio.sleep(0.05)
+        assert attempts == 3
+        client._heartbeat.cancel()
+
+    asyncio.run(run())
+
+
+def test_rest_resync_does_not_mark_devices_seen(monkeypatch):
+    async def run():
+        cloud = FakeLykynCloud(devices=2)
+        client = await _client(cloud)
+        try:
+            await client.get_devices()
+            device_id = next(iter(client.devices))
+            assert client.last_event_time(device_id) is None
+            client.set_freshness_threshold(0.01)
+            await asyncio.sleep(0.02)
+            client._check_freshness()
+            assert not client.is_fresh(device_id)
+            # A resync does not revive a silent device
+            await client.get_devices()
+            assert not client.is_fresh(device_id)
+            await client.handle_event("updateDevice", cloud.devices[device_id])
+            assert client.is_fresh(device_id)
+        finally:
+            await client.close()
+            await cloud.stop()
+
+    asyncio.run(run())
@@ -0,0 +1,90 @@
+"""Tests for the segmented history cache."""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from custom_components.lykyn.history import LykynHistoryCache
+
+NOW = datetime(2026, 1, 31, tzinfo=timezone.utc)
+SEGMENT = 144
+
+
+class _Client:
+    """Serves rows every 10 minutes going back from NOW, newest first."""
+
+    def __init__(self, rows: int, gap_after: int | None = None) -> None:
+        self.rows = []
+        created = NOW
+        for index in range(rows):
+            self.rows.append({"created_at": created.isoformat(), "temp": index})
+            created -= timedelta(minutes=10)
+            if index == gap_after:
+                # Kit offline for a week
+                created -= timedelta(days=7)
+        self.calls: list[int] = []
+
+    async def get_device_data(self, device_id, limit, offset):
+        self.calls.append(offset)
+        return self.rows[offset : offset + limit]
+
+
+def _query(client, start, end, max_rows=None):
+    cache = LykynHistoryCache(client, segment_size=SEGMENT)
+    return asyncio.run(cache.async_query("kit", start, end, max_rows))
+
+
+def _times(rows):
+    return [datetime.fromisoformat(row["created_at"]) for row in rows]
+
+
+def test_recent_range_reads_from_the_head():
+    client = _Client(1000)
+    rows = _query(client, NOW - timedelta(hours=2), None)
+    assert len(rows) == 13
+    assert client.calls == [0]
+
+
+def test_old_range_seeks_instead_of_walking():
+    client = _Client(144 * 400)
+    end = NOW - timedelta(days=300)
+    start = end - timedelta(hours=6)
+    rows = _query(client, start, end)
+    times = _times(rows)
+    assert len(rows) == 37
+    assert max(times) <= end and min(times) >= start
+    assert times == sorted(times, reverse=True)
+    # A linear walk would need about 300 requests
+    assert len(client.calls) < 10
+
+
+def test_seek_recovers_from_overshoot():
+    client = _Client(144 * 50, gap_after=100)
+    end = NOW - timedelta(days=7, hours=3)
+    rows = _query(client, end - timedelta(hours=1), end)
+    expected = [
+        row
+        for row in client.rows
+        if end - timedelta(hours=1) <= datetime.fromisoformat(row["created_at"]) <= end
+    ]
+    assert rows == expected
+    assert len(client.calls) < 10
+
+
+def test_max_rows_limits_the_result():
+    client = _Client(1000)
+    rows = _query(client, NOW - timedelta(days=30), None, max_rows=200)
+    assert len(rows) == 200
+    assert client.calls == [0, SEGMENT]
+
+
+def test_segments_are_reused_within_ttl():
+    client = _Client(1000)
+    cache = LykynHistoryCache(client, segment_size=SEGMENT)
+
+    async def run():
+        await cache.async_query("kit", NOW - timedelta(hours=30), None)
+        await cache.async_query("kit", NOW - timedelta(hours=20), None)
+
+    asyncio.run(run())
+    assert client.calls == [0, SEGMENT]
+    assert cache.stats["hits"] >= 1
@@ -0,0 +1,76 @@
+"""Tests for the socket event journal ring and replay."""
+
+import asyncio
+import os
+
+from custom_components.lykyn.api import LykynApiClient
+from custom_components.lykyn.const import JOURNAL_IN, JOURNAL_META
+from custom_components.lykyn.journal import (
+    LykynEventJournal,
+    _segment_indexes,
+    async_replay,
+    read_journal,
+)
+
+SEGMENT_BYTES = 2000
+
+
+def _fill(journal: LykynEventJournal, events: int) -> None:
+    devices = [
+        {"id": f"kit{n}", "name": f"Kit {n}", "info": {"calibrate": {"temp": 20.0}}}
+        for n in range(3)
+    ]
+    journal.record(JOURNAL_META, "devices", (devices,))
+    for n in range(events):
+        journal.record(
+            JOURNAL_IN,
+            "realtimeDeviceUpdates",
+            ({"id": f"kit{n % 3}", "temp": 20 + n / 100, "hum": 90.0},),
+        )
+    journal._schedule_flush()
+
+
+def test_segments_stay_within_size(tmp_path):
+    journal = LykynEventJournal(str(tmp_path), SEGMENT_BYTES, 3)
+    _fill(journal, 2000)
+    indexes = _segment_indexes(str(tmp_path))
+    assert len(indexes) == 3
+    assert indexes[0] > 0
+    for name in os.listdir(tmp_path):
+        assert os.path.getsize(tmp_path / name) <= SEGMENT_BYTES
+
+
+def test_every_segment_starts_with_devices(tmp_path):
+    journal = LykynEventJournal(str(tmp_path), SEGMENT_BYTES, 3)
+    _fill(journal, 2000)
+    for index in _segment_indexes(str(tmp_path)):
+        single = tmp_path / f"only{index}"
+        single.mkdir()
+        os.link(
+            journal._segment_path(index),
+            single / os.path.basename(journal._segment_path(index)),
+        )
+        first = next(read_journal(str(single)))
+        assert (first["d"], first["e"]) == (JOURNAL_META, "devices")
+        assert len(first["a"][0]) == 3
+
+
+def test_pruned_journal_replays(tmp_path):
+    journal = LykynEventJournal(str(tmp_path), SEGMENT_BYTES, 3)
+    _fill(journal, 2000)
+    last = [
+        record
+        for record in read_journal(str(tmp_path))
+        if record["e"] == "realtimeDeviceUpdates" and record["a"][0]["id"] == "kit0"
+    ][-1]["a"][0]
+
+    async def run():
+        client = LykynApiClient("test@example.com", "secret")
+        replayed = await async_replay(client, str(tmp_path), speed=None)
+        await client.close()
+        return client, replayed
+
+    client, replayed = asyncio.run(run())
+    assert replayed > 0
+    assert set(client.devices) == {"kit0", "kit1", "kit2"}
+    assert client.devices["kit0"]["info"]["calibrate"]["temp"] == last["temp"]
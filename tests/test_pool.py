@@ -0,0 +1,61 @@
+"""Tests for the shared HTTP connection pool."""
+
+import asyncio
+
+from aiohttp import web
+
+from custom_components.lykyn import pool as pool_module
+from custom_components.lykyn.api import LykynApiClient
+from custom_components.lykyn.pool import LykynConnectionPool
+
+
+async def _start_server() -> tuple[web.AppRunner, str]:
+    async def hold_socket(request: web.Request) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        async for _ in ws:
+            pass
+        return ws
+
+    async def devices(request: web.Request) -> web.Response:
+        return web.json_response([])
+
+    app = web.Application()
+    app.router.add_get("/socket", hold_socket)
+    app.router.add_get("/devices", devices)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}"
+
+
+def test_rest_request_completes_while_sockets_hold_connections(monkeypatch):
+    monkeypatch.setattr(pool_module, "HTTP_POOL_LIMIT_PER_HOST", 2)
+
+    async def run():
+        runner, base_url = await _start_server()
+        pool = LykynConnectionPool()
+        clients = [
+            LykynApiClient(f"user{n}@example.com", "secret", pool=pool, base_url=base_url)
+            for n in range(3)
+        ]
+        sockets = []
+        try:
+            for client in clients:
+                session = await client._ensure_socket_session()
+                sockets.append(await session.ws_connect(f"{base_url}/socket"))
+            session = await clients[0]._ensure_session()
+            async with asyncio.timeout(2):
+                async with session.get(f"{base_url}/devices") as resp:
+                    assert await resp.json() == []
+        finally:
+            for ws in sockets:
+                await ws.close()
+            for client in clients:
+                await client.close()
+            await runner.cleanup()
+        assert pool.users == 0
+
+    asyncio.run(run())
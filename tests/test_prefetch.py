@@ -0,0 +1,102 @@
+"""Tests for the history prefetcher."""
+
+import asyncio
+import random
+from types import SimpleNamespace
+
+import aiohttp
+
+from custom_components.lykyn.prefetch import LykynHistoryPrefetcher
+
+
+class _Cache:
+    busy = False
+
+    def __init__(self, errors: dict[str, Exception]) -> None:
+        self.errors = errors
+        self.fetched: list[str] = []
+
+    def recently_queried(self, device_id: str) -> bool:
+        return device_id == "queried"
+
+    async def async_prefetch(self, device_id: str) -> None:
+        self.fetched.append(device_id)
+        if device_id in self.errors:
+            raise self.errors[device_id]
+
+
+def _client(*device_ids: str, online: tuple[str, ...] = ()) -> SimpleNamespace:
+    return SimpleNamespace(
+        devices={device_id: {} for device_id in device_ids},
+        online_devices=list(online),
+    )
+
+
+def test_online_and_queried_kits_go_first():
+    async def run():
+        cache = _Cache({})
+        prefetcher = LykynHistoryPrefetcher(
+            _client("a", "queried", "online", online=("online",)),
+            cache,
+            window=0.01,
+            concurrency=1,
+            rng=random.Random(0),
+        )
+        prefetcher.schedule(["a", "queried", "online"])
+        await prefetcher._task
+        assert cache.fetched == ["online", "queried", "a"]
+        assert prefetcher.stats["completed"] == 3
+
+    asyncio.run(run())
+
+
+def test_transport_errors_are_counted_and_skipped():
+    async def run():
+        cache = _Cache(
+            {
+                "a": aiohttp.ClientConnectionError("reset"),
+                "b": asyncio.TimeoutError(),
+            }
+        )
+        prefetcher = LykynHistoryPrefetcher(
+            _client("a", "b", "c"), cache, window=0.01, concurrency=1
+        )
+        prefetcher.schedule(["a", "b", "c"])
+        await prefetcher._task
+        assert sorted(cache.fetched) == ["a", "b", "c"]
+        assert prefetcher.stats["errors"] == 2
+        assert prefetcher.stats["completed"] == 1
+        # The concurrency slot of a failed fetch is released
+        assert not prefetcher._semaphore.locked()
+
+    asyncio.run(run())
+
+
+def test_kits_scheduled_during_the_last_fetch_are_prefetched():
+    async def run():
+        cache = _Cache({})
+        release = asyncio.Event()
+        fetch = cache.async_prefetch
+
+        async def slow_prefetch(device_id):
+            await fetch(device_id)
+            if device_id == "a":
+                await release.wait()
+
+        cache.async_prefetch = slow_prefetch
+        prefetcher = LykynHistoryPrefetcher(
+            _client("a", "b"), cache, window=0.01, concurrency=2
+        )
+        prefetcher.schedule(["a"])
+        while cache.fetched != ["a"]:
+            await asyncio.sleep(0.005)
+        # The queue is empty and the task only waits for the fetch of "a"
+        prefetcher.schedule(["b"])
+        await asyncio.sleep(0.05)
+        release.set()
+        await prefetcher._task
+        assert cache.fetched == ["a", "b"]
+        assert prefetcher.stats["queue_depth"] == 0
+        assert prefetcher.stats["completed"] == 2
+
+    asyncio.run(run())
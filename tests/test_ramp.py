@@ -0,0 +1,99 @@
+"""Tests for the light ramp scheduler."""
+
+import asyncio
+import time
+
+from custom_components.lykyn.ramp import LykynRampScheduler
+
+INTERVAL = 0.02
+
+
+class _Client:
+    def __init__(self, fail: dict[str, Exception] | None = None) -> None:
+        self.fail = fail or {}
+        self.frames: list[tuple[float, str, dict]] = []
+
+    async def update_device_info(self, device_id: str, info_update: dict) -> None:
+        self.frames.append((time.monotonic(), device_id, info_update))
+        if device_id in self.fail:
+            raise self.fail[device_id]
+
+    def of(self, device_id: str) -> list[dict]:
+        return [frame for _, kit, frame in self.frames if kit == device_id]
+
+
+async def _settle(ramps: LykynRampScheduler) -> None:
+    async with asyncio.timeout(5):
+        while ramps.stats["active"]:
+            await asyncio.sleep(INTERVAL)
+    await asyncio.sleep(INTERVAL)
+
+
+def test_frames_are_paced_and_end_on_target():
+    async def run():
+        client = _Client()
+        ramps = LykynRampScheduler(client, INTERVAL, max_emits_per_second=1000)
+        await ramps.async_start(
+            "kit1", 10 * INTERVAL, brightness=(0, 100), final={"light": False}
+        )
+        await _settle(ramps)
+        frames = client.of("kit1")
+        times = [t for t, _, _ in client.frames]
+        assert 5 <= len(frames) <= 11
+        assert min(b - a for a, b in zip(times, times[1:])) >= INTERVAL * 0.8
+        levels = [frame["lightBrightness"] for frame in frames]
+        assert levels == sorted(levels)
+        assert frames[-1] == {"lightBrightness": 100, "light": False}
+        assert ramps.stats["completed"] == 1
+
+    asyncio.run(run())
+
+
+def test_global_frame_budget_is_shared_round_robin():
+    async def run():
+        client = _Client()
+        # One emit per tick for the whole account
+        ramps = LykynRampScheduler(client, INTERVAL, max_emits_per_second=1 / INTERVAL)
+        for kit in ("a", "b", "c"):
+            await ramps.async_start(kit, 6 * INTERVAL, brightness=(0, 100))
+        await _settle(ramps)
+        times = [t for t, _, _ in client.frames]
+        assert min(b - a for a, b in zip(times, times[1:])) >= INTERVAL * 0.8
+        assert ramps.stats["skipped"] > 0
+        for kit in ("a", "b", "c"):
+            assert client.of(kit)[-1] == {"lightBrightness": 100}
+
+    asyncio.run(run())
+
+
+def test_cancel_stops_the_ramp_where_it_is():
+    async def run():
+        client = _Client()
+        ramps = LykynRampScheduler(client, INTERVAL, max_emits_per_second=1000)
+        await ramps.async_start("kit1", 50 * INTERVAL, brightness=(0, 100))
+        await asyncio.sleep(3 * INTERVAL)
+        await ramps.async_cancel("kit1")
+        sent = len(client.frames)
+        await asyncio.sleep(3 * INTERVAL)
+        assert len(client.frames) == sent
+        assert not ramps.is_ramping("kit1")
+        assert ramps.stats["cancelled"] == 1
+        assert client.of("kit1")[-1]["lightBrightness"] < 100
+
+    asyncio.run(run())
+
+
+def test_failed_frame_aborts_only_that_kit():
+    async def run():
+        client = _Client({"bad": RuntimeError("namespace gone")})
+        ramps = LykynRampScheduler(client, INTERVAL, max_emits_per_second=1000)
+        await ramps.async_start("bad", 5 * INTERVAL, brightness=(0, 100))
+        await ramps.async_start("good", 5 * INTERVAL, brightness=(0, 100))
+        await asyncio.sleep(2 * INTERVAL)
+        await ramps.async_cancel("bad")
+        await _settle(ramps)
+        assert len(client.of("bad")) == 1
+        assert client.of("good")[-1] == {"lightBrightness": 100}
+        assert ramps.stats["errors"] == 1
+
+    asyncio.run(run())
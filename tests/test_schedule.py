@@ -0,0 +1,47 @@
+"""Tests for schedule step expansion and the timer wheel's due slots."""
+
+from custom_components.lykyn.schedule import (
+    LykynScheduler,
+    expand_steps,
+    format_minute,
+    parse_minute,
+)
+
+
+def _scheduler(*minutes: int) -> LykynScheduler:
+    scheduler = LykynScheduler(None)
+    scheduler._wheel = {minute: [] for minute in minutes}
+    scheduler._slots = sorted(minutes)
+    return scheduler
+
+
+def test_parse_and_format_minute():
+    assert parse_minute("06:30") == 390
+    assert format_minute(390) == "06:30"
+
+
+def test_expand_repeating_step():
+    steps = [
+        {"at": "08:00", "set": {"light": True}},
+        {"at": "10:00", "every": 30, "until": "11:00", "set": {"airin": 3}},
+    ]
+    assert [minute for minute, _ in expand_steps(steps)] == [480, 600, 630, 660]
+
+
+def test_due_slots_same_day():
+    scheduler = _scheduler(100, 200, 300)
+    assert scheduler._due_slots(100, 300) == [200, 300]
+    assert scheduler._due_slots(None, 200) == [200]
+    assert scheduler._due_slots(200, 200) == [200]
+
+
+def test_due_slots_wrap_past_midnight():
+    scheduler = _scheduler(5, 700, 1438, 1439)
+    assert scheduler._due_slots(1437, 10) == [1438, 1439, 5]
+
+
+def test_due_slots_after_last_minute_of_day():
+    # The 23:59 step ran at 23:59 and must not run again after midnight
+    scheduler = _scheduler(5, 1439)
+    assert scheduler._due_slots(1439, 3) == []
+    assert scheduler._due_slots(1439, 5) == [5]
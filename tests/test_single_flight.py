@@ -0,0 +1,104 @@
+"""Tests for request collapsing in LykynApiClient._single_flight."""
+
+import asyncio
+
+import pytest
+
+from custom_components.lykyn.api import LykynApiClient
+
+
+def _client() -> LykynApiClient:
+    return LykynApiClient("test@example.com", "secret")
+
+
+def test_concurrent_callers_share_one_request():
+    async def run():
+        client = _client()
+        calls = 0
+        release = asyncio.Event()
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return calls
+
+        waiters = [
+            asyncio.create_task(client._single_flight("k", fetch)) for _ in range(3)
+        ]
+        await asyncio.sleep(0)
+        release.set()
+        assert await asyncio.gather(*waiters) == [1, 1, 1]
+        assert calls == 1
+        assert client.request_stats["collapsed"] == 2
+        assert not client._inflight
+
+    asyncio.run(run())
+
+
+def test_cancelled_leader_does_not_cancel_followers():
+    async def run():
+        client = _client()
+        release = asyncio.Event()
+
+        async def fetch():
+            await release.wait()
+            return "devices"
+
+        leader = asyncio.create_task(client._single_flight("k", fetch))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(client._single_flight("k", fetch))
+        await asyncio.sleep(0)
+        leader.cancel()
+        await asyncio.sleep(0)
+        release.set()
+        assert await follower == "devices"
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+
+    asyncio.run(run())
+
+
+def test_request_cancelled_when_last_caller_leaves():
+    async def run():
+        client = _client()
+        cancelled = asyncio.Event()
+
+        async def fetch():
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        callers = [
+            asyncio.create_task(client._single_flight("k", fetch)) for _ in range(2)
+        ]
+        await asyncio.sleep(0)
+        callers[0].cancel()
+        await asyncio.sleep(0)
+        assert not cancelled.is_set()
+        callers[1].cancel()
+        await asyncio.wait_for(cancelled.wait(), 1)
+        await asyncio.sleep(0)
+        assert not client._inflight
+
+    asyncio.run(run())
+
+
+def test_errors_reach_every_caller():
+    async def run():
+        client = _client()
+
+        async def fetch():
+            await asyncio.sleep(0)
+            raise RuntimeError("boom")
+
+        results = await asyncio.gather(
+            client._single_flight("k", fetch),
+            client._single_flight("k", fetch),
+            return_exceptions=True,
+        )
+        assert all(isinstance(result, RuntimeError) for result in results)
+
+    asyncio.run(run())
@@ -0,0 +1,30 @@
+"""Tests for the Socket.io transport wrapper."""
+
+import engineio.packet
+import socketio.packet
+
+from custom_components.lykyn.api import JSON_CODEC
+from custom_components.lykyn.metrics import MetricsRegistry
+from custom_components.lykyn.transport import CodecPacket, MeteredAsyncClient
+
+
+def test_codec_is_scoped_to_our_client():
+    stdlib_socketio = socketio.packet.Packet.json
+    stdlib_engineio = engineio.packet.Packet.json
+
+    client = MeteredAsyncClient(metrics=MetricsRegistry())
+
+    assert client.packet_class is CodecPacket
+    assert CodecPacket.json is JSON_CODEC
+    assert socketio.packet.Packet.json is stdlib_socketio
+    assert engineio.packet.Packet.json is stdlib_engineio
+    # Other clients in the process keep the stock packet class
+    assert socketio.AsyncClient().packet_class is socketio.packet.Packet
+
+
+def test_codec_packet_round_trip():
+    encoded = CodecPacket(
+        socketio.packet.EVENT, data=["updateDevice", {"id": "kit1"}]
+    ).encode()
+    decoded = CodecPacket(encoded_packet=encoded)
+    assert decoded.data == ["updateDevice", {"id": "kit1"}]